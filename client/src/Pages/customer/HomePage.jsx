@@ -18,7 +18,7 @@ export default function HomePage() {
     const fetchProducts = async () => {
       try {
         const res = await api.get("/products");
-        setProducts(res.data);
+        setProducts(res.data.products);
       } catch (err) {
         console.error(err);
         setError("Failed to load products.");
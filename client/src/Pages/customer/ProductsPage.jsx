@@ -7,13 +7,16 @@ export default function ProductsPage() {
   const [products, setProducts] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const { addToCart } = useCart();
 
   useEffect(() => {
     const fetchProducts = async () => {
       try {
         const res = await api.get("/products");
-        setProducts(res.data);
+        setProducts(res.data.products);
+        setNextCursor(res.data.next_cursor);
       } catch (err) {
         console.error(err);
         setError("Failed to load products.");
@@ -25,6 +28,20 @@ export default function ProductsPage() {
     fetchProducts();
   }, []);
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const res = await api.get("/products", { params: { cursor: nextCursor } });
+      setProducts((prev) => [...prev, ...res.data.products]);
+      setNextCursor(res.data.next_cursor);
+    } catch (err) {
+      console.error(err);
+      setError("Failed to load products.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (loading) {
     return <p className="text-center text-lg">Loading products...</p>;
   }
@@ -47,6 +64,17 @@ export default function ProductsPage() {
           />
         ))}
       </div>
+      {nextCursor && (
+        <div className="flex justify-center mt-8">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="px-6 py-2 rounded bg-amber-800 text-white disabled:opacity-50"
+          >
+            {loadingMore ? "Loading..." : "Load more"}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
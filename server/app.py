@@ -13,16 +13,32 @@ from extensions import db, bcrypt, ma, limiter
 from logging_config import setup_logging
 from request_tracking import request_context_middleware, set_user_context
 from request_logging import setup_comprehensive_logging
+from compression import setup_compression, compression_exempt
 from logging_config import log_info  # Use prevention-focused logging
 # Integrate JWT with authentication context
 from auth_context import jwt_auth_integration
+from commands import register_commands
+from utils.product_render import register_product_render_events
+from utils.summary import register_summary_events
+from utils.user_cache import register_user_cache_events
+from utils.audit import audit_log
+from utils.suggest import suggest_index
 # Import resources
 from resources.auth import AuthResource
-from resources.customer.products import ProductListResource
+from resources.customer.products import (
+    CategoryProductsResource, ProductListResource, ProductResource, ProductSearchResource, ProductSuggestResource,
+    ProductFacetsResource
+)
 from resources.cart import CartItemResource, CartResource
 from resources.admin.admin_products import AdminProductsResource
+from resources.admin.product_import import AdminProductImportResource
+from resources.admin.inventory import InventoryAdjustResource, InventoryAtRiskResource
+from resources.admin.stats import AdminSummaryResource, StatsTimeseriesResource
 from resources.admin.categories import CategoriesResource
 from resources.admin.customers import AdminCustomersResource
+from resources.admin.orders import AdminOrderCountsResource, AdminOrdersResource
+from resources.admin.exports import AdminExportResource
+from resources.admin.audit import AdminAuditResource
 from resources.payment import PaymentResource, PaymentCallbackResource, PaymentVerificationResource
 
 # -----------------------------
@@ -43,11 +59,21 @@ request_context_middleware(app)
 # Add comprehensive request/response logging with prevention
 setup_comprehensive_logging(app)
 
+# Negotiated gzip/brotli compression for large textual responses
+setup_compression(app)
+
 # Config
 app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URI")
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET")
 app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=24)
+# Cache-Control per cacheable route. "no-cache" lets browsers keep the body
+# but revalidate it with If-None-Match on every use (answered with a 304).
+app.config["CACHE_CONTROL"] = {
+    "products": os.getenv("CACHE_CONTROL_PRODUCTS", "public, no-cache"),
+    "categories": os.getenv("CACHE_CONTROL_CATEGORIES", "public, no-cache"),
+}
+app.config["COMPRESSION_MIN_SIZE"] = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))  # bytes
 
 # -----------------------------
 # Initialize extensions
@@ -62,6 +88,12 @@ limiter.init_app(app)  # Initialize rate limiter
 
 
 jwt_auth_integration(jwt)
+register_commands(app)
+register_product_render_events()  # Keep Product.rendered_json current on every flush
+register_summary_events()  # Keep the dashboard customer/low-stock counters current on every flush
+register_user_cache_events()  # Evict users from the role cache when a change to them commits
+audit_log.init_app(app)  # Background writer for the admin audit trail
+suggest_index.init_app(app)  # Background builds of the typeahead index
 
 # -----------------------------
 # Rate Limit Error Handler
@@ -95,6 +127,21 @@ limiter.limit("10 per minute")(AuthResource)  # 10 requests per minute for auth
 api.add_resource(ProductListResource, "/products")
 limiter.limit("100 per hour")(ProductListResource)  # 100 requests per hour for products
 
+api.add_resource(ProductResource, "/products/<int:product_id>")
+limiter.limit("100 per hour")(ProductResource)  # 100 requests per hour for product detail
+
+api.add_resource(ProductSearchResource, "/products/search")
+limiter.limit("100 per hour")(ProductSearchResource)  # 100 requests per hour for search
+
+api.add_resource(ProductSuggestResource, "/products/suggest")
+limiter.limit("60 per minute")(ProductSuggestResource)  # Typeahead fires on every keystroke
+
+api.add_resource(ProductFacetsResource, "/products/facets")
+limiter.limit("100 per hour")(ProductFacetsResource)  # 100 requests per hour for facets
+
+api.add_resource(CategoryProductsResource, "/categories/<int:category_id>/products")
+limiter.limit("100 per hour")(CategoryProductsResource)  # 100 requests per hour for category pages
+
 api.add_resource(CartResource, '/cart')               
 limiter.limit("50 per hour")(CartResource)  # 50 requests per hour for cart
 
@@ -102,20 +149,48 @@ api.add_resource(CartItemResource, '/cart/item/<int:item_id>')
 limiter.limit("50 per hour")(CartItemResource)  # 50 requests per hour for cart items
 
 # Admin - Stricter limits for security
-api.add_resource(AdminProductsResource, '/admin/products', '/admin/products/<int:id>')
+api.add_resource(AdminProductsResource, '/admin/products', '/admin/products/<int:product_id>')
 limiter.limit("30 per hour")(AdminProductsResource)  # 30 requests per hour for admin products
 
+api.add_resource(AdminProductImportResource, '/admin/products/import')
+limiter.limit("10 per hour")(AdminProductImportResource)  # Each request can carry a whole catalog
+
+api.add_resource(InventoryAdjustResource, '/admin/inventory/adjust')
+limiter.limit("30 per hour")(InventoryAdjustResource)  # 30 requests per hour for stock adjustments
+
+api.add_resource(InventoryAtRiskResource, '/admin/inventory/at-risk')
+limiter.limit("120 per hour")(InventoryAtRiskResource)  # Dashboard widget polls this
+
+api.add_resource(StatsTimeseriesResource, '/admin/stats/timeseries')
+limiter.limit("120 per hour")(StatsTimeseriesResource)  # Dashboard charts poll this
+
+api.add_resource(AdminSummaryResource, '/admin/summary')
+limiter.limit("120 per hour")(AdminSummaryResource)  # Dashboard header polls this
+
 api.add_resource(CategoriesResource, '/admin/categories', '/admin/categories/<int:id>')
 limiter.limit("30 per hour")(CategoriesResource)  # 30 requests per hour for admin categories
 
 api.add_resource(AdminCustomersResource, "/admin/customers")
 limiter.limit("30 per hour")(AdminCustomersResource)  # 30 requests per hour for admin customers
 
+api.add_resource(AdminOrdersResource, "/admin/orders")
+limiter.limit("60 per hour")(AdminOrdersResource)  # 60 requests per hour for admin orders
+
+api.add_resource(AdminOrderCountsResource, "/admin/orders/counts")
+limiter.limit("120 per hour")(AdminOrderCountsResource)  # Dashboard widget polls this
+
+api.add_resource(AdminExportResource, "/admin/export/<string:name>")
+limiter.limit("10 per hour")(AdminExportResource)  # Each request streams a whole table
+
+api.add_resource(AdminAuditResource, "/admin/audit")
+limiter.limit("60 per hour")(AdminAuditResource)  # 60 requests per hour for the audit trail
+
 # Payment - Very strict limits to prevent abuse
 api.add_resource(PaymentResource, '/payment/stk-push')
 limiter.limit("5 per minute")(PaymentResource)  # Only 5 payment requests per minute
 
 api.add_resource(PaymentCallbackResource, '/payment/callback')
+compression_exempt(PaymentCallbackResource)  # Callbacks come from M-Pesa, not a browser
 # Payment callbacks are exempt from rate limiting (they come from M-Pesa)
 
 api.add_resource(PaymentVerificationResource, '/payment/verify')
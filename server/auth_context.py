@@ -100,6 +100,27 @@ def log_user_action(action, user_id=None, **kwargs):
     )
 
 
+def log_admin_action(action, **kwargs):
+    """
+    Log an admin action and add it to the persisted audit trail.
+    The audit write is buffered; it never waits on the database.
+    """
+    from flask_jwt_extended import get_jwt_identity
+    from utils.audit import audit_log
+
+    # Admin routes have verified the JWT; g.user_id is only set once the user is loaded
+    user_id = getattr(g, 'user_id', None) or get_jwt_identity()
+    log_user_action(action, user_id=user_id, **kwargs)
+    audit_log.record(
+        action,
+        user_id=user_id,
+        request_id=getattr(g, 'request_id', None),
+        method=getattr(g, 'request_method', None) or request.method,
+        path=getattr(g, 'request_path', None) or request.path,
+        **kwargs
+    )
+
+
 def with_authentication_context(user_id_func=None):
     """
     Decorator factory to set authentication context for functions that need it.
@@ -154,6 +175,7 @@ def jwt_auth_integration(jwt):
         # Set authentication context for the current request
         authenticate_user_context(user_id)
         
-        # Return user object (you would load this from your database)
-        # For this example, we'll return a mock user
-        return {'id': user_id}
\ No newline at end of file
+        # Served from the per-worker user cache; None (unknown user) fails the request
+        from utils.user_cache import user_cache
+        user = user_cache.get(user_id)
+        return user._asdict() if user else None
\ No newline at end of file
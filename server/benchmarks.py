@@ -0,0 +1,168 @@
+"""
+Micro-benchmarks for hot serialization paths.
+
+Runs against a throwaway in-memory SQLite database seeded with synthetic
+data, and reports the time and SQL statement count per iteration:
+
+    python benchmarks.py serializers [--iterations 50]
+    python benchmarks.py exports [--iterations 3] [--rows 50000]
+"""
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime
+
+os.environ["DATABASE_URI"] = "sqlite:///:memory:"
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-key-that-is-long-enough")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import joinedload  # noqa: E402
+
+from app import app, db  # noqa: E402
+from models import Cart, CartItem, Category, Order, Product, User  # noqa: E402
+from utils.exports import stream_export  # noqa: E402
+from utils.serializers import CART_ITEM, CATEGORY_DETAIL, USER_ADMIN  # noqa: E402
+
+
+def seed(categories=20, products_per_category=50, users=500):
+    db.create_all()
+    cats = [Category(name=f"Category {i}", description="Benchmark category") for i in range(categories)]
+    db.session.add_all(cats)
+    db.session.flush()
+    for category in cats:
+        db.session.add_all(
+            Product(name=f"{category.name} item {j}", description="Benchmark product", price=10 + j,
+                    stock=j % 7, category_id=category.id, created_at=datetime(2026, 1, 1))
+            for j in range(products_per_category)
+        )
+    people = [
+        User(first_name=f"First{i}", last_name=f"Last{i}", email=f"user{i}@example.com",
+             phone_number=f"07{i:08d}", password_hash="x", role="customer")
+        for i in range(users)
+    ]
+    db.session.add_all(people)
+    db.session.flush()
+    cart = Cart(user_id=people[0].id)
+    db.session.add(cart)
+    db.session.flush()
+    db.session.add_all(CartItem(cart_id=cart.id, product_id=product_id, quantity=1) for product_id in range(1, 101))
+    db.session.commit()
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+def measure(label, fn, iterations, counter):
+    fn()  # Warm up
+    db.session.expunge_all()
+    counter.count = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+        db.session.expunge_all()
+    elapsed_ms = (time.perf_counter() - start) * 1000 / iterations
+    print(f"  {label:<24} {elapsed_ms:9.2f} ms/iter {counter.count / iterations:8.1f} queries/iter")
+    return elapsed_ms
+
+
+def bench_serializers(iterations):
+    counter = QueryCounter()
+    event.listen(db.engine, "before_cursor_execute", counter)
+
+    cases = [
+        (
+            "categories with products",
+            lambda: [category.to_dict() for category in Category.query.all()],
+            lambda: CATEGORY_DETAIL.dump_many(Category.query.options(*CATEGORY_DETAIL.load_options()).all()),
+        ),
+        (
+            "cart items",
+            lambda: [item.to_dict() for item in CartItem.query.all()],
+            lambda: CART_ITEM.dump_many(CartItem.query.options(*CART_ITEM.load_options(joinedload)).all()),
+        ),
+        (
+            "customers",
+            lambda: [user.to_dict() for user in User.query.all()],
+            lambda: USER_ADMIN.dump_many(User.query.options(*USER_ADMIN.load_options(joinedload)).all()),
+        ),
+    ]
+    for name, to_dict_path, compiled_path in cases:
+        print(name)
+        before = measure("SerializerMixin.to_dict", to_dict_path, iterations, counter)
+        after = measure("compiled serializer", compiled_path, iterations, counter)
+        print(f"  speedup {before / after:.1f}x")
+
+    event.remove(db.engine, "before_cursor_execute", counter)
+
+
+def seed_orders(rows):
+    now = datetime(2026, 1, 1)
+    for start in range(0, rows, 10000):
+        db.session.execute(Order.__table__.insert(), [
+            {"user_id": 1 + i % 500, "total_amount": 100 + i % 50, "status": ("paid", "pending", "failed")[i % 3],
+             "created_at": now, "paid_at": now if i % 3 == 0 else None}
+            for i in range(start, min(start + 10000, rows))
+        ])
+    db.session.commit()
+
+
+def measure_export(label, fn, rows, iterations):
+    """Time `fn` (which must consume the whole export) and report rows/s and peak traced memory"""
+    fn()  # Warm up
+    db.session.expunge_all()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+        db.session.expunge_all()
+    elapsed = (time.perf_counter() - start) / iterations
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<24} {rows / elapsed:12,.0f} rows/s {peak / 2**20:8.1f} MiB peak")
+
+
+def bench_exports(iterations, rows=50000):
+    seed_orders(rows)
+    print(f"orders ({rows:,} rows)")
+    measure_export(
+        "in memory (to_dict)",
+        lambda: json.dumps([order.to_dict(only=("id", "user_id", "total_amount", "status", "created_at", "paid_at"))
+                            for order in Order.query.all()]),
+        rows, iterations,
+    )
+    for fmt in ("csv", "ndjson"):
+        measure_export(f"streamed {fmt}", lambda: sum(len(chunk) for chunk in stream_export("orders", fmt)),
+                       rows, iterations)
+
+
+BENCHMARKS = {
+    "serializers": bench_serializers,
+    "exports": bench_exports,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--iterations", type=int, default=None, help="Default: 50 (serializers), 3 (exports)")
+    parser.add_argument("--rows", type=int, default=50000, help="Orders to seed for the exports benchmark")
+    args = parser.parse_args()
+
+    with app.app_context():
+        seed()
+        if args.benchmark == "exports":
+            bench_exports(args.iterations or 3, rows=args.rows)
+        else:
+            BENCHMARKS[args.benchmark](args.iterations or 50)
+
+
+if __name__ == "__main__":
+    main()
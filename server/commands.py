@@ -0,0 +1,128 @@
+"""
+Flask CLI maintenance commands (run with `flask <command>`).
+"""
+
+import os
+
+import click
+
+from logging_config import get_logger
+
+logger = get_logger('commands')
+
+
+def register_commands(app):
+    """
+    Register maintenance commands on the app's CLI.
+    """
+
+    @app.cli.command("rebuild-search-index")
+    def rebuild_search_index():
+        """Rebuild the product full-text search index from the products table."""
+        from utils.search import product_search
+
+        product_search.rebuild()
+        click.echo(f"Search index rebuilt ({product_search.backend.name} backend)")
+        logger.info(
+            "Search index rebuilt",
+            event="search_index_rebuilt",
+            backend=product_search.backend.name
+        )
+
+    @app.cli.command("backfill-product-json")
+    @click.option("--batch-size", default=500, show_default=True, help="Rows per commit.")
+    def backfill_product_json(batch_size):
+        """Render and store Product.rendered_json for every product."""
+        from utils.product_render import refresh_rendered_products
+
+        updated = refresh_rendered_products(batch_size=batch_size)
+        click.echo(f"Rendered JSON written for {updated} products")
+
+    @app.cli.command("check-product-json")
+    @click.option("--fix", is_flag=True, help="Re-render the stale rows that were found.")
+    def check_product_json(fix):
+        """Report products whose stored JSON is missing or out of date."""
+        from utils.product_render import find_stale_rendered_products, refresh_rendered_products
+
+        stale = find_stale_rendered_products()
+        if not stale:
+            click.echo("All products have up to date rendered JSON")
+            return
+
+        click.echo(f"{len(stale)} products have stale rendered JSON: {stale[:20]}{' ...' if len(stale) > 20 else ''}")
+        logger.warning(
+            "Stale rendered product JSON found",
+            event="product_render_stale",
+            stale_count=len(stale)
+        )
+        if fix:
+            refresh_rendered_products(product_ids=stale)
+            click.echo("Stale rows re-rendered")
+
+    @app.cli.command("rebuild-sales-stats")
+    def rebuild_sales_stats_command():
+        """Recompute product_sales_stats from paid orders in one grouped query."""
+        from utils.sales_stats import rebuild_sales_stats
+
+        count = rebuild_sales_stats()
+        click.echo(f"Sales stats rebuilt for {count} products")
+
+    @app.cli.command("rebuild-customer-stats")
+    def rebuild_customer_stats_command():
+        """Recompute customer_stats from paid orders in one grouped query."""
+        from utils.customer_stats import rebuild_customer_stats
+
+        count = rebuild_customer_stats()
+        click.echo(f"Customer stats rebuilt for {count} customers")
+
+    @app.cli.command("reconcile-counters")
+    def reconcile_counters_command():
+        """Recompute the dashboard counters from the source tables and fix any drift (run nightly from cron)."""
+        from utils.summary import reconcile_counters
+
+        drift = reconcile_counters()
+        for name, (counted, actual) in sorted(drift.items()):
+            click.echo(f"{name}: {counted} -> {actual}")
+        click.echo(f"{len(drift)} counters corrected")
+
+    @app.cli.command("export-analytics")
+    @click.option("--out", default=lambda: os.getenv("ANALYTICS_EXPORT_DIR", "analytics"), show_default="analytics",
+                  help="Output directory (also holds the watermark).")
+    @click.option("--format", "fmt", default=None, help="parquet, arrow or csv (default: best available).")
+    @click.option("--lag-minutes", default=5, show_default=True, help="Leave the most recent minutes for the next run.")
+    @click.option("--batch-size", default=5000, show_default=True, help="Rows fetched per round trip.")
+    def export_analytics_command(out, fmt, lag_minutes, batch_size):
+        """Incrementally export orders and order_items to day-partitioned columnar files."""
+        from datetime import timedelta
+
+        from utils.analytics_export import export_analytics
+
+        try:
+            summary = export_analytics(out, fmt=fmt, lag=timedelta(minutes=lag_minutes), batch_size=batch_size)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--format")
+        click.echo(
+            f"Exported {summary['orders']} orders and {summary['order_items']} order items "
+            f"in {summary['files']} files (up to {summary['exported_until']:%Y-%m-%d %H:%M:%S})"
+        )
+
+    @app.cli.command("backfill-rollups")
+    @click.option("--since", default=None, help="Only rebuild buckets from this date on (YYYY-MM-DD).")
+    @click.option("--batch-size", default=2000, show_default=True, help="Rows fetched per round trip.")
+    def backfill_rollups_command(since, batch_size):
+        """Recompute the hourly/daily sales rollups from order history."""
+        from datetime import datetime
+        from utils.rollups import backfill_rollups
+
+        since = datetime.fromisoformat(since) if since else None
+        written = backfill_rollups(since=since, batch_size=batch_size)
+        click.echo(f"Rollups rebuilt ({written} rows)")
+
+    @app.cli.command("refresh-sales-velocity")
+    @click.option("--rebuild", is_flag=True, help="Recompute the daily counts from paid orders first.")
+    def refresh_sales_velocity_command(rebuild):
+        """Age out old daily sales and recompute every product's sales velocity (run daily)."""
+        from utils.velocity import refresh_sales_velocity
+
+        selling = refresh_sales_velocity(rebuild=rebuild)
+        click.echo(f"Sales velocity refreshed ({selling} selling products)")
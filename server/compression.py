@@ -0,0 +1,141 @@
+"""
+Negotiated response compression (brotli / gzip).
+
+Responses are compressed when the client accepts it, the body is at least
+COMPRESSION_MIN_SIZE bytes and the content type is textual. Catalog
+responses built from a CachedPayload reuse bytes compressed once per
+catalog version instead of recompressing the same body on every request.
+
+Brotli is used only when the optional `brotli` package is installed.
+Mark a view or Resource with @compression_exempt to opt it out.
+"""
+
+import gzip
+import time
+
+from flask import current_app, g, request
+
+from logging_config import log_metric
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/html",
+    "text/plain",
+}
+
+# Suffix appended to the ETag of an encoded representation (RFC 9110 strong
+# validators must differ between encodings)
+ETAG_SUFFIXES = {"br": "-br", "gzip": "-gzip"}
+
+
+def compression_exempt(view):
+    """Opt a view function or Resource class out of response compression"""
+    view.compression_exempt = True
+    return view
+
+
+def available_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(body, encoding, level=None):
+    if encoding == "br":
+        return brotli.compress(body, quality=5 if level is None else level)
+    return gzip.compress(body, compresslevel=6 if level is None else level, mtime=0)
+
+
+def negotiate_encoding():
+    """Best encoding the client accepts, or None"""
+    for encoding in available_encodings():
+        if request.accept_encodings[encoding]:
+            return encoding
+    return None
+
+
+def etag_variants(etag):
+    """All ETags a client may hold for one payload, one per encoding"""
+    return [etag] + [etag + suffix for suffix in ETAG_SUFFIXES.values()]
+
+
+def _is_exempt():
+    if getattr(g, "skip_compression", False):
+        return True
+    view = current_app.view_functions.get(request.endpoint)
+    target = getattr(view, "view_class", view)
+    return getattr(target, "compression_exempt", False)
+
+
+def setup_compression(app):
+    """
+    Register the compression after_request hook.
+    """
+    app.config.setdefault("COMPRESSION_ENABLED", True)
+    app.config.setdefault("COMPRESSION_MIN_SIZE", 1024)
+    app.config.setdefault("COMPRESSION_LEVEL", None)
+
+    @app.after_request
+    def compress_response(response):
+        if not app.config["COMPRESSION_ENABLED"]:
+            return response
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return response
+        if response.direct_passthrough or response.is_streamed:
+            return response
+        if "Content-Encoding" in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+
+        response.vary.add("Accept-Encoding")
+
+        if _is_exempt():
+            return response
+
+        encoding = negotiate_encoding()
+        if encoding is None:
+            return response
+
+        payload = getattr(response, "catalog_payload", None)
+        original_size = response.content_length or len(response.get_data())
+        if original_size < app.config["COMPRESSION_MIN_SIZE"]:
+            return response
+
+        # CPU time of this thread, so waiting on the GIL or I/O doesn't count
+        start = time.thread_time()
+        if payload is not None:
+            # Compressed once per catalog version and reused until the next bump
+            body, reused = payload.compressed(encoding)
+        else:
+            body, reused = compress(response.get_data(), encoding, app.config["COMPRESSION_LEVEL"]), False
+        cpu_ms = (time.thread_time() - start) * 1000
+
+        response.set_data(body)
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(etag + ETAG_SUFFIXES[encoding], weak=weak)
+
+        log_metric(
+            name="response_compression_ratio",
+            value=round(original_size / max(len(body), 1), 2),
+            unit="ratio",
+            encoding=encoding,
+            original_bytes=original_size,
+            compressed_bytes=len(body),
+            precompressed=reused,
+            path=request.path
+        )
+        log_metric(
+            name="response_compression_duration",
+            value=round(cpu_ms, 3),
+            unit="ms",
+            encoding=encoding,
+            precompressed=reused,
+            path=request.path
+        )
+        return response
@@ -357,24 +357,14 @@ def safe_add_to_cart_with_stock_check(user_id, product_id, quantity):
 
 def bulk_update_product_stock(changes):
     """
-    Efficiently update multiple product stocks in a single query
+    Efficiently update multiple product stocks in a single query per chunk.
+    `changes` maps product_id -> quantity to remove; see utils/inventory.py
+    (served by POST /admin/inventory/adjust).
     """
-    from sqlalchemy import case
-    
-    # Create a case statement for bulk update
-    stock_updates = case(
-        *[(Product.id == prod_id, Product.stock - qty) 
-          for prod_id, qty in changes.items()],
-        value=Product.id
-    )
-    
-    # Execute bulk update
-    updated_count = db.session.query(Product)\
-        .filter(Product.id.in_(changes.keys()))\
-        .update({Product.stock: stock_updates}, synchronize_session=False)
-    
-    db.session.commit()
-    return updated_count
+    from utils.inventory import adjust_stock
+
+    applied, _ = adjust_stock({prod_id: -qty for prod_id, qty in changes.items() if qty})
+    return len(applied)
 
 
 def get_products_with_optimized_query(category_id=None, include_out_of_stock=False):
@@ -90,9 +90,22 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # Full-text search objects are managed by hand in migration 3f9a2c1d8e47
+    # (not declared on the models), keep autogenerate from dropping them
+    def include_object(object, name, type_, reflected, compare_to):
+        if type_ == 'table' and name.startswith('products_fts'):
+            return False
+        if type_ == 'column' and name == 'search_vector':
+            return False
+        if type_ == 'index' and name == 'idx_product_search_vector':
+            return False
+        return True
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
@@ -0,0 +1,52 @@
+"""add product full text search index
+
+Revision ID: 3f9a2c1d8e47
+Revises: 7c765807b50b
+Create Date: 2026-10-17 09:12:31.482913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a2c1d8e47'
+down_revision = '7c765807b50b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        # Generated column so the database keeps it in sync with name/description
+        op.execute(
+            "ALTER TABLE products ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+            ") STORED"
+        )
+        op.execute("CREATE INDEX idx_product_search_vector ON products USING GIN (search_vector)")
+
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts "
+            "USING fts5(name, description, tokenize='unicode61')"
+        )
+        op.execute(
+            "INSERT INTO products_fts (rowid, name, description) "
+            "SELECT id, name, coalesce(description, '') FROM products"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS idx_product_search_vector")
+        op.execute("ALTER TABLE products DROP COLUMN IF EXISTS search_vector")
+
+    elif dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS products_fts")
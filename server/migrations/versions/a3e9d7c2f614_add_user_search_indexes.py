@@ -0,0 +1,44 @@
+"""add case-insensitive user search indexes
+
+Revision ID: a3e9d7c2f614
+Revises: e2a8c4f7b396
+Create Date: 2026-10-17 20:05:31.184620
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3e9d7c2f614'
+down_revision = 'e2a8c4f7b396'
+branch_labels = None
+depends_on = None
+
+users = sa.table(
+    'users',
+    sa.column('email', sa.String),
+    sa.column('first_name', sa.String),
+    sa.column('last_name', sa.String),
+)
+
+
+def upgrade():
+    # Same expressions as the indexes declared after models.User
+    for column in ('email', 'first_name', 'last_name'):
+        label = f'{column}_lower'
+        op.create_index(
+            f'idx_user_{label}', 'users',
+            [sa.func.lower(users.c[column]).label(label)],
+            postgresql_ops={label: 'text_pattern_ops'},
+        )
+    op.create_index(
+        'idx_user_phone_pattern', 'users', ['phone_number'],
+        postgresql_ops={'phone_number': 'varchar_pattern_ops'},
+    )
+
+
+def downgrade():
+    op.drop_index('idx_user_phone_pattern', table_name='users')
+    for column in ('last_name', 'first_name', 'email'):
+        op.drop_index(f'idx_user_{column}_lower', table_name='users')
@@ -0,0 +1,47 @@
+"""backfill dashboard summary counters
+
+Revision ID: c1e7a3d5f862
+Revises: b8d4f2a6c931
+Create Date: 2026-10-17 17:20:13.664105
+
+"""
+import os
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c1e7a3d5f862'
+down_revision = 'b8d4f2a6c931'
+branch_labels = None
+depends_on = None
+
+LOW_STOCK_THRESHOLD = int(os.getenv("LOW_STOCK_THRESHOLD", 5))
+
+
+def upgrade():
+    op.execute(
+        """
+        INSERT INTO counters (name, value, updated_at)
+        SELECT 'revenue.paid', COALESCE(SUM(total_amount), 0), CURRENT_TIMESTAMP
+        FROM orders WHERE status = 'paid'
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO counters (name, value, updated_at)
+        SELECT 'customers', COUNT(*), CURRENT_TIMESTAMP
+        FROM users WHERE COALESCE(role, 'customer') = 'customer'
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO counters (name, value, updated_at)
+        SELECT 'products.low_stock', COUNT(*), CURRENT_TIMESTAMP
+        FROM products WHERE COALESCE(stock, 0) <= {LOW_STOCK_THRESHOLD:d}
+        """
+    )
+
+
+def downgrade():
+    op.execute("DELETE FROM counters WHERE name IN ('revenue.paid', 'customers', 'products.low_stock')")
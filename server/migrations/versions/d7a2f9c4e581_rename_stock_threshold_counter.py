@@ -0,0 +1,23 @@
+"""rename products.low_stock counter to products.stock_at_or_below_threshold
+
+Revision ID: d7a2f9c4e581
+Revises: b5f1c8e3d927
+Create Date: 2026-10-17 21:05:42.318207
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7a2f9c4e581'
+down_revision = 'b5f1c8e3d927'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("UPDATE counters SET name = 'products.stock_at_or_below_threshold' WHERE name = 'products.low_stock'")
+
+
+def downgrade():
+    op.execute("UPDATE counters SET name = 'products.low_stock' WHERE name = 'products.stock_at_or_below_threshold'")
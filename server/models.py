@@ -2,6 +2,7 @@ from extensions import db, bcrypt  # Use extensions instead of redefining
 from sqlalchemy.orm import validates, relationship
 from sqlalchemy_serializer import SerializerMixin
 from datetime import datetime
+import math
 import re
 
 
@@ -19,8 +20,13 @@ class User(db.Model, SerializerMixin):
     phone_number = db.Column(db.String(20), unique=True, nullable=False, index=True)  # Added index
     carts = relationship("Cart", back_populates="user")
     orders = relationship("Order", back_populates="user")
+    stats = relationship("CustomerStats", uselist=False, viewonly=True)  # Maintained by utils/customer_stats.py
 
-    serialize_rules = ('-password_hash', '-carts.user', '-orders.user')
+    serialize_rules = ('-password_hash', '-carts.user', '-orders.user', '-stats')
+
+    __table_args__ = (
+        db.Index('idx_user_role_created', 'role', 'created_at', 'id'),  # For paging customers newest first
+    )
 
     @property
     def full_name(self):
@@ -55,9 +61,35 @@ class Category(db.Model, SerializerMixin):
     created_at = db.Column(db.DateTime, default=datetime.now, index=True)  # Added index
 
     products = relationship("Product", back_populates="category")
-    serialize_rules = ('-products.category',)
+    serialize_rules = ('-products.category', '-products.rendered_json', '-products.sales_velocity')
     
 
+# Product field rules, shared by the model validators and bulk imports
+def clean_price(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ValueError("Price must be a valid number")
+
+    # nan and inf parse as floats but can't be stored or rendered as JSON
+    if not math.isfinite(value):
+        raise ValueError("Price must be a valid number")
+    if value < 0:
+        raise ValueError("Price must be a positive number")
+    return value
+
+
+def clean_stock(value):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("Stock must be a valid integer")
+
+    if value < 0:
+        raise ValueError("Stock must be a positive integer")
+    return value
+
+
 # PRODUCT MODEL
 class Product(db.Model, SerializerMixin):
     __tablename__ = 'products'
@@ -70,42 +102,31 @@ class Product(db.Model, SerializerMixin):
     created_at = db.Column(db.DateTime, default=datetime.now, index=True)  # Added index
     image_url = db.Column(db.String)
     category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), index=True)  # Added index
+    rendered_json = db.Column(db.Text)  # Pre-encoded to_dict() payload, see utils/product_render.py
+    sales_velocity = db.Column(db.Float, nullable=False, default=0, server_default='0')  # Units/day, see utils/velocity.py
     category = relationship("Category", back_populates="products")
 
     cart_items = relationship("CartItem", back_populates="product")
     order_items = relationship("OrderItem", back_populates="product")
 
-    serialize_rules = ('-cart_items.product', '-order_items.product', '-category.products')
+    serialize_rules = ('-cart_items.product', '-order_items.product', '-category.products', '-rendered_json', '-sales_velocity')
     
     # Composite index for common queries
     __table_args__ = (
         db.Index('idx_product_category_stock', 'category_id', 'stock'),  # For category + stock queries
         db.Index('idx_product_category_price', 'category_id', 'price'),   # For category + price queries
+        db.Index('idx_product_category_created', 'category_id', 'created_at', 'id'),  # For category pages, newest first
     )
 
 
     @validates("price")
     def validate_price(self, key, value):
-        try:
-            value = float(value)
-        except (TypeError, ValueError):
-            raise ValueError("Price must be a valid number")
-
-        if value < 0:
-            raise ValueError("Price must be a positive number")
-        return value
+        return clean_price(value)
 
 
     @validates("stock")
     def validate_stock(self, key, value):
-        try:
-            value = int(value)
-        except (TypeError, ValueError):
-            raise ValueError("Stock must be a valid integer")
-
-        if value < 0:
-            raise ValueError("Stock must be a positive integer")
-        return value
+        return clean_stock(value)
 
    
     def to_dict(self):
@@ -122,6 +143,37 @@ class Product(db.Model, SerializerMixin):
             
         }
 
+# Days until a product sells out at its current velocity. The partial
+# expression index keeps the "at risk" ranking current as stock changes and
+# lets the top N be read in index order.
+PRODUCT_DAYS_OF_COVER = Product.stock / Product.sales_velocity
+db.Index(
+    'idx_product_days_of_cover',
+    PRODUCT_DAYS_OF_COVER,
+    sqlite_where=Product.sales_velocity > 0,
+    postgresql_where=Product.sales_velocity > 0,
+)
+
+# Case-insensitive prefix search on customers (resources/admin/customers.py).
+# The pattern_ops classes let PostgreSQL serve LIKE 'x%' from these indexes
+# under any collation; other databases ignore them.
+db.Index(
+    'idx_user_email_lower', db.func.lower(User.email).label('email_lower'),
+    postgresql_ops={'email_lower': 'text_pattern_ops'},
+)
+db.Index(
+    'idx_user_first_name_lower', db.func.lower(User.first_name).label('first_name_lower'),
+    postgresql_ops={'first_name_lower': 'text_pattern_ops'},
+)
+db.Index(
+    'idx_user_last_name_lower', db.func.lower(User.last_name).label('last_name_lower'),
+    postgresql_ops={'last_name_lower': 'text_pattern_ops'},
+)
+db.Index(
+    'idx_user_phone_pattern', User.phone_number,
+    postgresql_ops={'phone_number': 'varchar_pattern_ops'},
+)
+
 # CART MODEL
 class Cart(db.Model, SerializerMixin):
     __tablename__ = 'carts'
@@ -170,6 +222,7 @@ class Order(db.Model, SerializerMixin):
     created_at = db.Column(db.DateTime, default=datetime.now, index=True)  # Added index
     mpesa_checkout_request_id = db.Column(db.String(100), index=True)  # Added index for M-Pesa integration
     paid_at = db.Column(db.DateTime, index=True)  # Added for tracking payment time
+    status_changed_at = db.Column(db.DateTime, index=True)  # Last paid/failed/cancelled transition (analytics export)
 
     user = relationship("User", back_populates="orders")
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
@@ -199,3 +252,88 @@ class OrderItem(db.Model, SerializerMixin):
     __table_args__ = (
         db.Index('idx_orderitem_order_product', 'order_id', 'product_id'),  # For order items uniqueness
     )
+
+
+# PRODUCT SALES STATS (maintained aggregate, see utils/sales_stats.py)
+class ProductSalesStats(db.Model):
+    __tablename__ = 'product_sales_stats'
+
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id', ondelete='CASCADE'), primary_key=True)
+    units_sold = db.Column(db.Integer, nullable=False, default=0)  # Units in paid orders
+    revenue = db.Column(db.Float, nullable=False, default=0)  # Sum of price * quantity in paid orders
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+
+
+# AUDIT EVENTS (admin actions, written in batches by utils/audit.py)
+class AuditEvent(db.Model):
+    __tablename__ = 'audit_events'
+
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.now)  # When the action happened
+    user_id = db.Column(db.Integer)  # No foreign key: the trail outlives deleted users
+    action = db.Column(db.String(64), nullable=False)
+    request_id = db.Column(db.String(64))
+    method = db.Column(db.String(10))
+    path = db.Column(db.String(255))
+    details = db.Column(db.JSON)
+
+    __table_args__ = (
+        db.Index('idx_audit_created', 'created_at', 'id'),  # For the trail, newest first
+        db.Index('idx_audit_action_created', 'action', 'created_at'),  # For one kind of action
+        db.Index('idx_audit_user_created', 'user_id', 'created_at'),  # For one admin's actions
+    )
+
+
+# COUNTERS (named aggregates kept current by the write paths, see utils/counters.py)
+class Counter(db.Model):
+    __tablename__ = 'counters'
+
+    name = db.Column(db.String(64), primary_key=True)  # e.g. "orders.pending"
+    value = db.Column(db.Float, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+
+
+# CUSTOMER STATS (maintained per-user order aggregate, see utils/customer_stats.py)
+class CustomerStats(db.Model):
+    __tablename__ = 'customer_stats'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    order_count = db.Column(db.Integer, nullable=False, default=0)  # Paid orders
+    paid_total = db.Column(db.Float, nullable=False, default=0)  # Sum of paid order totals
+    last_paid_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('idx_customer_stats_paid_total', 'paid_total', 'user_id'),  # For customers by spend
+    )
+
+
+# SALES ROLLUPS (time-series aggregates, see utils/rollups.py)
+class SalesRollup(db.Model):
+    __tablename__ = 'sales_rollups'
+
+    granularity = db.Column(db.String(10), primary_key=True)  # "hour" or "day"
+    bucket_start = db.Column(db.DateTime, primary_key=True)
+    paid_orders = db.Column(db.Integer, nullable=False, default=0)
+    failed_orders = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)  # Paid revenue
+    units = db.Column(db.Integer, nullable=False, default=0)  # Units in paid orders
+
+
+class CategorySalesRollup(db.Model):
+    __tablename__ = 'category_sales_rollups'
+
+    granularity = db.Column(db.String(10), primary_key=True)
+    bucket_start = db.Column(db.DateTime, primary_key=True)
+    category_id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # 0 = uncategorized
+    paid_orders = db.Column(db.Integer, nullable=False, default=0)  # Paid orders with items in the category
+    revenue = db.Column(db.Float, nullable=False, default=0)
+    units = db.Column(db.Integer, nullable=False, default=0)
+
+
+# PRODUCT DAILY SALES (trailing window behind Product.sales_velocity)
+class ProductDailySales(db.Model):
+    __tablename__ = 'product_daily_sales'
+
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True, index=True)
+    units = db.Column(db.Integer, nullable=False, default=0)
@@ -1,12 +1,17 @@
 from flask import request
 from flask_restful import Resource
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import func
-from models import db, Product, OrderItem, User
-from sqlalchemy.orm import joinedload
-from utils.decorators import admin_required
+from models import db, Product, ProductSalesStats
+from sqlalchemy.orm import joinedload, load_only
+from utils.decorators import admin_required, has_role
+from utils.user_cache import user_cache
+from utils.catalog_cache import catalog_cache
+from utils.search import product_search
+from utils.suggest import suggest_index
+from utils.velocity import days_of_cover, is_low_stock
+from utils.fields import ADMIN_PRODUCT_FIELDS, FieldSelectionError, parse_fields, product_columns, project_product
 
-from auth_context import log_user_action
+from auth_context import log_admin_action
 from logging_config import get_logger, log_exception
 
 logger = get_logger('admin.products')
@@ -19,45 +24,54 @@ class AdminProductsResource(Resource):
     # GET all products ( filter by low stock)
     @admin_required
     def get(self):
+        """
+        GET /admin/products?low_stock=&fields=
+        """
+        current_user_id = get_jwt_identity()
+
+        try:
+            fields = parse_fields(request.args.get("fields"), ADMIN_PRODUCT_FIELDS) or ADMIN_PRODUCT_FIELDS
+        except FieldSelectionError as e:
+            return {"error": str(e)}, 400
 
         low_stock = request.args.get("low_stock", type=int)
-        query = Product.query
+        query = db.session.query(Product).options(load_only(*product_columns(fields)))
+
+        # Sales totals come from the maintained stats table in the same query
+        with_sales = "total_sales" in fields or "total_revenue" in fields
+        if with_sales:
+            query = query.outerjoin(
+                ProductSalesStats, ProductSalesStats.product_id == Product.id
+            ).add_columns(ProductSalesStats.units_sold, ProductSalesStats.revenue)
         
         # Use joinedload to prevent N+1 queries when accessing related data
-        query = query.options(joinedload(Product.category))
+        if "category" in fields:
+            query = query.options(joinedload(Product.category))
         
         if low_stock is not None:
             query = query.filter(Product.stock <= low_stock)
 
-        products = query.all()
-
         data = []
-        for product in products:
-            # Optimize aggregate queries by using subqueries instead of separate queries
-            # Calculate total sales for this product
-            total_sales_result = (
-                db.session.query(func.sum(OrderItem.quantity))
-                .filter(OrderItem.product_id == product.id)
-                .filter(OrderItem.order.has(status='paid'))  # Only count paid orders
-                .scalar()
-            )
-            total_sales = total_sales_result or 0
-
-            # Calculate total revenue for this product
-            total_revenue_result = (
-                db.session.query(func.sum(OrderItem.price * OrderItem.quantity))
-                .filter(OrderItem.product_id == product.id)
-                .filter(OrderItem.order.has(status='paid'))  # Only count paid orders
-                .scalar()
-            )
-            total_revenue = total_revenue_result or 0
-
-            product_dict = product.to_dict()
-            product_dict.update({
-                "total_sales": total_sales,
-                "total_revenue": float(total_revenue),
-                "low_stock_warning": product.stock <= 5,  # Example business rule
-            })
+        for row in query.all():
+            product, units_sold, revenue = row if with_sales else (row, None, None)
+            product_dict = project_product(product, fields)
+
+            if "total_sales" in fields:
+                product_dict["total_sales"] = units_sold or 0
+
+            if "total_revenue" in fields:
+                product_dict["total_revenue"] = float(revenue or 0)
+
+            if "sales_velocity" in fields:
+                product_dict["sales_velocity"] = round(product.sales_velocity, 3)
+
+            if "days_of_cover" in fields:
+                cover = days_of_cover(product.stock, product.sales_velocity)
+                product_dict["days_of_cover"] = round(cover, 1) if cover is not None else None
+
+            if "low_stock_warning" in fields:
+                product_dict["low_stock_warning"] = is_low_stock(product.stock, product.sales_velocity)
+
             data.append(product_dict)
 
         # Log products listed
@@ -73,10 +87,9 @@ class AdminProductsResource(Resource):
     @jwt_required()
     def post(self):
         """Create a new product (admin only)"""
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
-        if not current_user or current_user.role != "admin":
+        if not has_role("admin"):
             # Log unauthorized attempt
+            current_user = user_cache.get(get_jwt_identity())
             logger.warning(
                 "Non-admin attempted to create product",
                 event="unauthorized_admin_access",
@@ -105,6 +118,9 @@ class AdminProductsResource(Resource):
             )
             db.session.add(product)
             db.session.commit()
+            product_search.index_product(product)
+            suggest_index.upsert_product(product)
+            catalog_cache.bump("product_created")
             
             # Log product created
             logger.info(
@@ -117,7 +133,7 @@ class AdminProductsResource(Resource):
             )
             
             # Record admin action
-            log_user_action('product_created', product_id=product.id)
+            log_admin_action('product_created', product_id=product.id)
             
             return {
                 "message": "Product created successfully",
@@ -139,9 +155,7 @@ class AdminProductsResource(Resource):
     @admin_required
     def put(self, product_id):
         """Update an existing product (admin only)"""
-        pass  # Admin check handled by decorator
-
-        product = Product.query.get(product_id)
+        product = db.session.get(Product, product_id)
         if not product:
             return {"error": "Product not found"}, 404
 
@@ -159,6 +173,9 @@ class AdminProductsResource(Resource):
                     updated_fields.append(field)
 
             db.session.commit()
+            product_search.index_product(product)
+            suggest_index.upsert_product(product)
+            catalog_cache.bump("product_updated")
             
             # Log product updated
             logger.info(
@@ -169,7 +186,7 @@ class AdminProductsResource(Resource):
             )
             
             # Record admin action
-            log_user_action('product_updated', product_id=product.id)
+            log_admin_action('product_updated', product_id=product.id)
             
             return {
                 "message": "Product updated successfully",
@@ -190,9 +207,7 @@ class AdminProductsResource(Resource):
     @admin_required
     def delete(self, product_id):
         """Delete a product (admin only) - with validation"""
-        pass  # Admin check handled by decorator
-
-        product = Product.query.get(product_id)
+        product = db.session.get(Product, product_id)
         if not product:
             return {"error": "Product not found"}, 404
 
@@ -218,6 +233,9 @@ class AdminProductsResource(Resource):
         try:
             db.session.delete(product)
             db.session.commit()
+            product_search.remove_product(product_id)
+            suggest_index.remove_product(product_id)
+            catalog_cache.bump("product_deleted")
             
             # Log product deleted
             logger.info(
@@ -228,7 +246,7 @@ class AdminProductsResource(Resource):
             )
             
             # Record admin action
-            log_user_action('product_deleted', product_id=product_id)
+            log_admin_action('product_deleted', product_id=product_id)
             
             return {"message": "Product deleted successfully"}, 200
         except Exception as e:
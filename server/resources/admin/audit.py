@@ -0,0 +1,53 @@
+from flask import request
+from flask_restful import Resource
+from models import db, AuditEvent
+from utils.decorators import admin_required
+from utils.pagination import InvalidCursor, get_page_size, paginate_keyset, parse_datetime, parse_query_datetime
+from utils.serializers import AUDIT_EVENT
+
+# Newest first; served by idx_audit_created (or the action / user indexes when filtered)
+AUDIT_SORT = ((AuditEvent.created_at, AuditEvent.id), (parse_datetime, int))
+
+
+class AdminAuditResource(Resource):
+    @admin_required
+    def get(self):
+        """
+        GET /admin/audit?action=&user_id=&from=&to=&limit=&cursor=
+        Keyset paginated admin audit trail, newest first. Events are written
+        in batches, so the last few seconds may not be visible yet.
+        """
+        try:
+            limit = get_page_size(request.args.get("limit"))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        try:
+            start = parse_query_datetime(request.args["from"]) if "from" in request.args else None
+            end = parse_query_datetime(request.args["to"]) if "to" in request.args else None
+        except ValueError:
+            return {"error": "'from' and 'to' must be ISO 8601 dates"}, 400
+
+        query = db.session.query(AuditEvent)
+        action = request.args.get("action")
+        if action:
+            query = query.filter(AuditEvent.action == action)
+        user_id = request.args.get("user_id", type=int)
+        if user_id is not None:
+            query = query.filter(AuditEvent.user_id == user_id)
+        if start:
+            query = query.filter(AuditEvent.created_at >= start)
+        if end:
+            query = query.filter(AuditEvent.created_at < end)
+
+        columns, parsers = AUDIT_SORT
+        try:
+            events, next_cursor = paginate_keyset(
+                query, columns, parsers,
+                cursor=request.args.get("cursor"),
+                limit=limit,
+                descending=True,
+            )
+        except InvalidCursor as e:
+            return {"error": str(e)}, 400
+
+        return {"events": AUDIT_EVENT.dump_many(events), "next_cursor": next_cursor, "limit": limit}, 200
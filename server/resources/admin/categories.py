@@ -3,8 +3,12 @@ from flask_restful import Resource
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import db, Category, User
 from utils.decorators import admin_required
+from utils.catalog_cache import catalog_cache, json_response
+from utils.categories import category_header
+from utils.serializers import CATEGORY_SUMMARY
+from utils.suggest import suggest_index
 
-from auth_context import log_user_action
+from auth_context import log_admin_action
 from logging_config import get_logger
 
 logger = get_logger('admin.categories')
@@ -16,21 +20,28 @@ class CategoriesResource(Resource):
         GET /admin/categories/<id>
         """
         if id:
-            category = Category.query.get(id)
-            if not category:
+            # Products are paged separately through /categories/<id>/products
+            try:
+                entry = category_header(id)
+            except LookupError:
                 return {"error": "Category not found"}, 404
-            return category.to_dict(), 200
+            return json_response(entry, route="categories")
 
+        entry = catalog_cache.get_or_build(("categories",), self._list_categories)
+        return json_response(entry, route="categories")
+
+    @staticmethod
+    def _list_categories():
         categories = Category.query.all()
-        
-        # Log categories listed
+
+        # Log categories listed (only on a cache miss)
         logger.info(
             f"Admin listed {len(categories)} categories",
             event="category_listed",
             count=len(categories)
         )
-        
-        return [cat.to_dict() for cat in categories], 200
+
+        return CATEGORY_SUMMARY.dump_many(categories)
 
     @admin_required
     def post(self):
@@ -54,19 +65,21 @@ class CategoriesResource(Resource):
         category = Category(name=name, description=description)
         db.session.add(category)
         db.session.commit()
+        suggest_index.upsert_category(category)
+        catalog_cache.bump("category_created")
 
         # Log category created
         logger.info(
             f"Category '{category.name}' created by admin",
             event="category_created",
             category_id=category.id,
-            name=category.name
+            category_name=category.name
         )
         
         # Record admin action
-        log_user_action('category_created', category_id=category.id)
+        log_admin_action('category_created', category_id=category.id)
 
-        return {"message": "Category added", "category": category.to_dict()}, 201
+        return {"message": "Category added", "category": CATEGORY_SUMMARY.dump(category)}, 201
 
     @admin_required
     def put(self, id):
@@ -85,19 +98,21 @@ class CategoriesResource(Resource):
         category.description = data.get("description", category.description)
 
         db.session.commit()
+        suggest_index.upsert_category(category)
+        catalog_cache.bump("category_updated")
         
         # Log category updated
         logger.info(
             f"Category '{category.name}' updated by admin",
             event="category_updated",
             category_id=category.id,
-            name=category.name
+            category_name=category.name
         )
         
         # Record admin action
-        log_user_action('category_updated', category_id=category.id)
+        log_admin_action('category_updated', category_id=category.id)
         
-        return {"message": "Category updated", "category": category.to_dict()}, 200
+        return {"message": "Category updated", "category": CATEGORY_SUMMARY.dump(category)}, 200
 
     @admin_required
     def delete(self, id):
@@ -113,16 +128,18 @@ class CategoriesResource(Resource):
 
         db.session.delete(category)
         db.session.commit()
+        suggest_index.remove_category(id)
+        catalog_cache.bump("category_deleted")
         
         # Log category deleted
         logger.info(
             f"Category '{category.name}' deleted by admin",
             event="category_deleted",
             category_id=category.id,
-            name=category.name
+            category_name=category.name
         )
         
         # Record admin action
-        log_user_action('category_deleted', category_id=category.id)
+        log_admin_action('category_deleted', category_id=category.id)
         
         return {"message": f"Category '{category.name}' deleted"}, 200
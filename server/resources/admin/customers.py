@@ -1,40 +1,108 @@
 from flask import request
 from flask_restful import Resource
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import User
+from sqlalchemy import func, or_
+from sqlalchemy.orm import contains_eager, load_only
+from models import db, CustomerStats, User
 from utils.decorators import admin_required
+from utils.pagination import (
+    InvalidCursor, estimate_count, get_page_size, paginate_keyset, parse_datetime, prefix_filter
+)
+from utils.serializers import USER_ADMIN
 
 from logging_config import get_logger
 
 logger = get_logger('admin.customers')
 
+# ?sort= -> (sort columns, cursor parsers), always newest/highest first.
+# "recent" is served by idx_user_role_created, "spend" by idx_customer_stats_paid_total.
+CUSTOMER_SORTS = {
+    "recent": ((User.created_at, User.id), (parse_datetime, int)),
+    "spend": ((CustomerStats.paid_total, CustomerStats.user_id), (float, int)),
+}
+# Only the columns the listing shows
+USER_ADMIN_COLUMNS = [getattr(User, source) for _, source in USER_ADMIN.fields]
+
+
+def customer_search_filter(q):
+    """
+    Case-insensitive prefix match on email, phone and first/last name.
+    Each branch is served by its index (the lower() expression indexes for
+    the text columns), so the OR is answered without a table scan.
+    """
+    q = q.strip()
+    return or_(
+        prefix_filter(func.lower(User.email), q.lower()),
+        prefix_filter(User.phone_number, q),
+        prefix_filter(func.lower(User.first_name), q.lower()),
+        prefix_filter(func.lower(User.last_name), q.lower()),
+    )
+
+
+def spend_cursor(user):
+    return [user.stats.paid_total, user.id]
+
+
 class AdminCustomersResource(Resource):
     """
-    Admin-only endpoint to view all customers.
+    Admin-only endpoint to view customers.
     """
 
     @admin_required
     def get(self):
+        """
+        GET /admin/customers?q=&sort=recent|spend&limit=&cursor=
+        Keyset paginated customers with their order stats and optional
+        prefix search. sort=spend lists customers with paid orders, biggest
+        spenders first.
+        """
+        sort = request.args.get("sort", "recent")
+        if sort not in CUSTOMER_SORTS:
+            return {"error": f"'sort' must be one of: {', '.join(CUSTOMER_SORTS)}"}, 400
+        try:
+            limit = get_page_size(request.args.get("limit"))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        q = (request.args.get("q") or "").strip()
+        query = db.session.query(User)
+        if sort == "spend":
+            query = query.join(User.stats)
+        else:
+            query = query.outerjoin(User.stats)
+        query = query.options(
+            load_only(*USER_ADMIN_COLUMNS), contains_eager(User.stats)
+        ).filter(User.role == "customer")
+        if q:
+            query = query.filter(customer_search_filter(q))
 
-        customers = User.query.filter_by(role="customer").all()
+        columns, parsers = CUSTOMER_SORTS[sort]
+        try:
+            customers, next_cursor = paginate_keyset(
+                query, columns, parsers,
+                cursor=request.args.get("cursor"),
+                limit=limit,
+                descending=True,
+                cursor_values=spend_cursor if sort == "spend" else None,
+            )
+        except InvalidCursor as e:
+            return {"error": str(e)}, 400
 
-        data = [
-            {
-                "id": user.id,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-                "email": user.email,
-                "phone_number": user.phone_number,
-                "created_at": user.created_at,
-            }
-            for user in customers
-        ]
+        total, total_exact = estimate_count(query)
+        data = USER_ADMIN.dump_many(customers)
 
         # Log customers listed
         logger.info(
             f"Admin listed {len(data)} customers",
             event="customers_listed",
-            count=len(data)
+            count=len(data),
+            sort=sort,
+            search=bool(q)
         )
 
-        return {"customers": data}, 200
+        return {
+            "customers": data,
+            "next_cursor": next_cursor,
+            "limit": limit,
+            "total_estimate": total,
+            "total_is_exact": total_exact,
+        }, 200
@@ -0,0 +1,31 @@
+from datetime import date
+
+from flask import Response, request, stream_with_context
+from flask_restful import Resource
+from utils.decorators import admin_required
+from utils.exports import EXPORT_FORMATS, EXPORTS, stream_export
+
+from auth_context import log_admin_action
+
+
+class AdminExportResource(Resource):
+    @admin_required
+    def get(self, name):
+        """
+        GET /admin/export/<products|orders|customers>?format=csv|ndjson
+        Stream the whole table as a download, one batch of rows at a time.
+        """
+        if name not in EXPORTS:
+            return {"error": f"Unknown export; must be one of: {', '.join(EXPORTS)}"}, 404
+        fmt = request.args.get("format", "csv")
+        if fmt not in EXPORT_FORMATS:
+            return {"error": f"'format' must be one of: {', '.join(EXPORT_FORMATS)}"}, 400
+
+        log_admin_action('export_started', export=name, format=fmt)
+
+        filename = f"{name}-{date.today().isoformat()}.{fmt}"
+        return Response(
+            stream_with_context(stream_export(name, fmt)),
+            mimetype=EXPORT_FORMATS[fmt],
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
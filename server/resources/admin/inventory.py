@@ -0,0 +1,81 @@
+from flask import request
+from flask_restful import Resource
+from utils.decorators import admin_required
+from utils.inventory import adjust_stock, merge_deltas
+from utils.pagination import get_page_size
+from utils.velocity import WINDOW_DAYS, at_risk_products
+
+from auth_context import log_admin_action
+from logging_config import get_logger
+
+logger = get_logger('admin.inventory')
+
+MAX_ADJUSTMENTS = 10000
+
+
+def parse_adjustments(data):
+    """
+    Validate [{product_id, delta}, ...] (bare or under "adjustments").
+    Returns (pairs, error message).
+    """
+    items = data.get("adjustments") if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        return None, "'adjustments' must be a non-empty list of {product_id, delta}"
+    if len(items) > MAX_ADJUSTMENTS:
+        return None, f"At most {MAX_ADJUSTMENTS} adjustments per request"
+
+    pairs = []
+    for index, item in enumerate(items):
+        product_id = item.get("product_id") if isinstance(item, dict) else None
+        delta = item.get("delta") if isinstance(item, dict) else None
+        # bool is an int subclass; reject true/false explicitly
+        if not all(isinstance(value, int) and not isinstance(value, bool) for value in (product_id, delta)):
+            return None, f"Adjustment {index}: 'product_id' and 'delta' must be integers"
+        pairs.append((product_id, delta))
+    return pairs, None
+
+
+class InventoryAdjustResource(Resource):
+    @admin_required
+    def post(self):
+        """
+        POST /admin/inventory/adjust
+        Apply stock deltas in bulk. Adjustments that would take stock below
+        zero (or name unknown products) are skipped and reported.
+        """
+        pairs, error = parse_adjustments(request.get_json(silent=True))
+        if error:
+            return {"error": error}, 400
+
+        deltas = merge_deltas(pairs)
+        applied, rejected = adjust_stock(deltas)
+
+        log_admin_action('inventory_adjusted', applied_count=len(applied), rejected_count=len(rejected))
+
+        return {"applied": len(applied), "rejected": rejected}, 200
+
+
+class InventoryAtRiskResource(Resource):
+    @admin_required
+    def get(self):
+        """
+        GET /admin/inventory/at-risk?limit=&max_days=
+        Selling products closest to stocking out (fewest days of cover first).
+        """
+        try:
+            limit = get_page_size(request.args.get("limit"), default=20, maximum=200)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        max_days = request.args.get("max_days", type=float)
+
+        products = [
+            {
+                "id": row.id,
+                "name": row.name,
+                "stock": row.stock,
+                "sales_velocity": round(row.sales_velocity, 3),
+                "days_of_cover": round(row.days_of_cover, 1),
+            }
+            for row in at_risk_products(limit, max_days=max_days)
+        ]
+        return {"products": products, "window_days": WINDOW_DAYS}, 200
@@ -0,0 +1,72 @@
+from flask import request
+from flask_restful import Resource
+from models import db, Order
+from utils.decorators import admin_required
+from utils.pagination import InvalidCursor, get_page_size, paginate_keyset, parse_datetime, parse_query_datetime
+from utils.sales_stats import ORDER_STATUSES, order_status_counts
+from utils.serializers import ORDER_ADMIN
+
+from logging_config import get_logger
+
+logger = get_logger('admin.orders')
+
+# Newest first within each status; matches idx_order_status_created (plus id for ties)
+ORDER_SORT = ((Order.status, Order.created_at, Order.id), (str, parse_datetime, int))
+
+
+class AdminOrdersResource(Resource):
+    @admin_required
+    def get(self):
+        """
+        GET /admin/orders?status=&user_id=&from=&to=&limit=&cursor=
+        Keyset paginated orders with their items. `from` is inclusive and
+        `to` exclusive (ISO 8601, on created_at).
+        """
+        status = request.args.get("status")
+        if status is not None and status not in ORDER_STATUSES:
+            return {"error": f"'status' must be one of: {', '.join(ORDER_STATUSES)}"}, 400
+        try:
+            limit = get_page_size(request.args.get("limit"))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        try:
+            start = parse_query_datetime(request.args["from"]) if "from" in request.args else None
+            end = parse_query_datetime(request.args["to"]) if "to" in request.args else None
+        except ValueError:
+            return {"error": "'from' and 'to' must be ISO 8601 dates"}, 400
+
+        query = db.session.query(Order).options(*ORDER_ADMIN.load_options())
+        if status:
+            query = query.filter(Order.status == status)
+        user_id = request.args.get("user_id", type=int)
+        if user_id is not None:
+            query = query.filter(Order.user_id == user_id)
+        if start:
+            query = query.filter(Order.created_at >= start)
+        if end:
+            query = query.filter(Order.created_at < end)
+
+        columns, parsers = ORDER_SORT
+        try:
+            orders, next_cursor = paginate_keyset(
+                query, columns, parsers,
+                cursor=request.args.get("cursor"),
+                limit=limit,
+                descending=True,
+            )
+        except InvalidCursor as e:
+            return {"error": str(e)}, 400
+
+        return {"orders": ORDER_ADMIN.dump_many(orders), "next_cursor": next_cursor, "limit": limit}, 200
+
+
+class AdminOrderCountsResource(Resource):
+    @admin_required
+    def get(self):
+        """
+        GET /admin/orders/counts
+        Number of orders per status, read from the maintained counters.
+        """
+        counts = {status: 0 for status in ORDER_STATUSES}
+        counts.update(order_status_counts())
+        return {"counts": counts, "total": sum(counts.values())}, 200
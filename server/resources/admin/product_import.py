@@ -0,0 +1,74 @@
+import os
+
+from flask import request
+from flask_restful import Resource
+from utils.decorators import admin_required
+from utils.product_import import ImportFormatError, ProductImporter, iter_upload_rows
+
+from auth_context import log_admin_action
+from logging_config import get_logger
+from request_tracking import PerformanceTimer
+
+logger = get_logger('admin.product_import')
+
+DEFAULT_BATCH_SIZE = int(os.getenv("PRODUCT_IMPORT_BATCH_SIZE", 1000))
+MAX_BATCH_SIZE = 10000
+
+# Upload extension -> mimetype, for multipart files sent as application/octet-stream
+EXTENSION_MIMETYPES = {
+    ".csv": "text/csv",
+    ".ndjson": "application/x-ndjson",
+    ".jsonl": "application/x-ndjson",
+}
+
+
+class AdminProductImportResource(Resource):
+    @admin_required
+    def post(self):
+        """
+        POST /admin/products/import?batch_size=
+        Bulk create/update products from a CSV or NDJSON upload, sent either
+        as the raw request body (Content-Type text/csv or application/x-ndjson)
+        or as a multipart "file" field.
+        """
+        try:
+            batch_size = int(request.args.get("batch_size", DEFAULT_BATCH_SIZE))
+        except ValueError:
+            return {"error": "'batch_size' must be an integer"}, 400
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+
+        upload = request.files.get("file")
+        if upload is not None:
+            stream, mimetype = upload.stream, upload.mimetype
+            extension = os.path.splitext(upload.filename or "")[1].lower()
+            mimetype = EXTENSION_MIMETYPES.get(extension, mimetype)
+        else:
+            stream, mimetype = request.stream, request.mimetype
+
+        try:
+            rows = iter_upload_rows(stream, mimetype)
+            importer = ProductImporter(batch_size=batch_size)
+            with PerformanceTimer('product_import'):
+                report = importer.run(rows)
+        except ImportFormatError as e:
+            if e.report is None:
+                return {"error": str(e)}, 400
+            # Batches before the unreadable part were committed; say what they did
+            log_admin_action(
+                'products_imported', created_count=e.report["created"], updated_count=e.report["updated"]
+            )
+            return {"error": str(e), **e.report}, 400
+
+        logger.info(
+            f"Admin imported products: {report['created']} created, {report['updated']} updated, "
+            f"{report['failed']} failed",
+            event="products_imported",
+            created_count=report["created"],
+            updated_count=report["updated"],
+            failed_count=report["failed"],
+            batch_size=batch_size
+        )
+        log_admin_action('products_imported', created_count=report["created"], updated_count=report["updated"])
+
+        status = 200 if report["created"] or report["updated"] or not report["failed"] else 400
+        return report, status
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+from flask import request
+from flask_restful import Resource
+from utils.decorators import admin_required
+from utils.pagination import parse_query_datetime
+from utils.rollups import GRANULARITIES, get_timeseries
+from utils.summary import read_summary
+
+from logging_config import get_logger
+
+logger = get_logger('admin.stats')
+
+# Default window and the most points one request may ask for, per granularity
+DEFAULT_WINDOWS = {"hour": timedelta(hours=48), "day": timedelta(days=30)}
+MAX_POINTS = {"hour": 24 * 92, "day": 366 * 5}
+
+
+class StatsTimeseriesResource(Resource):
+    @admin_required
+    def get(self):
+        """
+        GET /admin/stats/timeseries?granularity=hour|day&from=&to=&category_id=
+        Orders, paid revenue and units per bucket, read from the rollup tables.
+        `from` is inclusive and `to` exclusive (ISO 8601); buckets without
+        activity are returned as zeros.
+        """
+        granularity = request.args.get("granularity", "day")
+        if granularity not in GRANULARITIES:
+            return {"error": f"'granularity' must be one of: {', '.join(GRANULARITIES)}"}, 400
+
+        try:
+            end = parse_query_datetime(request.args["to"]) if "to" in request.args else datetime.now()
+            start = (
+                parse_query_datetime(request.args["from"]) if "from" in request.args
+                else end - DEFAULT_WINDOWS[granularity]
+            )
+        except ValueError:
+            return {"error": "'from' and 'to' must be ISO 8601 dates"}, 400
+
+        if start >= end:
+            return {"error": "'from' must be before 'to'"}, 400
+        if (end - start) / GRANULARITIES[granularity] > MAX_POINTS[granularity]:
+            return {"error": f"At most {MAX_POINTS[granularity]} {granularity} buckets per request"}, 400
+
+        category_id = request.args.get("category_id", type=int)
+        points = get_timeseries(granularity, start, end, category_id=category_id)
+
+        return {
+            "granularity": granularity,
+            "from": start.isoformat(),
+            "to": end.isoformat(),
+            "category_id": category_id,
+            "points": points,
+        }, 200
+
+
+class AdminSummaryResource(Resource):
+    @admin_required
+    def get(self):
+        """
+        GET /admin/summary
+        Paid revenue, orders by status, customer count and the number of
+        products at or below SUMMARY_STOCK_THRESHOLD, read from the
+        maintained counters.
+        """
+        return read_summary(), 200
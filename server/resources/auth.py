@@ -71,7 +71,7 @@ class AuthResource(Resource):
             authenticate_user_context(user.id)
             log_user_action('login', user.id)
             
-            token = create_access_token(identity=user.id)
+            token = create_access_token(identity=user.id, additional_claims={"role": user.role})
             redirect_url = "/admin/dashboard" if user.role == "admin" else "/"
             user_data = UserResponseSchema().dump(user)
 
@@ -122,7 +122,7 @@ class AuthResource(Resource):
             authenticate_user_context(new_user.id)
             log_user_action('registration', new_user.id)
             
-            token = create_access_token(identity=new_user.id)
+            token = create_access_token(identity=new_user.id, additional_claims={"role": new_user.role})
             user_data = UserResponseSchema().dump(new_user)
 
             # Log successful registration
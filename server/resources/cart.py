@@ -3,23 +3,44 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask import request
 from models import db, Cart, CartItem, Product
 from sqlalchemy import and_
+from sqlalchemy.orm import joinedload
 
 from logging_config import get_logger, log_exception
 from request_tracking import PerformanceTimer
+from utils.fields import CART_ITEM_FIELDS, CART_ITEM_PRODUCT_COLUMNS, FieldSelectionError, parse_fields
+from utils.serializers import CART_ITEM
 
 logger = get_logger('cart')
 
+
+def serialize_cart_item(item, fields=None):
+    """Cart item response, optionally limited to a sparse fieldset"""
+    serializer = CART_ITEM.only(fields) if fields else CART_ITEM
+    return serializer.dump(item)
+
 # CART RESOURCE
 class CartResource(Resource):
     @jwt_required()
     def get(self):
         """Get all items in the current user's cart"""
         user_id = get_jwt_identity()
-        # Use joinedload to prevent N+1 queries
-        from sqlalchemy.orm import joinedload
+
+        try:
+            fields = parse_fields(request.args.get("fields"), CART_ITEM_FIELDS)
+        except FieldSelectionError as e:
+            return {'message': str(e)}, 400
+
+        items_load = joinedload(Cart.items)
+        if fields is None:
+            items_load = items_load.joinedload(CartItem.product)
+        else:
+            # Only join products when a product_* field was asked for, and only load those columns
+            product_columns = [CART_ITEM_PRODUCT_COLUMNS[f] for f in fields if f in CART_ITEM_PRODUCT_COLUMNS]
+            if product_columns:
+                items_load = items_load.joinedload(CartItem.product).load_only(Product.id, *product_columns)
         
         with PerformanceTimer('db_query_cart'):
-            cart = Cart.query.options(joinedload(Cart.items).joinedload(CartItem.product)).filter_by(user_id=user_id).first()
+            cart = Cart.query.options(items_load).filter_by(user_id=user_id).first()
         
         if not cart:
             # Log cart viewed (empty)
@@ -30,17 +51,7 @@ class CartResource(Resource):
             )
             return {'items': []}, 200
 
-        items = [
-            {
-                'id': item.id,
-                'product_id': item.product.id,
-                'product_name': item.product.name,
-                'product_price': item.product.price,
-                'product_image': item.product.image_url,
-                'quantity': item.quantity
-            }
-            for item in cart.items
-        ]
+        items = [serialize_cart_item(item, fields) for item in cart.items]
         
         # Log cart viewed
         logger.info(
@@ -131,10 +142,11 @@ class CartResource(Resource):
             db.session.commit()
             
             # Return the item (need to query again since session was committed)
+            item_query = CartItem.query.options(*CART_ITEM.load_options(joinedload))
             if existing_item:
-                final_item = CartItem.query.filter_by(id=existing_item.id).first()
+                final_item = item_query.filter_by(id=existing_item.id).first()
             else:
-                final_item = CartItem.query.filter_by(cart_id=cart.id, product_id=product.id).first()
+                final_item = item_query.filter_by(cart_id=cart.id, product_id=product.id).first()
 
             
             
@@ -147,14 +159,7 @@ class CartResource(Resource):
                 quantity=quantity
             )
 
-            return {
-                'id': final_item.id,
-                'product_id': final_item.product.id,
-                'product_name': final_item.product.name,
-                'product_price': final_item.product.price,
-                'product_image': final_item.product.image_url,
-                'quantity': final_item.quantity
-            }, 201
+            return serialize_cart_item(final_item), 201
 
         except Exception as e:
             db.session.rollback()
@@ -223,7 +228,7 @@ class CartItemResource(Resource):
             db.session.commit()
 
             # Refresh item after commit
-            updated_item = CartItem.query.filter_by(id=item.id).first()
+            updated_item = CartItem.query.options(*CART_ITEM.load_options(joinedload)).filter_by(id=item.id).first()
 
             # Log item update
             logger.info(
@@ -234,14 +239,7 @@ class CartItemResource(Resource):
                 new_quantity=quantity
             )
 
-            return {
-                'id': updated_item.id,
-                'product_id': updated_item.product.id,
-                'product_name': updated_item.product.name,
-                'product_price': updated_item.product.price,
-                'product_image': updated_item.product.image_url,
-                'quantity': updated_item.quantity
-            }, 200
+            return serialize_cart_item(updated_item), 200
 
         except Exception as e:
             db.session.rollback()
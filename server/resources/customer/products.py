@@ -1,7 +1,350 @@
+import json
+import math
+from flask import request
 from flask_restful import Resource
-from models import Product
+from sqlalchemy import Integer, case, cast, func
+from sqlalchemy.orm import joinedload
+from models import db, Category, Product
+from utils.catalog_cache import CachedPayload, catalog_cache, json_response
+from utils.categories import category_header
+from utils.product_cache import product_cache
+from utils.product_render import rendered_products_json, stitch_json_array
+from utils.fields import (
+    PRODUCT_FIELDS, FieldSelectionError, category_columns, parse_fields,
+    product_columns, project_product_row
+)
+from utils.pagination import InvalidCursor, get_page_size, paginate_keyset, parse_datetime
+from utils.search import product_search, tokenize
+from utils.suggest import normalize, suggest_index
+
+# Sort key -> (keyset columns, cursor parsers, descending)
+# Every key ends in Product.id so the ordering is total.
+PRODUCT_SORTS = {
+    "newest": ((Product.created_at, Product.id), (parse_datetime, int), True),
+    "price_asc": ((Product.price, Product.id), (float, int), False),
+    "price_desc": ((Product.price, Product.id), (float, int), True),
+}
+
+
+def parse_bool_arg(value):
+    return value is not None and value.lower() in ("1", "true", "yes")
+
+
+def parse_product_filters(args):
+    return {
+        "category_id": args.get("category_id", type=int),
+        "min_price": args.get("min_price", type=float),
+        "max_price": args.get("max_price", type=float),
+        "in_stock": parse_bool_arg(args.get("in_stock")),
+    }
+
+
+def parse_listing_args(args):
+    """(sort, limit, fields) for a product listing; raises ValueError with the client message"""
+    sort = args.get("sort", "newest")
+    if sort not in PRODUCT_SORTS:
+        raise ValueError(f"'sort' must be one of: {', '.join(PRODUCT_SORTS)}")
+    limit = get_page_size(args.get("limit"))
+    try:
+        fields = parse_fields(args.get("fields"), PRODUCT_FIELDS)
+    except FieldSelectionError as e:
+        raise ValueError(str(e))
+    return sort, limit, fields
+
+
+def apply_product_filters(query, filters):
+    """
+    Apply the storefront filters.
+    category_id + price / stock are served by idx_product_category_price
+    and idx_product_category_stock.
+    """
+    if filters["category_id"] is not None:
+        query = query.filter(Product.category_id == filters["category_id"])
+    if filters["min_price"] is not None:
+        query = query.filter(Product.price >= filters["min_price"])
+    if filters["max_price"] is not None:
+        query = query.filter(Product.price <= filters["max_price"])
+    if filters["in_stock"]:
+        query = query.filter(Product.stock > 0)
+    return query
+
+
+def build_product_page(sort, limit, cursor, filters, fields=None):
+    columns, parsers, descending = PRODUCT_SORTS[sort]
+
+    if fields is None:
+        # Only the sort key and the pre-rendered JSON, no Category join
+        query = db.session.query(Product.id, Product.created_at, Product.price, Product.rendered_json)
+    else:
+        # Sparse fieldset: requested columns plus the sort key
+        selected = product_columns(fields) + list(columns)
+        query = db.session.query(*dict.fromkeys(selected))
+        if "category" in fields:
+            query = query.add_columns(*category_columns()).outerjoin(
+                Category, Category.id == Product.category_id
+            )
+    query = apply_product_filters(query, filters)
+
+    rows, next_cursor = paginate_keyset(
+        query, columns, parsers,
+        cursor=cursor,
+        limit=limit,
+        descending=descending,
+    )
+
+    if fields is not None:
+        return {
+            "products": [project_product_row(row, fields) for row in rows],
+            "next_cursor": next_cursor,
+            "limit": limit,
+        }
+
+    body = (
+        '{"products":' + rendered_products_json(rows)
+        + ',"next_cursor":' + json.dumps(next_cursor)
+        + ',"limit":' + json.dumps(limit) + '}'
+    )
+    return body.encode("utf-8")
+
+
+# Upper bound on ?ids= so one request maps to one bounded IN query
+MAX_BATCH_IDS = 100
+
+
+def parse_id_list(raw):
+    """Parse ?ids=1,2,3 into a de-duplicated list, keeping the requested order"""
+    try:
+        ids = [int(part) for part in raw.split(",") if part.strip()]
+    except ValueError:
+        raise ValueError("'ids' must be a comma separated list of product ids")
+    if not ids:
+        raise ValueError("'ids' must name at least one product")
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > MAX_BATCH_IDS:
+        raise ValueError(f"'ids' accepts at most {MAX_BATCH_IDS} products")
+    return ids
+
+
+def batch_products_response(product_ids):
+    """
+    Products for ?ids= in the requested order, from the per-product cache.
+    Ids that don't exist are listed under "missing".
+    """
+    fragments = product_cache.load(product_ids)
+    found = [fragments[product_id] for product_id in product_ids if fragments[product_id]]
+    missing = [product_id for product_id in product_ids if not fragments[product_id]]
+    body = '{"products":' + stitch_json_array(found) + ',"missing":' + json.dumps(missing) + '}'
+    return json_response(CachedPayload(None, body.encode("utf-8")), route="products", reused=False)
+
+
+class ProductResource(Resource):
+    def get(self, product_id):
+        """
+        GET /products/<id>
+        A single product, served from the per-product cache.
+        """
+        fragment = product_cache.load([product_id])[product_id]
+        if fragment is None:
+            return {"error": "Product not found"}, 404
+        return json_response(CachedPayload(None, fragment.encode("utf-8")), route="products", reused=False)
+
 
 class ProductListResource(Resource):
     def get(self):
-        products = Product.query.all()
-        return [product.to_dict() for product in products], 200
+        """
+        GET /products?category_id=&min_price=&max_price=&in_stock=&sort=&limit=&cursor=&fields=
+        Keyset paginated product listing, served from the catalog cache.
+
+        GET /products?ids=1,2,3
+        Batch lookup of specific products (cart, wishlist, recently viewed).
+        """
+        if "ids" in request.args:
+            try:
+                product_ids = parse_id_list(request.args["ids"])
+            except ValueError as e:
+                return {"error": str(e)}, 400
+            return batch_products_response(product_ids)
+
+        try:
+            sort, limit, fields = parse_listing_args(request.args)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        filters = parse_product_filters(request.args)
+        cursor = request.args.get("cursor")
+        cache_key = ("products", sort, limit, cursor, fields, tuple(sorted(filters.items())))
+
+        try:
+            entry = catalog_cache.get_or_build(
+                cache_key, lambda: build_product_page(sort, limit, cursor, filters, fields)
+            )
+        except InvalidCursor as e:
+            return {"error": str(e)}, 400
+
+        return json_response(entry, route="products")
+
+
+def build_category_page(category_id, sort, limit, cursor, filters, fields=None):
+    """A product page of one category, led by the category header"""
+    header = category_header(category_id).body
+    page = build_product_page(sort, limit, cursor, {**filters, "category_id": category_id}, fields)
+    if isinstance(page, bytes):
+        return b'{"category":' + header + b"," + page[1:]
+    return {"category": json.loads(header), **page}
+
+
+class CategoryProductsResource(Resource):
+    def get(self, category_id):
+        """
+        GET /categories/<id>/products?min_price=&max_price=&in_stock=&sort=&limit=&cursor=&fields=
+        The category (with its product_count) and a keyset paginated page
+        of its products, served from the catalog cache.
+        """
+        try:
+            sort, limit, fields = parse_listing_args(request.args)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        filters = parse_product_filters(request.args)
+        cursor = request.args.get("cursor")
+        cache_key = ("category_products", category_id, sort, limit, cursor, fields, tuple(sorted(filters.items())))
+
+        try:
+            entry = catalog_cache.get_or_build(
+                cache_key, lambda: build_category_page(category_id, sort, limit, cursor, filters, fields)
+            )
+        except InvalidCursor as e:
+            return {"error": str(e)}, 400
+        except LookupError:
+            return {"error": "Category not found"}, 404
+
+        return json_response(entry, route="products")
+
+
+def build_search_results(query, limit):
+    ranked = product_search.search(query, limit)
+    ids = [product_id for product_id, _ in ranked]
+    products = {
+        product.id: product
+        for product in Product.query.options(joinedload(Product.category)).filter(Product.id.in_(ids))
+    } if ids else {}
+
+    results = []
+    for product_id, score in ranked:
+        product = products.get(product_id)
+        if product is None:
+            continue  # Deleted since it was indexed
+        data = product.to_dict()
+        data["score"] = round(float(score), 4)
+        results.append(data)
+
+    return {"query": query, "products": results, "count": len(results)}
+
+
+class ProductSearchResource(Resource):
+    def get(self):
+        """
+        GET /products/search?q=&limit=
+        Full-text search over product name and description, best match first.
+        """
+        query = (request.args.get("q") or "").strip()
+        if not tokenize(query):
+            return {"error": "'q' is required"}, 400
+
+        try:
+            limit = get_page_size(request.args.get("limit"), default=20, maximum=50)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        cache_key = ("search", " ".join(tokenize(query)), limit)
+        entry = catalog_cache.get_or_build(cache_key, lambda: build_search_results(query, limit))
+        return json_response(entry, route="products")
+
+
+class ProductSuggestResource(Resource):
+    def get(self):
+        """
+        GET /products/suggest?prefix=&limit=
+        Typeahead suggestions from product and category names, most popular first.
+        """
+        prefix = normalize(request.args.get("prefix"))
+        if not prefix:
+            return {"error": "'prefix' is required"}, 400
+
+        try:
+            limit = get_page_size(request.args.get("limit"), default=8, maximum=20)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        return {"prefix": prefix, "suggestions": suggest_index.suggest(prefix, limit)}, 200
+
+
+# Histogram widths a client may ask for. A fixed set keeps the histogram a
+# sane size and stops arbitrary floats from filling the catalog cache.
+FACET_BUCKET_SIZES = (1, 2, 5, 10, 20, 25, 50, 100, 200, 250, 500, 1000)
+
+
+def build_facets(filters, bucket_size):
+    """
+    Category counts, in-stock counts and a price histogram from a single
+    GROUP BY (category, price bucket) over the filtered products.
+    """
+    scaled = Product.price / bucket_size
+    if db.engine.dialect.name != "sqlite":
+        # CAST rounds on PostgreSQL; SQLite truncates but may lack floor()
+        scaled = func.floor(scaled)
+    bucket = cast(scaled, Integer).label("bucket")
+    query = (
+        db.session.query(
+            Product.category_id,
+            Category.name,
+            bucket,
+            func.count(Product.id),
+            func.sum(case((Product.stock > 0, 1), else_=0)),
+        )
+        .outerjoin(Category, Category.id == Product.category_id)
+        .group_by(Product.category_id, Category.name, bucket)
+    )
+    query = apply_product_filters(query, filters)
+
+    categories = {}
+    histogram = {}
+    total = in_stock = 0
+    for category_id, category_name, bucket_index, count, stocked in query.all():
+        stocked = int(stocked or 0)
+        facet = categories.setdefault(category_id, {
+            "id": category_id, "name": category_name, "count": 0, "in_stock": 0
+        })
+        facet["count"] += count
+        facet["in_stock"] += stocked
+        histogram[bucket_index] = histogram.get(bucket_index, 0) + count
+        total += count
+        in_stock += stocked
+
+    return {
+        "total": total,
+        "in_stock": in_stock,
+        "categories": sorted(categories.values(), key=lambda facet: (-facet["count"], facet["name"] or "")),
+        "price_histogram": [
+            {"min": index * bucket_size, "max": (index + 1) * bucket_size, "count": histogram[index]}
+            for index in sorted(histogram)
+        ],
+        "bucket_size": bucket_size,
+    }
+
+
+class ProductFacetsResource(Resource):
+    def get(self):
+        """
+        GET /products/facets?category_id=&min_price=&max_price=&in_stock=&bucket_size=
+        Facet counts for the storefront filters, served from the catalog cache.
+        """
+        bucket_size = request.args.get("bucket_size", 25.0, type=float)
+        if bucket_size is None or not math.isfinite(bucket_size) or bucket_size not in FACET_BUCKET_SIZES:
+            return {"error": f"'bucket_size' must be one of: {', '.join(map(str, FACET_BUCKET_SIZES))}"}, 400
+        bucket_size = int(bucket_size)
+
+        filters = parse_product_filters(request.args)
+        cache_key = ("facets", bucket_size, tuple(sorted(filters.items())))
+        entry = catalog_cache.get_or_build(cache_key, lambda: build_facets(filters, bucket_size))
+        return json_response(entry, route="products")
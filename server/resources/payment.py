@@ -9,6 +9,8 @@ from sqlalchemy import and_
 
 from logging_config import get_logger, log_exception
 from request_tracking import PerformanceTimer
+from utils.catalog_cache import catalog_cache
+from utils.sales_stats import mark_order_failed, mark_order_paid, record_order_placed
 
 logger = get_logger('payment')
 
@@ -104,6 +106,7 @@ class PaymentResource(Resource):
             )
             db.session.add(order)
             db.session.flush()  # Get order ID without committing
+            record_order_placed(order)
             
             # Create order items and reserve stock
             for cart_item in cart.items:
@@ -119,13 +122,14 @@ class PaymentResource(Resource):
                 cart_item.product.stock -= cart_item.quantity
             
             # Save checkout request ID for later verification
-            order.mesa_checkout_request_id = response.get("CheckoutRequestID")
+            order.mpesa_checkout_request_id = response.get("CheckoutRequestID")
             
             # Clear cart items
             for cart_item in cart.items:
                 db.session.delete(cart_item)
             
             db.session.commit()
+            catalog_cache.bump("stock_reserved")
             
             # Log payment initiation
             logger.info(
@@ -185,8 +189,7 @@ class PaymentCallbackResource(Resource):
                     return {"error": "Order not found"}, 404
                 
                 if result_code == 0:  # Success
-                    order.status = "paid"
-                    order.paid_at = db.func.now()  # Record payment time
+                    mark_order_paid(order)  # Also adds the items to product_sales_stats
                     
                     # Clear cart items (if any remain)
                     cart = db.session.query(Cart).filter_by(user_id=order.user_id).first()
@@ -205,8 +208,8 @@ class PaymentCallbackResource(Resource):
                     )
                     return {"message": "Payment successful"}, 200
                 else:
-                    # Payment failed - restore stock
-                    order.status = "failed"
+                    # Payment failed - restore stock (once, even if the callback is repeated)
+                    transitioned = mark_order_failed(order)
                     
                     # Log payment failed
                     logger.warning(
@@ -218,13 +221,14 @@ class PaymentCallbackResource(Resource):
                     
                     # Restore stock for failed order
                     restored_count = 0
-                    for order_item in order.items:
+                    for order_item in order.items if transitioned else []:
                         product = db.session.query(Product).filter(Product.id == order_item.product_id).with_for_update().first()
                         if product:
                             product.stock += order_item.quantity
                             restored_count += order_item.quantity
                     
                     db.session.commit()
+                    catalog_cache.bump("stock_restored")
                     
                     # Log stock restored
                     logger.info(
@@ -272,7 +276,7 @@ class PaymentVerificationResource(Resource):
             result_code = response.get("ResultCode")
             order = db.session.query(Order).filter(
                 and_(
-                    Order.mesa_checkout_request_id == checkout_request_id,
+                    Order.mpesa_checkout_request_id == checkout_request_id,
                     Order.user_id == user_id
                 )
             ).with_for_update().first()
@@ -281,8 +285,7 @@ class PaymentVerificationResource(Resource):
                 return {"error": "Order not found"}, 404
             
             if result_code == "0":  # Success
-                order.status = "paid"
-                order.paid_at = db.func.now()  # Record payment time
+                mark_order_paid(order)  # Also adds the items to product_sales_stats
                 
                 # Clear cart items (if any remain)
                 cart = db.session.query(Cart).filter_by(user_id=user_id).first()
@@ -298,8 +301,8 @@ class PaymentVerificationResource(Resource):
                     status="paid"
                 )
             else:
-                # Payment failed - restore stock
-                order.status = "failed"
+                # Payment failed - restore stock (once, even if verified again)
+                transitioned = mark_order_failed(order)
                 
                 # Log payment failed
                 logger.warning(
@@ -311,7 +314,7 @@ class PaymentVerificationResource(Resource):
                 
                 # Restore stock for failed order
                 restored_count = 0
-                for order_item in order.items:
+                for order_item in order.items if transitioned else []:
                     product = db.session.query(Product).filter(Product.id == order_item.product_id).with_for_update().first()
                     if product:
                         product.stock += order_item.quantity
@@ -328,6 +331,8 @@ class PaymentVerificationResource(Resource):
                 )
             
             db.session.commit()
+            if order.status == "failed":
+                catalog_cache.bump("stock_restored")
             
             # Log verification
             logger.info(
@@ -0,0 +1,96 @@
+"""
+Test script to verify the keyset paginated admin customer and order listings over HTTP
+"""
+from testing_support import (  # noqa: F401 (teardown_module is a pytest hook)
+    app, auth_headers, create_user, place_order, reset_database, teardown_module
+)
+
+from extensions import db
+from models import Product
+from utils.sales_stats import mark_order_cancelled, mark_order_paid
+
+
+def _setup():
+    """
+    Five customers; customers 1-3 paid 10, 30 and 20, customer 4 has a
+    cancelled order. Returns (client, admin headers, customer ids).
+    """
+    client, admin_id = reset_database()
+    customers = [create_user(f"customer{i}@example.com", f"071000000{i}", first_name=f"Name{i}") for i in range(5)]
+    with app.app_context():
+        product = Product(name="Denim Jacket", price=10.0, stock=100)
+        db.session.add(product)
+        db.session.commit()
+        product_id = product.id
+    for customer_id, quantity in zip(customers[1:4], (1, 3, 2)):
+        place_order(customer_id, [(product_id, quantity, 10.0)], mark_order_paid)
+    place_order(customers[4], [(product_id, 1, 10.0)], mark_order_cancelled)
+    place_order(customers[0], [(product_id, 1, 10.0)])
+    return client, auth_headers(admin_id), customers
+
+
+def _walk(client, url, headers, key):
+    rows, cursor = [], None
+    while True:
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""), headers=headers)
+        assert response.status_code == 200, response.json
+        rows.extend(response.json[key])
+        cursor = response.json["next_cursor"]
+        if cursor is None:
+            return rows
+
+
+def test_customers_paged_with_stats():
+    """Test that customer pages cover every customer once, with their paid order stats"""
+    client, headers, customers = _setup()
+    rows = _walk(client, "/admin/customers?limit=2", headers, "customers")
+    assert sorted(row["id"] for row in rows) == sorted(customers), rows
+    stats = {row["id"]: row["stats"] for row in rows}
+    assert stats[customers[2]]["order_count"] == 1 and stats[customers[2]]["paid_total"] == 30.0
+    assert stats[customers[0]] is None  # Only a pending order
+    print("✓ Customer pages include order stats")
+
+
+def test_customers_by_spend_and_search():
+    """Test that sort=spend lists paying customers biggest first and ?q= prefix matches"""
+    client, headers, customers = _setup()
+    rows = _walk(client, "/admin/customers?sort=spend&limit=1", headers, "customers")
+    assert [row["id"] for row in rows] == [customers[2], customers[3], customers[1]], rows
+
+    response = client.get("/admin/customers?q=CUSTOMER3@", headers=headers)
+    assert [row["id"] for row in response.json["customers"]] == [customers[3]], response.json
+    assert client.get("/admin/customers?sort=name", headers=headers).status_code == 400
+    print("✓ Customers sorted by spend and searched by prefix")
+
+
+def test_orders_paged_by_status():
+    """Test that order pages cover every order once and ?status= includes cancelled orders"""
+    client, headers, _ = _setup()
+    rows = _walk(client, "/admin/orders?limit=2", headers, "orders")
+    assert len(rows) == 5 and len({row["id"] for row in rows}) == 5, rows
+    assert all(row["items"] for row in rows)
+
+    paid = _walk(client, "/admin/orders?status=paid&limit=2", headers, "orders")
+    assert len(paid) == 3 and all(row["status"] == "paid" for row in paid)
+    cancelled = client.get("/admin/orders?status=cancelled", headers=headers).json["orders"]
+    assert [row["status"] for row in cancelled] == ["cancelled"]
+    assert client.get("/admin/orders?status=shipped", headers=headers).status_code == 400
+    assert client.get("/admin/orders?cursor=bogus", headers=headers).status_code == 400
+    print("✓ Orders paged and filtered by status")
+
+
+def test_order_counts_match_listing():
+    """Test that /admin/orders/counts agrees with the orders actually stored"""
+    client, headers, _ = _setup()
+    response = client.get("/admin/orders/counts", headers=headers)
+    assert response.status_code == 200, response.json
+    assert response.json["counts"] == {"pending": 1, "paid": 3, "failed": 0, "cancelled": 1}, response.json
+    assert response.json["total"] == 5
+    print("✓ Order counts match the stored orders")
+
+
+if __name__ == "__main__":
+    test_customers_paged_with_stats()
+    test_customers_by_spend_and_search()
+    test_orders_paged_by_status()
+    test_order_counts_match_listing()
@@ -0,0 +1,109 @@
+"""
+Test script to verify the incremental analytics export and its watermark
+"""
+import csv
+import glob
+import gzip
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from testing_support import (  # noqa: F401 (teardown_module is a pytest hook)
+    app, create_user, place_order, reset_database, set_order_status, teardown_module
+)
+
+from extensions import db
+from models import Order, Product
+from utils.analytics_export import export_analytics, read_watermark
+from utils.sales_stats import mark_order_cancelled, mark_order_paid
+
+LAG = timedelta(minutes=5)
+
+
+def _setup():
+    """Fresh database with two paid orders; returns (customer id, product id, order ids)"""
+    reset_database()
+    customer_id = create_user("jane@example.com", "0700000002")
+    with app.app_context():
+        product = Product(name="Denim Jacket", price=40, stock=20)
+        db.session.add(product)
+        db.session.commit()
+        product_id = product.id
+    orders = [place_order(customer_id, [(product_id, quantity, 40.0)], mark_order_paid) for quantity in (1, 2)]
+    return customer_id, product_id, orders
+
+
+def _rows(out_dir, table):
+    """{id: row} over every part file of `table`, later runs winning"""
+    rows = {}
+    for path in sorted(glob.glob(os.path.join(out_dir, table, "day=*", "part-*.csv.gz"))):
+        with gzip.open(path, "rt", newline="") as f:
+            for row in csv.DictReader(f):
+                rows[int(row["id"])] = row
+    return rows
+
+
+def _export(out_dir, until):
+    with app.app_context():
+        return export_analytics(out_dir, fmt="csv", lag=LAG, now=until + LAG)
+
+
+def test_incremental_runs_advance_watermark():
+    """Test that the first run exports everything, and a later run only what was created since"""
+    customer_id, product_id, _ = _setup()
+    first_until = datetime.now() + timedelta(seconds=1)
+    with tempfile.TemporaryDirectory() as out_dir:
+        summary = _export(out_dir, first_until)
+        assert (summary["orders"], summary["order_items"]) == (2, 2), summary
+        assert read_watermark(out_dir) == first_until
+
+        assert _export(out_dir, first_until)["orders"] == 0  # Nothing after the watermark
+
+        order_id = place_order(customer_id, [(product_id, 3, 40.0)])
+        with app.app_context():
+            db.session.get(Order, order_id).created_at = first_until + timedelta(minutes=1)
+            db.session.commit()
+        summary = _export(out_dir, first_until + timedelta(minutes=10))
+        assert (summary["orders"], summary["order_items"]) == (1, 1), summary
+        assert sorted(_rows(out_dir, "orders")) == [1, 2, 3]
+    print("✓ Incremental runs exported only new orders")
+
+
+def test_status_change_reexported():
+    """Test that an order whose status changed after the watermark is exported again, without its items"""
+    _, _, (order_id, _) = _setup()
+    first_until = datetime.now() + timedelta(seconds=1)
+    with tempfile.TemporaryDirectory() as out_dir:
+        _export(out_dir, first_until)
+        assert _rows(out_dir, "orders")[order_id]["status"] == "paid"
+
+        set_order_status(order_id, mark_order_cancelled)
+        with app.app_context():
+            db.session.get(Order, order_id).status_changed_at = first_until + timedelta(minutes=1)
+            db.session.commit()
+        summary = _export(out_dir, first_until + timedelta(minutes=10))
+        assert (summary["orders"], summary["order_items"]) == (1, 0), summary
+        assert _rows(out_dir, "orders")[order_id]["status"] == "cancelled"  # Latest part wins
+        assert len(_rows(out_dir, "order_items")) == 2
+    print("✓ Status change re-exported the order")
+
+
+def test_unavailable_format_rejected():
+    """Test that asking for a format this install can't write fails before writing anything"""
+    _setup()
+    with tempfile.TemporaryDirectory() as out_dir:
+        with app.app_context():
+            try:
+                export_analytics(out_dir, fmt="xlsx")
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("Unknown format should have been rejected")
+        assert read_watermark(out_dir) is None and os.listdir(out_dir) == []
+    print("✓ Unavailable export format rejected")
+
+
+if __name__ == "__main__":
+    test_incremental_runs_advance_watermark()
+    test_status_change_reexported()
+    test_unavailable_format_rejected()
@@ -0,0 +1,67 @@
+"""
+Test script to verify the persisted admin audit trail
+"""
+from testing_support import app, auth_headers, reset_database
+
+from extensions import db
+from models import AuditEvent
+from utils.audit import AuditWriter, audit_log
+
+
+def _setup():
+    """Fresh database with one admin; returns (client, admin headers, admin id)"""
+    client, admin_id = reset_database()
+    return client, auth_headers(admin_id), admin_id
+
+
+def test_flushed_events_listed():
+    """Test that queued admin actions are persisted by flush() and served by /admin/audit"""
+    client, headers, admin_id = _setup()
+    response = client.post("/admin/products", headers=headers, json={"name": "Denim Jacket", "price": 40, "stock": 3})
+    assert response.status_code == 201, response.json
+    product_id = response.json["product"]["id"]
+    assert client.get("/admin/audit", headers=headers).json["events"] == []  # Still queued
+
+    with app.app_context():
+        assert audit_log.flush() == 1
+
+    events = client.get("/admin/audit?action=product_created", headers=headers).json["events"]
+    assert len(events) == 1, events
+    assert events[0]["user_id"] == admin_id
+    assert events[0]["method"] == "POST" and events[0]["path"] == "/admin/products"
+    assert events[0]["details"] == {"product_id": product_id}
+    print("✓ Flushed admin action listed by /admin/audit")
+
+
+def test_failed_write_requeued():
+    """Test that a batch that fails to write is kept for the next attempt instead of dropped"""
+    _setup()
+    writer = AuditWriter()
+    writer.record("product_deleted", user_id=1, product_id=7)
+    with app.app_context():
+        db.session.execute(db.text("ALTER TABLE audit_events RENAME TO audit_events_away"))
+        db.session.commit()
+        try:
+            assert writer.flush() == 0
+        finally:
+            db.session.execute(db.text("ALTER TABLE audit_events_away RENAME TO audit_events"))
+            db.session.commit()
+        assert writer.dropped == 0
+        assert writer.flush() == 1
+        assert db.session.query(AuditEvent).filter_by(action="product_deleted").count() == 1
+    print("✓ Failed audit write retried without losing events")
+
+
+def test_full_buffer_drops():
+    """Test that events are only dropped once the bounded buffer is full"""
+    writer = AuditWriter(max_size=2)
+    assert writer.record("a") and writer.record("b")
+    assert not writer.record("c")
+    assert writer.dropped == 1
+    print("✓ Full audit buffer drops and counts events")
+
+
+if __name__ == "__main__":
+    test_flushed_events_listed()
+    test_failed_write_requeued()
+    test_full_buffer_drops()
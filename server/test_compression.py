@@ -0,0 +1,68 @@
+"""
+Test script to verify negotiated response compression and precompressed catalog reuse
+"""
+import gzip
+
+from testing_support import app, reset_database
+
+import utils.catalog_cache
+from extensions import db
+from models import Product
+
+
+def _setup(count=30):
+    """Fresh database with enough products that /products is over the compression threshold"""
+    client, _ = reset_database()
+    with app.app_context():
+        db.session.add_all([
+            Product(name=f"Vintage Denim Jacket {i}", description="Washed denim, brass buttons, boxy fit. " * 3,
+                    price=40 + i, stock=3)
+            for i in range(count)
+        ])
+        db.session.commit()
+    return client
+
+
+def test_gzip_round_trip():
+    """Test that a gzip response decompresses to the identity body and varies on Accept-Encoding"""
+    client = _setup()
+    plain = client.get("/products", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers and len(plain.data) >= app.config["COMPRESSION_MIN_SIZE"]
+
+    compressed = client.get("/products", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert len(compressed.data) < len(plain.data)
+    assert gzip.decompress(compressed.data) == plain.data
+    print("✓ gzip response round-trips to the identity body")
+
+
+def test_small_response_not_compressed():
+    """Test that bodies under COMPRESSION_MIN_SIZE go out uncompressed"""
+    client = _setup(count=1)
+    response = client.get("/products", headers={"Accept-Encoding": "gzip"})
+    assert len(response.data) < app.config["COMPRESSION_MIN_SIZE"]
+    assert "Content-Encoding" not in response.headers
+    print("✓ Small response left uncompressed")
+
+
+def test_catalog_payload_compressed_once():
+    """Test that repeated requests for one cached page reuse the bytes compressed the first time"""
+    client = _setup()
+    calls = []
+    original = utils.catalog_cache.compress
+    utils.catalog_cache.compress = lambda *args: calls.append(args[1]) or original(*args)
+    try:
+        first = client.get("/products", headers={"Accept-Encoding": "gzip"})
+        second = client.get("/products", headers={"Accept-Encoding": "gzip"})
+    finally:
+        utils.catalog_cache.compress = original
+    assert calls == ["gzip"], calls
+    assert first.data == second.data
+    print("✓ Catalog page compressed once and reused")
+
+
+if __name__ == "__main__":
+    test_gzip_round_trip()
+    test_small_response_not_compressed()
+    test_catalog_payload_compressed_once()
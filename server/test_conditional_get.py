@@ -0,0 +1,75 @@
+"""
+Test script to verify ETag / If-None-Match revalidation of catalog responses
+"""
+from testing_support import app, auth_headers, reset_database, teardown_module  # noqa: F401 (pytest hook)
+
+from extensions import db
+from models import Category, Product
+
+
+def _setup():
+    """Fresh database with one category of three products; returns (client, admin headers, category id)"""
+    client, admin_id = reset_database()
+    with app.app_context():
+        category = Category(name="Jackets")
+        db.session.add(category)
+        db.session.flush()
+        db.session.add_all([Product(name=f"Jacket {i}", price=20 + i, stock=5, category_id=category.id) for i in range(3)])
+        db.session.commit()
+        return client, auth_headers(admin_id), category.id
+
+
+def test_unchanged_listing_not_modified():
+    """Test that revalidating with the current ETag answers 304 without a body"""
+    client, _, category_id = _setup()
+    for url in ("/products", f"/categories/{category_id}/products", "/products/facets"):
+        response = client.get(url)
+        assert response.status_code == 200 and response.headers["ETag"], url
+        revalidated = client.get(url, headers={"If-None-Match": response.headers["ETag"]})
+        assert revalidated.status_code == 304, url
+        assert revalidated.data == b"" and revalidated.headers["ETag"] == response.headers["ETag"]
+    print("✓ Unchanged catalog responses revalidated with 304")
+
+
+def test_admin_write_changes_etag():
+    """Test that an admin edit changes the ETag so clients holding the old one get the new body"""
+    client, headers, _ = _setup()
+    before = client.get("/products")
+    response = client.put("/admin/products/1", json={"price": 99}, headers=headers)
+    assert response.status_code == 200, response.json
+
+    after = client.get("/products", headers={"If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert 99 in [product["price"] for product in after.json["products"]]
+    print("✓ Admin write invalidated the ETag")
+
+
+def test_compressed_etag_revalidates():
+    """Test that the ETag of a compressed representation also revalidates"""
+    client, _, _ = _setup()
+    min_size, app.config["COMPRESSION_MIN_SIZE"] = app.config["COMPRESSION_MIN_SIZE"], 0
+    try:
+        response = client.get("/products", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["ETag"].endswith('-gzip"'), response.headers["ETag"]
+        revalidated = client.get("/products", headers={"If-None-Match": response.headers["ETag"]})
+        assert revalidated.status_code == 304
+    finally:
+        app.config["COMPRESSION_MIN_SIZE"] = min_size
+    print("✓ Compressed representation's ETag revalidated")
+
+
+def test_unknown_etag_served_in_full():
+    """Test that a stale or foreign ETag gets the full response"""
+    client, _, _ = _setup()
+    response = client.get("/products", headers={"If-None-Match": '"not-the-current-etag"'})
+    assert response.status_code == 200 and response.json["products"]
+    print("✓ Unknown ETag served in full")
+
+
+if __name__ == "__main__":
+    test_unchanged_listing_not_modified()
+    test_admin_write_changes_etag()
+    test_compressed_etag_revalidates()
+    test_unknown_etag_served_in_full()
@@ -0,0 +1,73 @@
+"""
+Test script to verify bulk stock adjustments through /admin/inventory/adjust
+"""
+from testing_support import app, auth_headers, reset_database, teardown_module  # noqa: F401 (pytest hook)
+
+from extensions import db
+from models import Product
+
+
+def _setup():
+    """Fresh database with two products (stock 10 and 2); returns (client, admin headers, product ids)"""
+    client, admin_id = reset_database()
+    with app.app_context():
+        products = [Product(name="Denim Jacket", price=40, stock=10), Product(name="Wool Scarf", price=15, stock=2)]
+        db.session.add_all(products)
+        db.session.commit()
+        return client, auth_headers(admin_id), [product.id for product in products]
+
+
+def _stock():
+    with app.app_context():
+        return dict(db.session.query(Product.id, Product.stock))
+
+
+def _adjust(client, headers, adjustments):
+    return client.post("/admin/inventory/adjust", headers=headers, json={"adjustments": adjustments})
+
+
+def test_deltas_for_one_product_combined():
+    """Test that several deltas for one product are summed and applied once"""
+    client, headers, (jacket_id, scarf_id) = _setup()
+    response = _adjust(client, headers, [
+        {"product_id": jacket_id, "delta": -4}, {"product_id": scarf_id, "delta": 3},
+        {"product_id": jacket_id, "delta": 1},
+        {"product_id": scarf_id, "delta": -3},  # Nets to zero with the +3: nothing to apply
+    ])
+    assert response.status_code == 200, response.json
+    assert response.json == {"applied": 1, "rejected": []}
+    assert _stock() == {jacket_id: 7, scarf_id: 2}
+    print("✓ Deltas per product combined before applying")
+
+
+def test_insufficient_and_unknown_rejected():
+    """Test that a delta taking stock below zero, or naming an unknown product, is reported while others apply"""
+    client, headers, (jacket_id, scarf_id) = _setup()
+    response = _adjust(client, headers, [
+        {"product_id": jacket_id, "delta": -1}, {"product_id": scarf_id, "delta": -5},
+        {"product_id": 999, "delta": 1},
+    ])
+    assert response.status_code == 200, response.json
+    assert response.json["applied"] == 1
+    assert sorted(response.json["rejected"], key=lambda rejection: rejection["product_id"]) == [
+        {"product_id": scarf_id, "delta": -5, "error": "insufficient_stock", "stock": 2},
+        {"product_id": 999, "delta": 1, "error": "not_found", "stock": None},
+    ]
+    assert _stock() == {jacket_id: 9, scarf_id: 2}
+    print("✓ Insufficient stock and unknown products rejected")
+
+
+def test_invalid_payloads_rejected():
+    """Test that malformed adjustment lists are a 400 and change nothing"""
+    client, headers, (jacket_id, _) = _setup()
+    for payload in ([], [{"product_id": jacket_id, "delta": "2"}], [{"product_id": jacket_id, "delta": True}]):
+        assert _adjust(client, headers, payload).status_code == 400, payload
+    assert client.post("/admin/inventory/adjust", headers=headers, data="nope").status_code == 400
+    assert _stock()[jacket_id] == 10
+    print("✓ Invalid adjustment payloads rejected")
+
+
+if __name__ == "__main__":
+    test_deltas_for_one_product_combined()
+    test_insufficient_and_unknown_rejected()
+    test_invalid_payloads_rejected()
@@ -0,0 +1,94 @@
+"""
+Test script to verify the keyset paginated storefront listings over HTTP
+"""
+from datetime import datetime, timedelta
+
+from testing_support import app, reset_database
+
+from extensions import db
+from models import Category, Product
+
+
+def _setup(count=7):
+    """Fresh database with `count` products split over two categories; returns (client, category ids)"""
+    client, _ = reset_database()
+    with app.app_context():
+        jackets, shoes = Category(name="Jackets"), Category(name="Shoes")
+        db.session.add_all([jackets, shoes])
+        db.session.flush()
+        created = datetime(2026, 1, 1)
+        for i in range(count):
+            db.session.add(Product(
+                name=f"Product {i}", price=10 + i % 3, stock=i % 2,
+                category_id=(jackets if i % 2 else shoes).id,
+                created_at=created + timedelta(minutes=i // 2),  # Pairs share a timestamp; id breaks the tie
+            ))
+        db.session.commit()
+        return client, (jackets.id, shoes.id)
+
+
+def _walk(client, url):
+    """Every page of a listing; returns (product ids in page order, number of pages)"""
+    ids, pages, cursor = [], 0, None
+    while True:
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert response.status_code == 200, response.json
+        ids.extend(product["id"] for product in response.json["products"])
+        pages += 1
+        cursor = response.json["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+
+def test_newest_pages_cover_every_product_once():
+    """Test that following next_cursor visits every product exactly once, newest first"""
+    client, _ = _setup()
+    ids, pages = _walk(client, "/products?limit=3")
+    assert pages == 3 and sorted(ids) == list(range(1, 8)), ids
+    with app.app_context():
+        expected = [product_id for product_id, in db.session.query(Product.id)
+                    .order_by(Product.created_at.desc(), Product.id.desc())]
+    assert ids == expected, (ids, expected)
+    print("✓ Newest-first pages cover every product once")
+
+
+def test_price_sort_and_filters():
+    """Test that price sorts and filters hold across page boundaries"""
+    client, (jackets_id, _) = _setup()
+    ids, _ = _walk(client, f"/products?sort=price_asc&limit=2&category_id={jackets_id}&in_stock=1")
+    with app.app_context():
+        products = [db.session.get(Product, product_id) for product_id in ids]
+        expected = db.session.query(Product).filter(Product.category_id == jackets_id, Product.stock > 0).count()
+    assert len(ids) == expected and expected > 0
+    assert all(product.category_id == jackets_id and product.stock > 0 for product in products)
+    assert [product.price for product in products] == sorted(product.price for product in products)
+    print("✓ Price sort and filters applied on every page")
+
+
+def test_invalid_cursor_and_sort_rejected():
+    """Test that a tampered cursor or unknown sort is a 400, not a server error"""
+    client, _ = _setup()
+    assert client.get("/products?cursor=not-a-cursor").status_code == 400
+    assert client.get("/products?sort=popularity").status_code == 400
+    print("✓ Invalid cursor and sort rejected")
+
+
+def test_category_products_paginated():
+    """Test that the category endpoint leads with the category and pages only its products"""
+    client, (jackets_id, _) = _setup()
+    response = client.get(f"/categories/{jackets_id}/products?limit=2")
+    assert response.status_code == 200, response.json
+    assert response.json["category"]["id"] == jackets_id
+    assert response.json["category"]["product_count"] == 3
+
+    ids, pages = _walk(client, f"/categories/{jackets_id}/products?limit=2")
+    assert pages == 2 and len(ids) == 3
+    assert client.get("/categories/999/products").status_code == 404
+    print("✓ Category products paginated")
+
+
+if __name__ == "__main__":
+    test_newest_pages_cover_every_product_once()
+    test_price_sort_and_filters()
+    test_invalid_cursor_and_sort_rejected()
+    test_category_products_paginated()
@@ -0,0 +1,40 @@
+"""
+Test script to verify keyset pagination helpers
+"""
+from datetime import datetime
+from utils.pagination import (
+    InvalidCursor, decode_cursor, encode_cursor, get_page_size, parse_datetime
+)
+
+
+def test_cursor_round_trip():
+    """Test that a cursor decodes back to the values it was built from"""
+    created_at = datetime(2026, 1, 12, 22, 51, 40)
+    cursor = encode_cursor([created_at, 42])
+    assert decode_cursor(cursor, (parse_datetime, int)) == [created_at, 42]
+    print("✓ Cursor round trip preserved values")
+
+
+def test_invalid_cursor_rejected():
+    """Test that tampered cursors are rejected instead of crashing the query"""
+    for bad in ("not-a-cursor", encode_cursor([1]), encode_cursor(["x", 1])):
+        try:
+            decode_cursor(bad, (parse_datetime, int))
+        except InvalidCursor:
+            continue
+        raise AssertionError(f"Cursor {bad!r} should have been rejected")
+    print("✓ Invalid cursors rejected")
+
+
+def test_page_size_clamped():
+    """Test that ?limit= is clamped to the allowed range"""
+    assert get_page_size(None) == 24
+    assert get_page_size("0") == 1
+    assert get_page_size("5000") == 100
+    print("✓ Page size clamped")
+
+
+if __name__ == "__main__":
+    test_cursor_round_trip()
+    test_invalid_cursor_rejected()
+    test_page_size_clamped()
@@ -0,0 +1,91 @@
+"""
+Test script to verify the streaming CSV / NDJSON product import
+"""
+import io
+import json
+
+from testing_support import app, auth_headers, reset_database, teardown_module  # noqa: F401 (pytest hook)
+
+from extensions import db
+from models import Category, Product
+from utils.counters import read_counters
+from utils.summary import STOCK_THRESHOLD_COUNTER, source_counts
+
+
+def _setup():
+    """Fresh database with one category and one existing product; returns (client, admin headers)"""
+    client, admin_id = reset_database()
+    with app.app_context():
+        db.session.add_all([Category(name="Jackets"), Product(name="Denim Jacket", price=40.0, stock=5)])
+        db.session.commit()
+    return client, auth_headers(admin_id)
+
+
+def _products():
+    with app.app_context():
+        return {product.name: (product.price, product.stock, product.category_id) for product in Product.query}
+
+
+def test_csv_creates_updates_and_reports_rows():
+    """Test that a CSV upload creates and updates products across batches and reports bad rows by number"""
+    client, headers = _setup()
+    body = (
+        "name,price,stock,category\n"
+        "Denim Jacket,35,2,\n"          # Updates the existing product by name
+        "Wool Scarf,15,10,Jackets\n"
+        "Leather Boots,abc,1,\n"        # Bad price
+        "Silk Tie,nan,4,\n"             # Non-finite price
+        "Linen Shirt,22,3,Shoes\n"      # Unknown category
+        "Canvas Tote,9,12,\n"
+    )
+    response = client.post("/admin/products/import?batch_size=2", data=body, content_type="text/csv", headers=headers)
+    assert response.status_code == 200, response.json
+    assert (response.json["created"], response.json["updated"], response.json["failed"]) == (2, 1, 3), response.json
+    assert [error["row"] for error in response.json["errors"]] == [3, 4, 5]
+
+    products = _products()
+    assert products["Denim Jacket"][:2] == (35.0, 2)
+    assert products["Wool Scarf"][2] is not None
+    assert "Leather Boots" not in products and "Silk Tie" not in products
+
+    # Indexes, caches and counters see the imported rows
+    assert [p["name"] for p in client.get("/products/search?q=scarf").json["products"]] == ["Wool Scarf"]
+    assert "Canvas Tote" in [p["name"] for p in client.get("/products").json["products"]]
+    with app.app_context():
+        assert read_counters("")[STOCK_THRESHOLD_COUNTER] == source_counts()[STOCK_THRESHOLD_COUNTER]
+    print("✓ CSV import created, updated and reported rows")
+
+
+def test_ndjson_file_upload():
+    """Test that an NDJSON multipart upload updates by id and reports unreadable lines"""
+    client, headers = _setup()
+    lines = [json.dumps({"id": 1, "stock": 50}), "{not json", json.dumps({"id": 99, "stock": 1}),
+             json.dumps({"name": "Wool Scarf", "price": 15, "stock": 10})]
+    upload = (io.BytesIO("\n".join(lines).encode("utf-8")), "products.ndjson", "application/octet-stream")
+    response = client.post("/admin/products/import", data={"file": upload}, headers=headers,
+                           content_type="multipart/form-data")
+    assert response.status_code == 200, response.json
+    assert (response.json["created"], response.json["updated"], response.json["failed"]) == (1, 1, 2), response.json
+    assert _products()["Denim Jacket"][1] == 50
+    print("✓ NDJSON upload imported by id and name")
+
+
+def test_unreadable_uploads_rejected():
+    """Test that a bad header is rejected outright and invalid UTF-8 keeps the batches before it"""
+    client, headers = _setup()
+    response = client.post("/admin/products/import", data="title,cost\nA,1\n", content_type="text/csv", headers=headers)
+    assert response.status_code == 400 and "header" in response.json["error"], response.json
+
+    body = b"name,price,stock\n" + b"".join(b"Product %d,10,1\n" % i for i in range(3000)) + b"Bad \xff row,1,1\n"
+    response = client.post("/admin/products/import?batch_size=100", data=body, content_type="text/csv", headers=headers)
+    assert response.status_code == 400, response.json
+    assert "could not be read" in response.json["error"]
+    assert response.json["created"] > 0
+    assert len(_products()) == 1 + response.json["created"]
+    print("✓ Unreadable uploads rejected, committed batches kept")
+
+
+if __name__ == "__main__":
+    test_csv_creates_updates_and_reports_rows()
+    test_ndjson_file_upload()
+    test_unreadable_uploads_rejected()
@@ -0,0 +1,79 @@
+"""
+Test script to verify the stored product JSON is kept current and its staleness check
+"""
+import json
+
+from testing_support import app, auth_headers, reset_database, teardown_module  # noqa: F401 (pytest hook)
+
+from extensions import db
+from models import Category, Product
+from utils.product_render import find_stale_rendered_products, refresh_rendered_products, render_product
+
+
+def _setup():
+    """Fresh database with one categorized product; returns (client, admin headers, product id, category id)"""
+    client, admin_id = reset_database()
+    with app.app_context():
+        category = Category(name="Jackets")
+        product = Product(name="Denim Jacket", price=40.0, stock=5, category=category)
+        db.session.add(product)
+        db.session.commit()
+        return client, auth_headers(admin_id), product.id, category.id
+
+
+def _stored(product_id):
+    with app.app_context():
+        product = db.session.get(Product, product_id)
+        return json.loads(product.rendered_json), json.loads(render_product(product))
+
+
+def test_orm_writes_rerender():
+    """Test that inserts, product edits and category renames/deletes re-render in the same commit"""
+    _, _, product_id, category_id = _setup()
+    stored, fresh = _stored(product_id)
+    assert stored == fresh and stored["category"] == {"id": category_id, "name": "Jackets"}
+
+    with app.app_context():
+        db.session.get(Product, product_id).price = 35.0
+        db.session.get(Category, category_id).name = "Outerwear"
+        db.session.commit()
+    stored, fresh = _stored(product_id)
+    assert stored == fresh and stored["price"] == 35.0 and stored["category"]["name"] == "Outerwear"
+
+    with app.app_context():
+        db.session.delete(db.session.get(Category, category_id))
+        db.session.commit()
+    stored, fresh = _stored(product_id)
+    assert stored == fresh and stored["category"] is None
+    print("✓ ORM writes re-rendered the stored JSON")
+
+
+def test_bulk_paths_rerender():
+    """Test that the inventory adjust endpoint, which bypasses the ORM, keeps the JSON current"""
+    client, headers, product_id, _ = _setup()
+    response = client.post("/admin/inventory/adjust", headers=headers,
+                           json={"adjustments": [{"product_id": product_id, "delta": -2}]})
+    assert response.status_code == 200, response.json
+    stored, fresh = _stored(product_id)
+    assert stored == fresh and stored["stock"] == 3
+    assert client.get("/products").json["products"] == [stored]  # Listings serve the stored bytes
+    print("✓ Bulk stock adjustment re-rendered the stored JSON")
+
+
+def test_stale_rows_found_and_fixed():
+    """Test that rows changed behind the ORM's back are reported and re-rendered"""
+    _, _, product_id, _ = _setup()
+    with app.app_context():
+        Product.query.filter_by(id=product_id).update({"stock": 0}, synchronize_session=False)
+        db.session.commit()
+        assert find_stale_rendered_products() == [product_id]
+        assert refresh_rendered_products() == 1
+        assert find_stale_rendered_products() == []
+    assert _stored(product_id)[0]["stock"] == 0
+    print("✓ Stale stored JSON found and re-rendered")
+
+
+if __name__ == "__main__":
+    test_orm_writes_rerender()
+    test_bulk_paths_rerender()
+    test_stale_rows_found_and_fixed()
@@ -0,0 +1,92 @@
+"""
+Test script to verify the sales rollups behind /admin/stats/timeseries
+"""
+from datetime import datetime, timedelta
+
+from testing_support import (  # noqa: F401 (teardown_module is a pytest hook)
+    app, auth_headers, create_user, place_order, reset_database, set_order_status, teardown_module
+)
+
+from extensions import db
+from models import Category, Product
+from utils.rollups import backfill_rollups
+from utils.sales_stats import mark_order_cancelled, mark_order_failed, mark_order_paid
+
+
+def _setup():
+    """
+    Two paid orders (one of them in a category), one failed and one
+    cancelled after payment. Returns (client, admin headers, category id).
+    """
+    client, admin_id = reset_database()
+    customer_id = create_user("jane@example.com", "0700000002")
+    with app.app_context():
+        category = Category(name="Jackets")
+        jacket = Product(name="Denim Jacket", price=40, stock=20, category=category)
+        scarf = Product(name="Wool Scarf", price=15, stock=20)
+        db.session.add_all([jacket, scarf])
+        db.session.commit()
+        jacket_id, scarf_id, category_id = jacket.id, scarf.id, category.id
+
+    place_order(customer_id, [(jacket_id, 2, 40.0), (scarf_id, 1, 15.0)], mark_order_paid)
+    place_order(customer_id, [(scarf_id, 3, 15.0)], mark_order_paid)
+    place_order(customer_id, [(jacket_id, 1, 40.0)], mark_order_failed)
+    set_order_status(place_order(customer_id, [(jacket_id, 5, 40.0)], mark_order_paid), mark_order_cancelled)
+    return client, auth_headers(admin_id), category_id
+
+
+def _series(client, headers, granularity="hour", **params):
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    query = {"granularity": granularity, "from": today.isoformat(), "to": (today + timedelta(days=1)).isoformat(),
+             **params}
+    response = client.get("/admin/stats/timeseries", headers=headers, query_string=query)
+    assert response.status_code == 200, response.json
+    return response.json["points"]
+
+
+def test_paid_failed_and_cancelled_rolled_up():
+    """Test that paid orders are counted, failed ones counted separately and cancelled ones taken back out"""
+    client, headers, _ = _setup()
+    points = _series(client, headers)
+    assert len(points) == 24  # Zero-filled, one per hour
+    assert sum(point["paid_orders"] for point in points) == 2
+    assert sum(point["failed_orders"] for point in points) == 1
+    assert round(sum(point["revenue"] for point in points), 2) == 140.0
+    assert sum(point["units"] for point in points) == 6
+    print("✓ Paid, failed and cancelled orders rolled up per hour")
+
+
+def test_category_series():
+    """Test that the per-category series only counts that category's lines"""
+    client, headers, category_id = _setup()
+    points = _series(client, headers, granularity="day", category_id=category_id)
+    assert len(points) == 1 and "failed_orders" not in points[0]
+    assert (points[0]["paid_orders"], points[0]["revenue"], points[0]["units"]) == (1, 80.0, 2)
+    print("✓ Category series counted its own lines")
+
+
+def test_backfill_matches_incremental():
+    """Test that rebuilding the rollups from history gives the same series as the incremental upkeep"""
+    client, headers, category_id = _setup()
+    before = _series(client, headers), _series(client, headers, granularity="day", category_id=category_id)
+    with app.app_context():
+        backfill_rollups()
+    after = _series(client, headers), _series(client, headers, granularity="day", category_id=category_id)
+    assert before == after, (before, after)
+    print("✓ Backfilled rollups match the incremental ones")
+
+
+def test_invalid_ranges_rejected():
+    """Test that unknown granularities, inverted ranges and oversized ranges are a 400"""
+    client, headers, _ = _setup()
+    for query in ({"granularity": "week"}, {"from": "2026-02-01", "to": "2026-01-01"},
+                  {"granularity": "hour", "from": "2020-01-01", "to": "2026-01-01"}, {"from": "yesterday"}):
+        assert client.get("/admin/stats/timeseries", headers=headers, query_string=query).status_code == 400, query
+    print("✓ Invalid timeseries ranges rejected")
+
+
+if __name__ == "__main__":
+    test_paid_failed_and_cancelled_rolled_up()
+    test_category_series()
+    test_backfill_matches_incremental()
+    test_invalid_ranges_rejected()
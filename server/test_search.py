@@ -0,0 +1,88 @@
+"""
+Test script to verify full-text product search across backends
+"""
+from testing_support import app, auth_headers, reset_database, teardown_module  # noqa: F401 (pytest hook)
+
+from sqlalchemy.exc import OperationalError
+
+from extensions import db
+from models import Product
+from utils.search import InMemoryBM25Backend, ProductSearch, SQLiteFTSBackend, product_search
+
+
+def _setup():
+    """Fresh database with three products and a rebuilt index; returns (client, admin headers)"""
+    client, admin_id = reset_database()
+    with app.app_context():
+        db.session.add_all([
+            Product(name="Denim Jacket", description="Blue washed denim", price=40, stock=2),
+            Product(name="Leather Boots", description="Pairs well with a denim jacket", price=90, stock=1),
+            Product(name="Wool Scarf", description="Knitted", price=15, stock=6),
+        ])
+        db.session.commit()
+        product_search.rebuild()  # The FTS table outlives drop_all()
+    return client, auth_headers(admin_id)
+
+
+def _names(client, query):
+    response = client.get(f"/products/search?q={query}")
+    assert response.status_code == 200, response.json
+    return [product["name"] for product in response.json["products"]]
+
+
+def test_ranked_and_prefix_search():
+    """Test that every token must match, the last one as a prefix, and name matches rank first"""
+    client, _ = _setup()
+    assert _names(client, "denim jack") == ["Denim Jacket", "Leather Boots"]
+    assert _names(client, "wool sc") == ["Wool Scarf"]
+    assert _names(client, "wool denim") == []
+    assert client.get("/products/search?q=%20%21").status_code == 400
+    print(f"✓ Ranked prefix search on the {product_search.backend.name} backend")
+
+
+def test_admin_writes_reindex():
+    """Test that products created and deleted through the admin API show up in and leave the results"""
+    client, headers = _setup()
+    response = client.post("/admin/products", headers=headers, json={"name": "Corduroy Jacket", "price": 55, "stock": 4})
+    assert response.status_code == 201, response.json
+    assert "Corduroy Jacket" in _names(client, "jacket")
+
+    assert client.delete(f"/admin/products/{response.json['product']['id']}", headers=headers).status_code == 200
+    assert "Corduroy Jacket" not in _names(client, "corduroy")
+    print("✓ Admin writes kept the search index current")
+
+
+def test_memory_backend_matches():
+    """Test that the in-memory BM25 fallback returns the same matches as the database backend"""
+    _setup()
+    memory = InMemoryBM25Backend()
+    with app.app_context():
+        for query in ("denim jack", "wool sc", "boot", "wool denim"):
+            expected = [product_id for product_id, _ in product_search.search(query)]
+            assert [product_id for product_id, _ in memory.search(query, 20)] == expected, query
+    print("✓ In-memory backend agrees with the database backend")
+
+
+def test_unavailable_backend_falls_back():
+    """Test that a database backend failing its probe falls back to the in-memory index"""
+    _setup()
+
+    def unavailable(backend):
+        raise OperationalError("CREATE VIRTUAL TABLE", {}, Exception("no such module: fts5"))
+
+    ensure, SQLiteFTSBackend.ensure = SQLiteFTSBackend.ensure, unavailable
+    try:
+        with app.app_context():
+            search = ProductSearch()
+            assert search.backend.name == "memory"
+            assert [product_id for product_id, _ in search.search("scarf")] == [3]
+    finally:
+        SQLiteFTSBackend.ensure = ensure
+    print("✓ Unavailable backend fell back to the in-memory index")
+
+
+if __name__ == "__main__":
+    test_ranked_and_prefix_search()
+    test_admin_writes_reindex()
+    test_memory_backend_matches()
+    test_unavailable_backend_falls_back()
@@ -0,0 +1,83 @@
+"""
+Test script to verify prefix autocomplete over product and category names
+"""
+from testing_support import app, auth_headers, reset_database, teardown_module  # noqa: F401 (pytest hook)
+
+from extensions import db
+from models import Category, Product, ProductSalesStats
+from utils.suggest import SuggestIndex, suggest_index
+
+
+def _setup():
+    """Fresh database with two jackets (the leather one selling more) and a built index"""
+    client, admin_id = reset_database()
+    with app.app_context():
+        outerwear = Category(name="Outerwear")
+        db.session.add(outerwear)
+        db.session.flush()
+        denim = Product(name="Denim Jacket", price=40, stock=3, category_id=outerwear.id)
+        leather = Product(name="Retro Leather Jacket", price=120, stock=1, category_id=outerwear.id)
+        db.session.add_all([denim, leather])
+        db.session.flush()
+        db.session.add_all([
+            ProductSalesStats(product_id=denim.id, units_sold=2, revenue=80),
+            ProductSalesStats(product_id=leather.id, units_sold=5, revenue=600),
+        ])
+        db.session.commit()
+        suggest_index.rebuild()
+    return client, auth_headers(admin_id)
+
+
+def _suggest(client, prefix):
+    response = client.get(f"/products/suggest?prefix={prefix}")
+    assert response.status_code == 200, response.json
+    return [(entry["type"], entry["name"]) for entry in response.json["suggestions"]]
+
+
+def test_any_word_most_popular_first():
+    """Test that a prefix matches any word of a name, most popular first, for short and long prefixes"""
+    client, _ = _setup()
+    expected = [("product", "Retro Leather Jacket"), ("product", "Denim Jacket")]
+    assert _suggest(client, "jac") == expected  # Served from the precomputed lists
+    assert _suggest(client, "jacket") == expected  # Longer than TOP_PREFIX_LEN
+    assert _suggest(client, "OUTER") == [("category", "Outerwear")]
+    assert client.get("/products/suggest?prefix=%20").status_code == 400
+    print("✓ Suggestions match any word, most popular first")
+
+
+def test_admin_writes_update_index():
+    """Test that admin product and category writes reach the index without a rebuild"""
+    client, headers = _setup()
+    response = client.post("/admin/products", headers=headers, json={"name": "Jacquard Scarf", "price": 25, "stock": 4})
+    assert response.status_code == 201, response.json
+    product_id = response.json["product"]["id"]
+    assert ("product", "Jacquard Scarf") in _suggest(client, "jac")
+
+    assert client.put(f"/admin/products/{product_id}", headers=headers, json={"name": "Paisley Scarf"}).status_code == 200
+    assert ("product", "Jacquard Scarf") not in _suggest(client, "jac")
+    assert _suggest(client, "paisley") == [("product", "Paisley Scarf")]
+
+    assert client.delete(f"/admin/products/{product_id}", headers=headers).status_code == 200
+    assert _suggest(client, "pai") == []
+
+    response = client.post("/admin/categories", headers=headers, json={"name": "Jackets & Coats"})
+    assert response.status_code == 201, response.json
+    assert ("category", "Jackets & Coats") in _suggest(client, "jackets")
+    print("✓ Admin writes updated the suggest index")
+
+
+def test_unbuilt_index_returns_nothing():
+    """Test that lookups before the first build answer empty instead of querying the database"""
+    _setup()
+    index = SuggestIndex()
+    assert index.suggest("jac") == []
+    with app.app_context():
+        index.rebuild()
+    assert [entry["name"] for entry in index.suggest("jac")] == ["Retro Leather Jacket", "Denim Jacket"]
+    print("✓ Unbuilt index answered empty until rebuilt")
+
+
+if __name__ == "__main__":
+    test_any_word_most_popular_first()
+    test_admin_writes_update_index()
+    test_unbuilt_index_returns_nothing()
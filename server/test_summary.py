@@ -0,0 +1,76 @@
+"""
+Test script to verify the dashboard counters stay equal to the source tables
+"""
+from testing_support import app, auth_headers, reset_database, teardown_module  # noqa: F401 (pytest hook)
+
+from extensions import db
+from models import Product
+from utils.summary import CUSTOMERS_COUNTER, STOCK_THRESHOLD, STOCK_THRESHOLD_COUNTER, source_counts
+
+
+def _setup():
+    """Fresh database with one admin and one product; returns (client, admin headers, product id)"""
+    client, admin_id = reset_database()
+    with app.app_context():
+        product = Product(name="Denim Jacket", price=40.0, stock=STOCK_THRESHOLD + 10)
+        db.session.add(product)
+        db.session.commit()
+        return client, auth_headers(admin_id), product.id
+
+
+def _assert_summary_matches(client, headers):
+    response = client.get("/admin/summary", headers=headers)
+    assert response.status_code == 200, response.json
+    with app.app_context():
+        actual = source_counts()
+    assert response.json["customers"] == actual[CUSTOMERS_COUNTER], (response.json, actual)
+    assert response.json["stock_at_or_below_threshold"] == actual[STOCK_THRESHOLD_COUNTER], (response.json, actual)
+    return response.json
+
+
+def test_registration_counts_customer():
+    """Test that registering a customer keeps the customer counter exact"""
+    client, headers, _ = _setup()
+    response = client.post("/auth/register", json={
+        "email": "jane@example.com", "password": "password123",
+        "first_name": "Jane", "last_name": "Doe", "phone_number": "0700000002",
+    })
+    assert response.status_code == 201, response.json
+    assert _assert_summary_matches(client, headers)["customers"] == 1
+    print("✓ Registration counted in /admin/summary")
+
+
+def test_product_stock_update_counts_stock_threshold():
+    """Test that editing stock through PUT /admin/products keeps the stock threshold counter exact"""
+    client, headers, product_id = _setup()
+    assert _assert_summary_matches(client, headers)["stock_at_or_below_threshold"] == 0
+
+    response = client.put(f"/admin/products/{product_id}", json={"stock": 1}, headers=headers)
+    assert response.status_code == 200, response.json
+    assert _assert_summary_matches(client, headers)["stock_at_or_below_threshold"] == 1
+
+    response = client.put(f"/admin/products/{product_id}", json={"stock": 50}, headers=headers)
+    assert response.status_code == 200, response.json
+    assert _assert_summary_matches(client, headers)["stock_at_or_below_threshold"] == 0
+    print("✓ Stock edits counted in /admin/summary")
+
+
+def test_inventory_adjust_counts_stock_threshold():
+    """Test that bulk inventory adjustments (which bypass the ORM) keep the stock threshold counter exact"""
+    client, headers, product_id = _setup()
+    response = client.post("/admin/inventory/adjust", headers=headers,
+                           json={"adjustments": [{"product_id": product_id, "delta": -10}]})
+    assert response.status_code == 200 and response.json["applied"] == 1, response.json
+    assert _assert_summary_matches(client, headers)["stock_at_or_below_threshold"] == 1
+
+    response = client.post("/admin/inventory/adjust", headers=headers,
+                           json=[{"product_id": product_id, "delta": 10}])
+    assert response.status_code == 200, response.json
+    assert _assert_summary_matches(client, headers)["stock_at_or_below_threshold"] == 0
+    print("✓ Inventory adjustments counted in /admin/summary")
+
+
+if __name__ == "__main__":
+    test_registration_counts_customer()
+    test_product_stock_update_counts_stock_threshold()
+    test_inventory_adjust_counts_stock_threshold()
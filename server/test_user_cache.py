@@ -0,0 +1,94 @@
+"""
+Test script to verify role checks served from JWT claims and the user cache
+"""
+from sqlalchemy import event
+
+from testing_support import app, auth_headers, reset_database, teardown_module  # noqa: F401 (pytest hook)
+
+from extensions import db
+from models import User
+from utils.versioned_lru import VersionedLRU
+
+
+def _set_role(user_id, role):
+    with app.app_context():
+        db.session.get(User, user_id).role = role
+        db.session.commit()
+
+
+def test_admin_check_served_from_cache():
+    """Test that repeated admin requests don't query the users table"""
+    client, admin_id = reset_database()
+    headers = auth_headers(admin_id, "admin")
+    assert client.get("/admin/summary", headers=headers).status_code == 200
+
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        assert client.get("/admin/summary", headers=headers).status_code == 200
+    finally:
+        with app.app_context():
+            event.remove(db.engine, "before_cursor_execute", record)
+    assert not any("FROM users" in statement for statement in statements), statements
+    print("✓ Admin check answered without a users query")
+
+
+def test_wrong_role_claim_rejected():
+    """Test that a token claiming another role is rejected even for an admin account"""
+    client, admin_id = reset_database()
+    assert client.get("/admin/summary", headers=auth_headers(admin_id, "customer")).status_code == 403
+    print("✓ Mismatched role claim rejected")
+
+
+def test_demoted_admin_rejected_after_commit():
+    """Test that demoting an admin takes effect on their existing token as soon as it commits"""
+    client, admin_id = reset_database()
+    headers = auth_headers(admin_id, "admin")
+    assert client.get("/admin/summary", headers=headers).status_code == 200  # Cached as admin
+
+    _set_role(admin_id, "customer")
+    response = client.get("/admin/summary", headers=headers)
+    assert response.status_code == 403, response.json
+    assert response.json == {"error": "Admin access required"}
+
+    _set_role(admin_id, "admin")
+    assert client.get("/admin/summary", headers=headers).status_code == 200
+    print("✓ Demotion applied to an existing token after commit")
+
+
+def test_deleted_user_rejected():
+    """Test that a token for a user that no longer exists fails the user lookup"""
+    client, admin_id = reset_database()
+    headers = auth_headers(admin_id, "admin")
+    assert client.get("/admin/summary", headers=headers).status_code == 200
+
+    with app.app_context():
+        db.session.delete(db.session.get(User, admin_id))
+        db.session.commit()
+    assert client.get("/admin/summary", headers=headers).status_code == 401
+    print("✓ Deleted user rejected")
+
+
+def test_version_stamps_bounded():
+    """Test that invalidating many keys keeps a bounded number of stamps and still rejects stale reads"""
+    cache = VersionedLRU(max_entries=2, ttl=60, miss_ttl=10, max_versions=3)
+    _, _, generation = cache.get_many([1])
+    cache.invalidate(range(10))
+    assert cache.stats()["versions"] == 3
+    cache.store(1, "read before the change", generation)  # Stamp dropped, but the floor still rejects it
+    assert cache.get_many([1])[1] == [1]
+
+    _, _, generation = cache.get_many([1])
+    cache.store(1, "fresh", generation)
+    assert cache.get_many([1])[0] == {1: "fresh"}
+    print("✓ Version stamps bounded without caching stale reads")
+
+
+if __name__ == "__main__":
+    test_admin_check_served_from_cache()
+    test_wrong_role_claim_rejected()
+    test_demoted_admin_rejected_after_commit()
+    test_deleted_user_rejected()
+    test_version_stamps_bounded()
@@ -0,0 +1,79 @@
+"""
+Test script to verify sales velocity, days of cover and the velocity-based low stock warning
+"""
+from datetime import date, timedelta
+
+from testing_support import (  # noqa: F401 (teardown_module is a pytest hook)
+    app, auth_headers, create_user, place_order, reset_database, set_order_status, teardown_module
+)
+
+from extensions import db
+from models import Product
+from utils.sales_stats import mark_order_cancelled, mark_order_paid
+from utils.velocity import WINDOW_DAYS, refresh_sales_velocity
+
+
+def _setup():
+    """
+    A jacket selling 1/day with 20 in stock, a scarf selling 0.5/day with 3
+    in stock, a hat that isn't selling and sold out boots. Returns
+    (client, admin headers, {name: product id}, scarf order id).
+    """
+    client, admin_id = reset_database()
+    customer_id = create_user("jane@example.com", "0700000002")
+    with app.app_context():
+        products = [Product(name="Jacket", price=40, stock=20), Product(name="Scarf", price=15, stock=3),
+                    Product(name="Hat", price=10, stock=2), Product(name="Boots", price=90, stock=0)]
+        db.session.add_all(products)
+        db.session.commit()
+        ids = {product.name: product.id for product in products}
+    place_order(customer_id, [(ids["Jacket"], WINDOW_DAYS, 40.0)], mark_order_paid)
+    scarf_order_id = place_order(customer_id, [(ids["Scarf"], WINDOW_DAYS // 2, 15.0)], mark_order_paid)
+    return client, auth_headers(admin_id), ids, scarf_order_id
+
+
+def _at_risk(client, headers, query=""):
+    response = client.get(f"/admin/inventory/at-risk{query}", headers=headers)
+    assert response.status_code == 200, response.json
+    return [(product["name"], product["days_of_cover"]) for product in response.json["products"]]
+
+
+def test_paid_orders_raise_velocity():
+    """Test that paying orders updates velocity and the at-risk ranking immediately"""
+    client, headers, _, _ = _setup()
+    assert _at_risk(client, headers) == [("Scarf", 6.0), ("Jacket", 20.0)]
+    assert _at_risk(client, headers, "?max_days=10") == [("Scarf", 6.0)]
+    print("✓ Paid orders raised velocity and ranked products by cover")
+
+
+def test_low_stock_warning_uses_cover():
+    """Test that the warning flags short cover and sold out products, not slow sellers with little stock"""
+    client, headers, _, _ = _setup()
+    response = client.get("/admin/products?fields=name,days_of_cover,low_stock_warning", headers=headers)
+    assert response.status_code == 200, response.json
+    warnings = {product["name"]: product["low_stock_warning"] for product in response.json["products"]}
+    assert warnings == {"Jacket": False, "Scarf": True, "Hat": False, "Boots": True}, warnings
+    print("✓ Low stock warning based on days of cover")
+
+
+def test_cancel_and_refresh():
+    """Test that cancelling a paid order takes its units back out and old sales age out on refresh"""
+    client, headers, ids, scarf_order_id = _setup()
+    set_order_status(scarf_order_id, mark_order_cancelled)
+    assert _at_risk(client, headers) == [("Jacket", 20.0)]
+
+    with app.app_context():
+        assert refresh_sales_velocity(rebuild=True) == 1  # Same as the incremental upkeep
+    assert _at_risk(client, headers) == [("Jacket", 20.0)]
+
+    with app.app_context():
+        assert refresh_sales_velocity(today=date.today() + timedelta(days=WINDOW_DAYS)) == 0
+        assert db.session.get(Product, ids["Jacket"]).sales_velocity == 0
+    assert _at_risk(client, headers) == []
+    print("✓ Cancelled and aged-out sales dropped from velocity")
+
+
+if __name__ == "__main__":
+    test_paid_orders_raise_velocity()
+    test_low_stock_warning_uses_cover()
+    test_cancel_and_refresh()
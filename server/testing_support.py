@@ -0,0 +1,92 @@
+"""
+Shared setup for the test scripts: a fresh in-memory database with one
+admin, and tokens for any user.
+
+Import this before anything that imports the app, so the app is always
+configured against in-memory SQLite.
+"""
+import os
+
+os.environ["DATABASE_URI"] = "sqlite:///:memory:"  # Never run against a configured database
+os.environ.setdefault("JWT_SECRET", "test-secret-key-that-is-long-enough")
+
+from flask_jwt_extended import create_access_token
+
+from app import app
+from extensions import db, limiter
+from models import Order, OrderItem, User
+from utils.audit import audit_log
+from utils.catalog_cache import catalog_cache
+from utils.product_cache import product_cache
+from utils.sales_stats import record_order_placed
+from utils.user_cache import user_cache
+
+
+def reset_database():
+    """Recreate the schema with one admin; returns (client, admin id)"""
+    app.config["TESTING"] = True  # No background threads; tests flush and rebuild explicitly
+    limiter.enabled = False
+    with app.app_context():
+        assert db.engine.url.database in (None, "", ":memory:"), "Tests only run against in-memory SQLite"
+        audit_log.flush()  # Events queued by the previous test belong to the old schema
+        db.drop_all()
+        db.create_all()
+        # Ids are reused by the new schema; forget what this worker cached for the old one
+        catalog_cache.bump("reset_database")
+        product_cache.clear()
+        user_cache.clear()
+        admin_id = create_user("admin@example.com", "0700000001", role="admin", first_name="Ada", last_name="Admin")
+        return app.test_client(), admin_id
+
+
+def create_user(email, phone_number, role="customer", first_name="Jane", last_name="Doe"):
+    """Add and commit a user (password "password123"); returns their id"""
+    with app.app_context():
+        user = User(first_name=first_name, last_name=last_name, email=email, phone_number=phone_number, role=role)
+        user.set_password("password123")
+        db.session.add(user)
+        db.session.commit()
+        return user.id
+
+
+def place_order(user_id, items, status_change=None):
+    """
+    Add and commit a pending order of (product_id, quantity, price) items,
+    then optionally pass it to status_change (e.g. mark_order_paid) and
+    commit again. Returns the order id.
+    """
+    with app.app_context():
+        order = Order(user_id=user_id, total_amount=sum(quantity * price for _, quantity, price in items),
+                      status="pending")
+        db.session.add(order)
+        db.session.flush()
+        db.session.add_all([
+            OrderItem(order_id=order.id, product_id=product_id, quantity=quantity, price=price)
+            for product_id, quantity, price in items
+        ])
+        record_order_placed(order)
+        db.session.commit()
+        if status_change is not None:
+            status_change(order)
+            db.session.commit()
+        return order.id
+
+
+def set_order_status(order_id, status_change):
+    """Pass a stored order to status_change (e.g. mark_order_cancelled) and commit"""
+    with app.app_context():
+        status_change(db.session.get(Order, order_id))
+        db.session.commit()
+
+
+def auth_headers(user_id, role="admin"):
+    """Authorization header with an access token for `user_id` claiming `role`"""
+    with app.app_context():
+        token = create_access_token(identity=str(user_id), additional_claims={"role": role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def teardown_module(module):
+    """Write the audit events the admin requests queued, before the database goes away"""
+    with app.app_context():
+        audit_log.flush()
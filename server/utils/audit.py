@@ -0,0 +1,200 @@
+"""
+Persisted admin audit trail (audit_events) with batched background writes.
+
+Admin requests only append to a bounded in-process queue; they never wait
+on the database. A background thread drains the queue and writes
+multi-row INSERTs, flushing when AUDIT_BATCH_SIZE events are waiting or
+every AUDIT_FLUSH_INTERVAL seconds, and once more at interpreter exit.
+
+A batch that fails to write (deadlock, outage, failover) is kept and
+retried with exponential backoff; meanwhile new events wait in the queue.
+Events are dropped, and counted, only when the queue is full. Events still
+queued when the process is killed are lost; the log line written by
+log_admin_action() remains the fallback record.
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from extensions import db
+from models import AuditEvent
+from logging_config import get_logger, log_exception, log_metric
+
+logger = get_logger('audit')
+
+AUDIT_BUFFER_SIZE = int(os.getenv("AUDIT_BUFFER_SIZE", 10000))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", 200))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", 2.0))
+# Backoff between attempts to write a failed batch: 1s, 2s, 4s, ... up to the max
+AUDIT_RETRY_DELAY = float(os.getenv("AUDIT_RETRY_DELAY", 1.0))
+AUDIT_RETRY_MAX_DELAY = float(os.getenv("AUDIT_RETRY_MAX_DELAY", 60.0))
+
+_STOP = object()
+
+
+class AuditWriter:
+    """
+    Bounded buffer of audit events plus the thread that writes them.
+    The thread is started lazily by the first record() in each process, so
+    it survives forking servers (a thread started before fork would not).
+    """
+
+    def __init__(self, max_size=AUDIT_BUFFER_SIZE, batch_size=AUDIT_BATCH_SIZE, flush_interval=AUDIT_FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_size)
+        self._app = None
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self.written = 0
+        self.dropped = 0
+
+    def init_app(self, app):
+        self._app = app
+        atexit.register(self.close)
+
+    def record(self, action, user_id=None, request_id=None, method=None, path=None, **details):
+        """Queue one event without blocking; returns False when it had to be dropped"""
+        self._ensure_thread()
+        event = {
+            "created_at": datetime.now(),
+            "user_id": int(user_id) if user_id is not None else None,
+            "action": action,
+            "request_id": request_id,
+            "method": method,
+            "path": path[:255] if path else path,
+            "details": details or None,
+        }
+        return self._enqueue([event])
+
+    def flush(self):
+        """
+        Write everything queued so far, on the calling thread. Returns the
+        number written; on failure the events go back on the queue.
+        """
+        events = []
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if event is not _STOP:
+                events.append(event)
+        if self._write(events):
+            return len(events)
+        self._enqueue(events)
+        return 0
+
+    def close(self):
+        """Stop the writer thread and flush what is left (registered with atexit)"""
+        thread = self._thread
+        if thread is not None and thread.is_alive() and self._pid == os.getpid():
+            self._stopping.set()
+            try:
+                self._queue.put_nowait(_STOP)  # Wake the thread if it is waiting for events
+            except queue.Full:
+                pass
+            thread.join(timeout=10)
+        self.flush()
+
+    def _enqueue(self, events):
+        """Queue events without blocking; the ones that don't fit are dropped"""
+        for i, event in enumerate(events):
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                self._count_dropped(len(events) - i)
+                return False
+        return True
+
+    def _count_dropped(self, count):
+        before = self.dropped
+        self.dropped += count
+        if before == 0 or before // 1000 != self.dropped // 1000:
+            logger.warning(
+                "Audit buffer full, dropping events",
+                event="audit_events_dropped",
+                dropped_count=self.dropped
+            )
+
+    def _ensure_thread(self):
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        if self._app is None or self._app.testing:
+            return  # Scripts and tests: events wait for an explicit flush()
+        with self._start_lock:
+            if self._pid != os.getpid() or self._thread is None or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        batch = []
+        deadline = None
+        failures = 0
+        while True:
+            if failures:
+                # Hold on to the failed batch and stop draining the queue, so
+                # new events wait in (and only overflow from) the bounded buffer
+                delay = min(AUDIT_RETRY_MAX_DELAY, AUDIT_RETRY_DELAY * 2 ** (failures - 1))
+                stopping = self._stopping.wait(delay)
+                if self._write(batch):
+                    batch, deadline, failures = [], None, 0
+                elif stopping:
+                    self._count_dropped(len(batch))
+                    return
+                else:
+                    failures += 1
+                continue
+
+            stopping = self._stopping.is_set()
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                event = self._queue.get(timeout=0 if stopping else timeout)
+            except queue.Empty:
+                event = _STOP if stopping else None
+
+            if event is _STOP:
+                if not self._write(batch):
+                    self._enqueue(batch)  # close() flushes the queue once more
+                return
+            if event is not None:
+                batch.append(event)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                if self._write(batch):
+                    batch, deadline = [], None
+                else:
+                    failures = 1
+
+    def _write(self, events):
+        """Insert `events` in one transaction; returns False (and logs) when it failed"""
+        if not events:
+            return True
+        try:
+            # Without init_app the caller's app context is used (scripts, tests)
+            app_context = self._app.app_context() if self._app is not None else nullcontext()
+            with self._write_lock, app_context, db.engine.begin() as connection:
+                # One executemany; on PostgreSQL it goes out as multi-row INSERT ... VALUES pages
+                connection.execute(insert(AuditEvent), events)
+        except Exception as e:
+            log_exception("Failed to write audit events", error=e, event="audit_write_failure", event_count=len(events))
+            return False
+        self.written += len(events)
+        log_metric("audit_events_written", len(events), unit="events")
+        return True
+
+audit_log = AuditWriter()
@@ -0,0 +1,171 @@
+"""
+Versioned in-process catalog cache.
+
+The catalog (products and categories) is read far more often than it is
+written, and it only changes through the admin product/category endpoints
+and the stock movements of checkout. Every such write calls
+`catalog_cache.bump()` after its commit, which advances a monotonically
+increasing catalog version. Readers get the JSON bytes that were encoded
+for the current version, so a cache hit costs no DB round trip and no
+serialization.
+
+The cache lives in each worker process. A bump only reaches the worker that
+handled the write, so entries also expire after CATALOG_CACHE_TTL seconds
+to bound how stale another worker can be.
+
+Each payload carries a strong ETag hashed from its bytes (not the version,
+which is per-worker), so conditional GETs revalidate correctly whichever
+worker answers them.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response, current_app, request
+
+from compression import compress, etag_variants
+from logging_config import get_logger
+
+logger = get_logger('catalog_cache')
+
+
+class CachedPayload:
+    """A pre-encoded response body tied to the catalog version it was built from"""
+    __slots__ = ("version", "body", "etag", "created_at", "_compressed")
+
+    # Compressed on the first request after each catalog bump, and checkout bumps
+    # often, so stay at levels cheap enough for the request path
+    PRECOMPRESS_LEVELS = {"br": 6, "gzip": 6}
+
+    def __init__(self, version, body):
+        self.version = version
+        self.body = body
+        self.etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.created_at = time.monotonic()
+        self._compressed = {}
+
+    def compressed(self, encoding):
+        """(compressed body, whether it was reused rather than compressed now)"""
+        data = self._compressed.get(encoding)
+        if data is not None:
+            return data, True
+        data = compress(self.body, encoding, self.PRECOMPRESS_LEVELS[encoding])
+        self._compressed[encoding] = data
+        return data, False
+
+
+class CatalogCache:
+    def __init__(self, max_entries=512, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._version = 1
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def version(self):
+        return self._version
+
+    def bump(self, reason=None):
+        """Advance the catalog version; every cached entry becomes stale"""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            version = self._version
+
+        logger.info(
+            f"Catalog version bumped to {version}",
+            event="catalog_version_bumped",
+            catalog_version=version,
+            reason=reason
+        )
+        return version
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != self._version or self._expired(entry):
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def get_or_build(self, key, builder):
+        """
+        Return the cached payload for `key`, calling `builder()` and encoding
+        its result on a miss. Builders may return already encoded bytes.
+        Exceptions raised by the builder propagate and nothing is cached.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        version = self._version
+        payload = builder()
+        if isinstance(payload, bytes):
+            body = payload
+        else:
+            body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        entry = CachedPayload(version, body)
+
+        with self._lock:
+            # A write committed while we were building; don't cache old data
+            if version == self._version:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def stats(self):
+        return {
+            "catalog_version": self._version,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _expired(self, entry):
+        return self.ttl is not None and time.monotonic() - entry.created_at > self.ttl
+
+
+def json_response(entry, route=None, status=200, reused=True):
+    """
+    Wrap a CachedPayload in a Response so Flask-RESTful skips re-encoding.
+    Answers 304 Not Modified when the client already holds this payload
+    in any encoding.
+    `route` selects the Cache-Control directives from app.config["CACHE_CONTROL"].
+    Pass reused=False for one-off payloads so they are compressed at the
+    normal level instead of being precompressed for reuse.
+    """
+    # The client may hold the plain or a compressed representation
+    matched = next(
+        (etag for etag in etag_variants(entry.etag) if request.if_none_match.contains_weak(etag)),
+        None,
+    )
+    if matched:
+        response = Response(status=304)
+        response.set_etag(matched)
+    else:
+        response = Response(entry.body, status=status, mimetype="application/json")
+        response.set_etag(entry.etag)
+        if reused:
+            response.catalog_payload = entry  # Lets compression reuse precompressed bytes
+
+    cache_control = current_app.config.get("CACHE_CONTROL", {}).get(route)
+    if cache_control:
+        response.headers["Cache-Control"] = cache_control
+    return response
+
+
+catalog_cache = CatalogCache(
+    max_entries=int(os.getenv("CATALOG_CACHE_MAX_ENTRIES", 512)),
+    ttl=float(os.getenv("CATALOG_CACHE_TTL", 60)),
+)
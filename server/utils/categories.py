@@ -0,0 +1,35 @@
+"""
+Lightweight category headers.
+
+A category's page shows its products through /categories/<id>/products, so
+the category itself is served without its products, plus a product_count.
+The header is cached in the catalog cache: the count is taken once per
+catalog version (an index-only count on products.category_id), not on
+every request.
+"""
+
+from sqlalchemy import func
+
+from extensions import db
+from models import Category, Product
+from utils.catalog_cache import catalog_cache
+from utils.serializers import CATEGORY_SUMMARY
+
+
+def _build_category_header(category_id):
+    category = db.session.get(Category, category_id)
+    if category is None:
+        raise LookupError(category_id)
+    header = CATEGORY_SUMMARY.dump(category)
+    header["product_count"] = db.session.query(func.count(Product.id)).filter(
+        Product.category_id == category_id
+    ).scalar()
+    return header
+
+
+def category_header(category_id):
+    """
+    Cached category header as a CachedPayload (JSON bytes in .body).
+    Raises LookupError for an unknown category.
+    """
+    return catalog_cache.get_or_build(("category", category_id), lambda: _build_category_header(category_id))
@@ -0,0 +1,75 @@
+"""
+Atomic increments for aggregate tables keyed by a primary key.
+
+On SQLite and PostgreSQL this is a single INSERT ... ON CONFLICT DO UPDATE
+SET col = col + :n, so concurrent writers never lose an update and no row
+lock is held across statements. Other backends fall back to a locked
+read-modify-write through the ORM.
+
+Named counters (the `counters` table) are built on the same upsert: write
+paths call bump_counters() in their own transaction, and readers get the
+totals from read_counters() without aggregating the source tables.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql, sqlite
+
+from extensions import db
+from models import Counter
+
+UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def upsert_increment(model, keys, increments, values=None):
+    """
+    Add `increments` ({column: amount}) to the `model` row identified by
+    `keys` ({pk column: value}), creating it when missing. `values` are
+    plain assignments applied on both insert and update (e.g. updated_at).
+    """
+    values = values or {}
+    insert = UPSERT_DIALECTS.get(db.session.get_bind().dialect.name)
+    if insert is not None:
+        columns = inspect(model).columns
+        stmt = insert(model).values(**keys, **increments, **values)
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=[columns[key] for key in keys],
+            set_={
+                **{column: columns[column] + amount for column, amount in increments.items()},
+                **values,
+            },
+        ))
+        return
+
+    pk = tuple(keys[column.key] for column in inspect(model).primary_key)
+    row = db.session.get(model, pk if len(pk) > 1 else pk[0], with_for_update=True)
+    if row is None:
+        db.session.add(model(**keys, **increments, **values))
+        return
+    for column, amount in increments.items():
+        setattr(row, column, getattr(row, column) + amount)
+    for column, value in values.items():
+        setattr(row, column, value)
+
+
+def bump_counters(changes):
+    """Add {counter name: amount} to the named counters in the current transaction"""
+    now = datetime.now()
+    # Sorted so concurrent transactions take the row locks in the same order
+    for name, amount in sorted(changes.items()):
+        if amount:
+            upsert_increment(Counter, {"name": name}, {"value": amount}, {"updated_at": now})
+
+
+def set_counters(values):
+    """Overwrite named counters with absolute values in the current transaction"""
+    now = datetime.now()
+    for name, value in sorted(values.items()):
+        upsert_increment(Counter, {"name": name}, {}, {"value": value, "updated_at": now})
+
+
+def read_counters(prefix):
+    """{name without prefix: value} for the counters whose name starts with `prefix`"""
+    rows = db.session.query(Counter.name, Counter.value).filter(Counter.name.startswith(prefix, autoescape=True))
+    return {name[len(prefix):]: value for name, value in rows}
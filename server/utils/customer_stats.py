@@ -0,0 +1,65 @@
+"""
+Maintained per-customer order totals (customer_stats).
+
+The admin customer list shows each customer's paid order count, lifetime
+spend and last payment. Aggregating orders per user on every page load is
+N+1 (or a GROUP BY over the whole orders table), so mark_order_paid() adds
+the order to its customer's row in the same transaction, and the listing
+joins against customer_stats. idx_customer_stats_paid_total serves the
+sort by spend.
+
+rebuild_customer_stats() recomputes the table with one grouped query
+(`flask rebuild-customer-stats`), for the initial backfill or to repair drift.
+"""
+
+from sqlalchemy import func
+
+from extensions import db
+from models import CustomerStats, Order
+from logging_config import get_logger
+from utils.counters import upsert_increment
+
+logger = get_logger('customer_stats')
+
+
+def record_customer_payment(order, paid_at, sign=1):
+    """
+    Add a paid order to its customer's totals within the current transaction
+    (sign=-1 takes a cancelled one back out; last_paid_at is then left as
+    is until the next rebuild).
+    """
+    upsert_increment(
+        CustomerStats,
+        {"user_id": order.user_id},
+        {"order_count": sign, "paid_total": sign * order.total_amount},
+        {"last_paid_at": paid_at} if sign > 0 else None,
+    )
+
+
+def rebuild_customer_stats():
+    """Recompute customer_stats from paid orders. Returns the number of rows written."""
+    totals = (
+        db.session.query(
+            Order.user_id,
+            func.count(Order.id),
+            func.sum(Order.total_amount),
+            func.max(Order.paid_at),
+        )
+        .filter(Order.status == "paid")
+        .group_by(Order.user_id)
+        .all()
+    )
+
+    db.session.query(CustomerStats).delete(synchronize_session=False)
+    db.session.bulk_insert_mappings(CustomerStats, [
+        {"user_id": user_id, "order_count": count, "paid_total": float(total or 0), "last_paid_at": last_paid_at}
+        for user_id, count, total, last_paid_at in totals
+    ])
+    db.session.commit()
+
+    logger.info(
+        f"Rebuilt customer stats for {len(totals)} customers",
+        event="customer_stats_rebuilt",
+        customers=len(totals)
+    )
+    return len(totals)
@@ -1,11 +1,26 @@
 from functools import wraps
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import User
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from logging_config import get_logger, log_metric
 from request_tracking import get_current_request_context
+from utils.user_cache import user_cache
 import time
 import traceback
 
+
+def has_role(role):
+    """
+    True when the current JWT's user has `role`. A role claim that doesn't
+    match is rejected without a lookup; otherwise the role is confirmed
+    against the per-worker user cache (tokens issued before role claims
+    carry none), so demotions apply before the token expires.
+    """
+    claimed = get_jwt().get('role')
+    if claimed is not None and claimed != role:
+        return False
+    user = user_cache.get(get_jwt_identity())
+    return user is not None and user.role == role
+
+
 def admin_required(fn):
     """
     Decorator to ensure only admin users can access a route
@@ -13,10 +28,7 @@ def admin_required(fn):
     @wraps(fn)
     @jwt_required()
     def wrapper(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
-        
-        if not current_user or current_user.role != 'admin':
+        if not has_role('admin'):
             return {'error': 'Admin access required'}, 403
         
         return fn(*args, **kwargs)
@@ -31,10 +43,7 @@ def role_required(role):
         @wraps(fn)
         @jwt_required()
         def wrapper(*args, **kwargs):
-            current_user_id = get_jwt_identity()
-            current_user = User.query.get(current_user_id)
-            
-            if not current_user or current_user.role != role:
+            if not has_role(role):
                 return {'error': f'{role.title()} access required'}, 403
             
             return fn(*args, **kwargs)
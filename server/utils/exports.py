@@ -0,0 +1,98 @@
+"""
+Streaming CSV / NDJSON exports of whole tables.
+
+Each export is a single Core SELECT executed with yield_per, which uses a
+server-side cursor where the driver has one (stream_results). Rows are
+fetched one batch at a time and each batch is written out as one chunk,
+so memory stays flat no matter how large the table is. Nothing is loaded
+into the ORM session.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+
+from sqlalchemy import select
+
+from extensions import db
+from models import CustomerStats, Order, Product, ProductSalesStats, User
+from utils.serializers import DATE_FORMAT, DATETIME_FORMAT
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# export name -> (columns, order by); outer joins are added in export_statement
+EXPORTS = {
+    "products": (
+        [Product.id, Product.name, Product.description, Product.price, Product.stock, Product.category_id,
+         Product.image_url, Product.created_at, ProductSalesStats.units_sold, ProductSalesStats.revenue],
+        Product.id,
+    ),
+    "orders": (
+        [Order.id, Order.user_id, Order.total_amount, Order.status, Order.created_at, Order.paid_at,
+         Order.mpesa_checkout_request_id],
+        Order.id,
+    ),
+    "customers": (
+        [User.id, User.first_name, User.last_name, User.email, User.phone_number, User.created_at,
+         CustomerStats.order_count, CustomerStats.paid_total, CustomerStats.last_paid_at],
+        User.id,
+    ),
+}
+
+
+def export_statement(name):
+    columns, order_by = EXPORTS[name]
+    stmt = select(*columns)
+    if name == "products":
+        stmt = stmt.outerjoin(ProductSalesStats, ProductSalesStats.product_id == Product.id)
+    elif name == "customers":
+        stmt = stmt.outerjoin(CustomerStats, CustomerStats.user_id == User.id).where(User.role == "customer")
+    return stmt.order_by(order_by)
+
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        return value.strftime(DATETIME_FORMAT)
+    if isinstance(value, date):
+        return value.strftime(DATE_FORMAT)
+    return value
+
+
+def iter_export_batches(name, batch_size=EXPORT_BATCH_SIZE):
+    """Yield the export's rows as lists of at most `batch_size` tuples"""
+    result = db.session.execute(
+        export_statement(name).execution_options(yield_per=batch_size)
+    )
+    try:
+        for batch in result.partitions():
+            yield [tuple(_format_value(value) for value in row) for row in batch]
+    finally:
+        result.close()
+
+
+def export_header(name):
+    return [column.key for column in EXPORTS[name][0]]
+
+
+def stream_export(name, fmt, batch_size=EXPORT_BATCH_SIZE):
+    """Yield the export as text chunks (one per batch) in `fmt` ("csv" or "ndjson")"""
+    header = export_header(name)
+
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        for batch in iter_export_batches(name, batch_size):
+            writer.writerows(batch)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():  # Header only: the export is empty
+            yield buffer.getvalue()
+        return
+
+    dumps = json.JSONEncoder(separators=(",", ":")).encode
+    for batch in iter_export_batches(name, batch_size):
+        yield "".join(dumps(dict(zip(header, row))) + "\n" for row in batch)
@@ -0,0 +1,93 @@
+"""
+Sparse fieldsets (?fields=id,name,price).
+
+Clients that only need a few attributes name them in ?fields= and the
+projection is pushed down into the SELECT: only those columns are loaded,
+and the Category join is skipped unless "category" is requested.
+"""
+
+from models import Category, Product
+
+PRODUCT_FIELDS = ("id", "name", "price", "stock", "image_url", "category")
+ADMIN_PRODUCT_FIELDS = PRODUCT_FIELDS + (
+    "total_sales", "total_revenue", "sales_velocity", "days_of_cover", "low_stock_warning"
+)
+CART_ITEM_FIELDS = ("id", "product_id", "product_name", "product_price", "product_image", "quantity")
+
+# Cart item response key -> Product column it reads
+CART_ITEM_PRODUCT_COLUMNS = {
+    "product_name": Product.name,
+    "product_price": Product.price,
+    "product_image": Product.image_url,
+}
+
+
+class FieldSelectionError(ValueError):
+    """Raised for ?fields= values the endpoint does not expose"""
+
+
+def parse_fields(raw, allowed):
+    """
+    Parse ?fields= into a tuple ordered like `allowed`.
+    Returns None when the parameter is absent (full representation).
+    """
+    if raw is None:
+        return None
+
+    requested = {field.strip() for field in raw.split(",") if field.strip()}
+    if not requested:
+        raise FieldSelectionError("'fields' must name at least one field")
+
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise FieldSelectionError(
+            f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed)}"
+        )
+    return tuple(field for field in allowed if field in requested)
+
+
+def product_columns(fields):
+    """Product columns backing the requested scalar fields (id always included)"""
+    columns = [Product.id]
+    for field in fields:
+        if field in ("id", "category"):
+            continue
+        if field in PRODUCT_FIELDS:
+            columns.append(getattr(Product, field))
+    if "category" in fields:
+        columns.append(Product.category_id)
+    if "sales_velocity" in fields or "days_of_cover" in fields or "low_stock_warning" in fields:
+        columns.extend([Product.stock, Product.sales_velocity])
+    return list(dict.fromkeys(columns))
+
+
+def category_columns():
+    return [Category.id.label("category_ref_id"), Category.name.label("category_name")]
+
+
+def project_product_row(row, fields):
+    """Dict for a projected row selected with product_columns (+ category_columns)"""
+    data = {}
+    for field in fields:
+        if field == "category":
+            data["category"] = (
+                {"id": row.category_ref_id, "name": row.category_name}
+                if row.category_ref_id is not None else None
+            )
+        else:
+            data[field] = getattr(row, field)
+    return data
+
+
+def project_product(product, fields):
+    """Dict for a Product instance, reading only the requested attributes"""
+    data = {}
+    for field in fields:
+        if field == "category":
+            data["category"] = (
+                {"id": product.category.id, "name": product.category.name}
+                if product.category else None
+            )
+        elif field in PRODUCT_FIELDS:
+            data[field] = getattr(product, field)
+    return data
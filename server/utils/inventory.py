@@ -0,0 +1,100 @@
+"""
+Set-based stock adjustments.
+
+adjust_stock() applies many {product_id: delta} changes with one UPDATE per
+chunk:
+
+    UPDATE products SET stock = stock + CASE id WHEN 1 THEN -3 ... END
+    WHERE id IN (...) AND stock + CASE id ... END >= 0
+
+The WHERE guard keeps stock from going negative under concurrent checkouts
+without locking rows first; products the guard skipped are reported back
+instead of failing the whole adjustment.
+"""
+
+from collections import defaultdict
+
+from sqlalchemy import case, update
+
+from extensions import db
+from models import Product
+from logging_config import get_logger
+from utils.catalog_cache import catalog_cache
+from utils.counters import bump_counters
+from utils.product_render import notify_products_changed, render_products_in_transaction
+from utils.summary import STOCK_THRESHOLD_COUNTER, stock_threshold_change
+
+logger = get_logger('inventory')
+
+CHUNK_SIZE = 500
+
+
+def merge_deltas(adjustments):
+    """Sum (product_id, delta) pairs per product, dropping net-zero changes"""
+    totals = defaultdict(int)
+    for product_id, delta in adjustments:
+        totals[product_id] += delta
+    return {product_id: delta for product_id, delta in totals.items() if delta}
+
+
+def adjust_stock(deltas, chunk_size=CHUNK_SIZE, reason="stock_adjusted"):
+    """
+    Add deltas[product_id] to each product's stock and commit.
+    Returns (applied product ids, rejected [{product_id, delta, error, stock}]).
+    """
+    applied, rejected, stock_changes = [], [], []
+    product_ids = sorted(deltas)  # Stable lock order across concurrent adjustments
+
+    for start in range(0, len(product_ids), chunk_size):
+        chunk = product_ids[start:start + chunk_size]
+        new_stock = Product.stock + case({product_id: deltas[product_id] for product_id in chunk}, value=Product.id)
+        stmt = (
+            update(Product)
+            .where(Product.id.in_(chunk), new_stock >= 0)
+            .values(stock=new_stock)
+            .execution_options(synchronize_session=False)
+        )
+
+        if db.engine.dialect.update_returning:
+            # product id -> stock after the update
+            updated = dict(db.session.execute(stmt.returning(Product.id, Product.stock)).all())
+        else:
+            # Without RETURNING, find the rows the guard will skip first
+            current = dict(
+                db.session.query(Product.id, Product.stock).filter(Product.id.in_(chunk)).with_for_update()
+            )
+            db.session.execute(stmt)
+            updated = {
+                product_id: stock + deltas[product_id] for product_id, stock in current.items()
+                if stock + deltas[product_id] >= 0
+            }
+        stock_changes.extend((stock - deltas[product_id], stock) for product_id, stock in updated.items())
+
+        skipped = [product_id for product_id in chunk if product_id not in updated]
+        if skipped:
+            stock = dict(db.session.query(Product.id, Product.stock).filter(Product.id.in_(skipped)))
+            for product_id in skipped:
+                rejected.append({
+                    "product_id": product_id,
+                    "delta": deltas[product_id],
+                    "error": "insufficient_stock" if product_id in stock else "not_found",
+                    "stock": stock.get(product_id),
+                })
+        applied.extend(product_id for product_id in chunk if product_id in updated)
+
+    # Bulk UPDATEs bypass the session events that keep rendered_json current
+    render_products_in_transaction(applied)
+    bump_counters({STOCK_THRESHOLD_COUNTER: stock_threshold_change(stock_changes)})
+    db.session.commit()
+
+    if applied:
+        notify_products_changed(applied)
+        catalog_cache.bump(reason)
+
+    logger.info(
+        f"Stock adjusted for {len(applied)} products, {len(rejected)} rejected",
+        event="stock_adjusted",
+        applied_count=len(applied),
+        rejected_count=len(rejected)
+    )
+    return applied, rejected
@@ -5,6 +5,8 @@ Order utilities for handling safe order creation with proper data integrity
 from models import db, Cart, CartItem, Order, OrderItem, Product
 from sqlalchemy import and_
 from sqlalchemy.orm import joinedload
+from utils.catalog_cache import catalog_cache
+from utils.sales_stats import mark_order_cancelled, record_order_placed
 import logging
 
 logger = logging.getLogger(__name__)
@@ -75,6 +77,7 @@ def create_order_with_stock_reservation(user_id, cart_id):
         )
         db.session.add(order)
         db.session.flush()  # Get order ID without committing
+        record_order_placed(order)
         
         # Create order items and reserve stock
         order_items = []
@@ -101,6 +104,7 @@ def create_order_with_stock_reservation(user_id, cart_id):
         
         # Commit all changes atomically
         db.session.commit()
+        catalog_cache.bump("stock_reserved")
         
         logger.info(f"Order {order.id} created successfully for user {user_id}")
         
@@ -136,8 +140,9 @@ def cancel_order_and_restore_stock(order_id):
         if not order:
             raise ValueError("Order not found")
         
-        if order.status in ["cancelled", "refunded"]:
-            raise ValueError("Order already cancelled or refunded")
+        if order.status in ["cancelled", "refunded", "failed"]:
+            # Failed orders had their stock restored when the payment failed
+            raise ValueError("Order already cancelled, refunded or failed")
         
         # Get all products in the order and lock them
         product_ids = [item.product_id for item in order.items]
@@ -160,10 +165,11 @@ def cancel_order_and_restore_stock(order_id):
                     'restored_quantity': order_item.quantity
                 })
         
-        # Update order status
-        order.status = "cancelled"
+        # Update order status (and the counters and paid stats, in this transaction)
+        mark_order_cancelled(order)
         
         db.session.commit()
+        catalog_cache.bump("stock_restored")
         
         logger.info(f"Order {order_id} cancelled and stock restored for {len(restored_items)} items")
         
@@ -0,0 +1,166 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Keyset pagination seeks past the last row of the previous page using an
+indexed sort key instead of OFFSET, so fetching page 1000 costs the same as
+fetching page 1 no matter how large the table grows.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, func, or_
+
+from extensions import db
+
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor we did not issue"""
+
+
+def parse_datetime(value):
+    return datetime.fromisoformat(value)
+
+
+def parse_query_datetime(value):
+    """
+    ISO 8601 query parameter as a naive local datetime, the clock the
+    timestamp columns are stored in; values with a UTC offset are converted.
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def _to_json(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(values):
+    """Encode the sort key values of the last row on a page into an opaque token"""
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, parsers):
+    """
+    Decode a cursor produced by encode_cursor.
+    `parsers` is one callable per sort column that turns the JSON value back
+    into something comparable with the column (e.g. parse_datetime, int).
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise InvalidCursor("Invalid cursor")
+        return [parse(value) for parse, value in zip(parsers, values)]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def get_page_size(raw_limit, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Clamp the client supplied ?limit= to a sane range"""
+    if raw_limit is None:
+        return default
+    try:
+        limit = int(raw_limit)
+    except (TypeError, ValueError):
+        raise ValueError("'limit' must be an integer")
+    return max(1, min(limit, maximum))
+
+
+def keyset_filter(columns, values, descending=False):
+    """
+    Build the "row comes after the cursor" predicate for a multi column sort key.
+    Expanded as (a > x) OR (a = x AND b > y) so it works on every backend and
+    can still use a composite index on the sort columns.
+    """
+    clauses = []
+    for i, column in enumerate(columns):
+        compare = column < values[i] if descending else column > values[i]
+        equal_prefix = [columns[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal_prefix, compare))
+    return or_(*clauses)
+
+
+def keyset_order_by(columns, descending=False):
+    return [column.desc() if descending else column.asc() for column in columns]
+
+
+def paginate_keyset(query, columns, parsers, cursor=None, limit=DEFAULT_PAGE_SIZE, descending=False,
+                    cursor_values=None):
+    """
+    Apply keyset pagination to `query`.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    `columns` must end in a unique column (normally the primary key) so the
+    ordering is total and no row is skipped or repeated between pages.
+    `cursor_values(row)` returns the sort key of a row when it can't be read
+    as row.<column key> (e.g. columns of a joined table).
+    """
+    if cursor:
+        query = query.filter(keyset_filter(columns, decode_cursor(cursor, parsers), descending))
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(*keyset_order_by(columns, descending)).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        values = cursor_values(last) if cursor_values else [getattr(last, column.key) for column in columns]
+        next_cursor = encode_cursor(values)
+
+    return rows, next_cursor
+
+
+# Largest count computed exactly where the database offers no row estimate
+COUNT_ESTIMATE_CAP = 10000
+
+
+def estimate_count(query, cap=COUNT_ESTIMATE_CAP):
+    """
+    Cheap total for a listing, as (count, is_exact).
+    PostgreSQL: the planner's row estimate from EXPLAIN, no table scan.
+    Elsewhere: COUNT over at most `cap` + 1 rows, so the cost is bounded
+    and the count is exact below the cap.
+    """
+    session = query.session
+    dialect = session.get_bind().dialect
+    if dialect.name == "postgresql":
+        compiled = query.order_by(None).statement.compile(dialect=dialect)
+        plan = session.connection().exec_driver_sql(
+            "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"]), False
+
+    capped = query.order_by(None).limit(cap + 1).subquery()
+    count = session.query(func.count()).select_from(capped).scalar()
+    return min(count, cap), count <= cap
+
+
+def prefix_filter(column, prefix):
+    """
+    `column` starts with `prefix`, in a form an index on the column can serve.
+    PostgreSQL: LIKE 'ab%' (escaped), which a text_pattern_ops /
+    varchar_pattern_ops index serves under any collation; a plain range
+    is wrong there when the collation ignores punctuation.
+    Elsewhere (binary collation): the range col >= 'ab' AND col < 'ac'.
+    """
+    if db.engine.dialect.name == "postgresql":
+        return column.startswith(prefix, autoescape=True)
+
+    # Characters at U+10FFFF have no successor; the range ends at the one before
+    stem = prefix.rstrip(chr(0x10FFFF))
+    if not stem:
+        return column >= prefix
+    upper = stem[:-1] + chr(ord(stem[-1]) + 1)
+    return and_(column >= prefix, column < upper)
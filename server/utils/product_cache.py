@@ -0,0 +1,56 @@
+"""
+Per-product LRU cache for single and batch product lookups.
+
+Entries hold the pre-rendered product JSON (see utils/product_render.py) and
+are keyed by product id. Each committed change to a product advances that
+product's version and evicts it, so only the changed product is refetched,
+not the whole catalog. Unknown ids are cached as misses too, so repeated
+lookups of deleted or invalid ids don't hit the database.
+
+Like the catalog cache this is per worker (see utils/versioned_lru.py);
+entries expire after PRODUCT_CACHE_TTL seconds (misses after
+PRODUCT_CACHE_MISS_TTL) to bound staleness from writes handled elsewhere.
+"""
+
+import os
+
+from sqlalchemy.orm import joinedload
+
+from extensions import db
+from models import Product
+from utils.product_render import on_products_changed, render_product
+from utils.versioned_lru import MISSING, VersionedLRU
+
+
+class ProductCache(VersionedLRU):
+    def load(self, product_ids):
+        """
+        Pre-rendered JSON for each id, or None for ids that don't exist.
+        Cache misses are fetched together in a single IN query.
+        """
+        found, to_fetch, generation = self.get_many(product_ids)
+        if to_fetch:
+            rows = db.session.query(Product.id, Product.rendered_json).filter(Product.id.in_(to_fetch)).all()
+            fetched = {row.id: row.rendered_json for row in rows}
+
+            # Not backfilled yet: render from the model
+            unrendered = [product_id for product_id, fragment in fetched.items() if not fragment]
+            if unrendered:
+                products = Product.query.options(joinedload(Product.category)).filter(Product.id.in_(unrendered))
+                fetched.update({product.id: render_product(product) for product in products})
+
+            for product_id in to_fetch:
+                found[product_id] = fetched.get(product_id) or MISSING
+                self.store(product_id, found[product_id], generation)
+
+        return {product_id: None if found[product_id] is MISSING else found[product_id] for product_id in product_ids}
+
+
+product_cache = ProductCache(
+    max_entries=int(os.getenv("PRODUCT_CACHE_MAX_ENTRIES", 5000)),
+    ttl=float(os.getenv("PRODUCT_CACHE_TTL", 60)),
+    miss_ttl=float(os.getenv("PRODUCT_CACHE_MISS_TTL", 10)),
+)
+
+# Evict products as soon as a transaction that changed them commits
+on_products_changed(product_cache.invalidate)
@@ -0,0 +1,294 @@
+"""
+Streaming bulk product import (CSV / NDJSON).
+
+The upload is read row by row from the request stream and never held in
+memory as a whole. Rows are validated with the same rules as the Product
+model (clean_price / clean_stock) and upserted in batches:
+
+- a row with an `id` updates that product
+- otherwise a row whose `name` matches an existing product updates it
+- anything else creates a product
+
+Each batch is one bulk INSERT plus one bulk UPDATE by primary key, and is
+committed on its own, so a bad row or a failed batch never discards the
+rest of the import. A batch the database rejects is retried row by row, so
+only the offending rows fail. Invalid rows are reported by row number.
+
+Bulk statements bypass the session events, so each batch writes its
+rendered JSON in the same transaction, and the search/suggest indexes and
+caches are refreshed once at the end.
+"""
+
+import csv
+import io
+import json
+
+from sqlalchemy import insert, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from extensions import db
+from models import Category, Product, clean_price, clean_stock
+from logging_config import get_logger, log_exception
+from utils.catalog_cache import catalog_cache
+from utils.product_render import notify_products_changed, render_products_in_transaction
+from utils.search import product_search
+from utils.suggest import suggest_index
+from utils.summary import recount_stock_threshold
+
+logger = get_logger('product_import')
+
+IMPORT_COLUMNS = ("id", "name", "description", "price", "stock", "image_url", "category_id", "category")
+REQUIRED_ON_CREATE = ("name", "price", "stock")
+
+CSV_MIMETYPES = {"text/csv", "application/csv"}
+NDJSON_MIMETYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
+
+class ImportFormatError(ValueError):
+    """
+    Raised when the upload as a whole can't be read (bad header, unknown
+    format, invalid UTF-8 or CSV partway through). `report` holds what was
+    imported before the unreadable part, if anything was.
+    """
+
+    def __init__(self, message, report=None):
+        super().__init__(message)
+        self.report = report
+
+
+def iter_csv_rows(stream):
+    """Yield (row_number, dict) from a binary CSV stream with a header line"""
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    header = [column.strip() for column in reader.fieldnames or []]
+    unknown = set(header) - set(IMPORT_COLUMNS)
+    if not header or unknown:
+        raise ImportFormatError(
+            f"CSV header must use the columns: {', '.join(IMPORT_COLUMNS)}"
+            + (f" (unknown: {', '.join(sorted(unknown))})" if unknown else "")
+        )
+    reader.fieldnames = header
+
+    for row_number, row in enumerate(reader, start=1):
+        # Empty cells mean "not given"
+        yield row_number, {key: value for key, value in row.items() if key and value not in (None, "")}
+
+
+def iter_ndjson_rows(stream):
+    """Yield (row_number, dict or ValueError) from a binary NDJSON stream"""
+    row_number = 0
+    for line in io.TextIOWrapper(stream, encoding="utf-8"):
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield row_number, ValueError("Invalid JSON")
+            continue
+        if not isinstance(row, dict):
+            yield row_number, ValueError("Each line must be a JSON object")
+            continue
+        yield row_number, {key: value for key, value in row.items() if value is not None}
+
+
+def iter_upload_rows(stream, mimetype):
+    if mimetype in CSV_MIMETYPES:
+        return iter_csv_rows(stream)
+    if mimetype in NDJSON_MIMETYPES:
+        return iter_ndjson_rows(stream)
+    raise ImportFormatError("Upload must be text/csv or application/x-ndjson")
+
+
+class ProductImporter:
+    def __init__(self, batch_size=1000, max_errors=1000):
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors = []
+        self.touched_ids = set()
+        # Categories are few; resolve them in memory
+        categories = db.session.query(Category.id, Category.name).all()
+        self._category_ids = {category_id for category_id, _ in categories}
+        self._category_by_name = {name.lower(): category_id for category_id, name in categories}
+
+    def run(self, rows):
+        """
+        Import every row and return the report. Raises ImportFormatError when
+        the stream becomes unreadable; the rows before that point are kept.
+        """
+        batch = []
+        last_row = 0
+        unreadable = None
+        try:
+            try:
+                for row_number, raw in rows:
+                    last_row = row_number
+                    try:
+                        if isinstance(raw, Exception):
+                            raise raw
+                        batch.append((row_number, self._clean(raw)))
+                    except ValueError as e:
+                        self._fail(row_number, str(e))
+                        continue
+                    if len(batch) >= self.batch_size:
+                        self._write_batch(batch)
+                        batch = []
+            except (UnicodeDecodeError, csv.Error) as e:
+                unreadable = e
+            if batch:
+                self._write_batch(batch)
+        finally:
+            # Earlier batches are committed whatever happened to the rest
+            self._sync_derived_state()
+
+        if unreadable is not None:
+            raise ImportFormatError(
+                f"Upload could not be read after row {last_row}: {unreadable}",
+                report=self.report() if self.created or self.updated or self.failed else None,
+            )
+        return self.report()
+
+    def report(self):
+        return {
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": sorted(self.errors, key=lambda error: error["row"]),
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+    def _clean(self, raw):
+        unknown = set(raw) - set(IMPORT_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+
+        values = {}
+        if "id" in raw:
+            try:
+                values["id"] = int(raw["id"])
+            except (TypeError, ValueError):
+                raise ValueError("'id' must be an integer")
+        if "name" in raw:
+            values["name"] = str(raw["name"]).strip()
+            if not values["name"]:
+                raise ValueError("'name' must not be blank")
+            if len(values["name"]) > 100:
+                raise ValueError("'name' must be at most 100 characters")
+        for key in ("description", "image_url"):
+            if key in raw:
+                values[key] = str(raw[key])
+        if "price" in raw:
+            values["price"] = clean_price(raw["price"])
+        if "stock" in raw:
+            values["stock"] = clean_stock(raw["stock"])
+
+        if "category_id" in raw:
+            try:
+                values["category_id"] = int(raw["category_id"])
+            except (TypeError, ValueError):
+                raise ValueError("'category_id' must be an integer")
+            if values["category_id"] not in self._category_ids:
+                raise ValueError(f"Category {values['category_id']} does not exist")
+        elif "category" in raw:
+            category_id = self._category_by_name.get(str(raw["category"]).strip().lower())
+            if category_id is None:
+                raise ValueError(f"Category '{raw['category']}' does not exist")
+            values["category_id"] = category_id
+
+        if "id" not in values and "name" not in values:
+            raise ValueError("Each row needs an 'id' or a 'name'")
+        return values
+
+    def _write_batch(self, batch):
+        explicit_ids = {values["id"] for _, values in batch if "id" in values}
+        names = {values["name"] for _, values in batch if "id" not in values}
+
+        existing_ids = set()
+        if explicit_ids:
+            existing_ids = {
+                product_id for (product_id,) in
+                db.session.query(Product.id).filter(Product.id.in_(explicit_ids))
+            }
+        id_by_name = {}
+        if names:
+            # Lowest id wins when a name is not unique
+            for product_id, name in (
+                db.session.query(Product.id, Product.name).filter(Product.name.in_(names)).order_by(Product.id.desc())
+            ):
+                id_by_name[name] = product_id
+
+        inserts = {}   # name -> values, so a name repeated within the batch merges
+        updates = {}   # id -> values
+        accepted = []  # (row_number, values) that reached the write
+        for row_number, values in batch:
+            product_id = values.get("id")
+            if product_id is None:
+                product_id = id_by_name.get(values["name"])
+            elif product_id not in existing_ids:
+                self._fail(row_number, f"Product {product_id} does not exist")
+                continue
+
+            if product_id is not None:
+                updates.setdefault(product_id, {"id": product_id}).update(values)
+                accepted.append((row_number, values))
+                continue
+
+            merged = {**inserts.get(values["name"], {}), **values}
+            missing = [field for field in REQUIRED_ON_CREATE if field not in merged]
+            if missing:
+                self._fail(row_number, f"New products need: {', '.join(missing)}")
+                continue
+            inserts[values["name"]] = merged
+            accepted.append((row_number, values))
+
+        try:
+            new_ids = []
+            if inserts:
+                new_ids = db.session.scalars(
+                    insert(Product).returning(Product.id, sort_by_parameter_order=True),
+                    [{"description": "", **values} for values in inserts.values()],
+                ).all()
+            if updates:
+                db.session.execute(update(Product), list(updates.values()))
+            render_products_in_transaction(list(new_ids) + list(updates))
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            if len(accepted) > 1:
+                # Find the rows the database rejects by writing them one at a time
+                logger.warning(
+                    f"Product import batch of {len(accepted)} rows failed, retrying row by row",
+                    event="product_import_batch_retry",
+                    row_count=len(accepted),
+                    error=str(e)
+                )
+                for row in accepted:
+                    self._write_batch([row])
+                return
+            log_exception("Product import row failed", error=e, event="product_import_batch_failure")
+            for row_number, _ in accepted:
+                self._fail(row_number, "Row could not be written")
+            return
+
+        self.created += len(new_ids)
+        self.updated += len(updates)
+        self.touched_ids.update(new_ids)
+        self.touched_ids.update(updates)
+
+    def _fail(self, row_number, message):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row_number, "error": message})
+
+    def _sync_derived_state(self):
+        if not self.touched_ids:
+            return
+        notify_products_changed(self.touched_ids)
+        # Updated rows' previous stock is unknown, so recount instead of counting crossings
+        recount_stock_threshold()
+        db.session.commit()
+        product_search.rebuild()
+        suggest_index.rebuild()
+        catalog_cache.bump("products_imported")
@@ -0,0 +1,237 @@
+"""
+Pre-rendered product JSON.
+
+Product.rendered_json holds the encoded Product.to_dict() payload so list
+endpoints can stitch stored bytes together instead of building a dict per
+row, touching the category relationship and re-encoding it.
+
+The column is kept current by session events rather than at each call site:
+any flush that inserts or changes a Product (admin edits, checkout stock
+movements) or renames/deletes a Category re-renders the affected products
+in the same transaction. Bulk query.update() statements bypass the ORM and
+must call refresh_rendered_products() for the rows they touched.
+"""
+
+import json
+
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session, joinedload
+
+from extensions import db
+from models import Category, Product
+from logging_config import get_logger
+
+logger = get_logger('product_render')
+
+PENDING_KEY = "products_pending_render"
+CHANGED_KEY = "products_changed"
+
+# Callbacks run with the ids of products changed by each committed transaction
+_change_listeners = []
+
+
+def on_products_changed(callback):
+    """Register callback(product_ids) to run after a commit that changed products"""
+    _change_listeners.append(callback)
+    return callback
+
+
+def notify_products_changed(product_ids):
+    """Run the change callbacks for writes that bypassed the session (bulk statements)"""
+    product_ids = set(product_ids)
+    if product_ids:
+        for callback in _change_listeners:
+            callback(product_ids)
+
+
+def render_product(product):
+    return json.dumps(product.to_dict(), separators=(",", ":"))
+
+
+def render_product_row(row):
+    """
+    Same JSON as render_product() from a plain row of (id, name, price,
+    stock, image_url, category_id, category_name), for bulk paths that
+    don't load Product instances.
+    """
+    return json.dumps({
+        "id": row.id,
+        "name": row.name,
+        "price": row.price,
+        "stock": row.stock,
+        "image_url": row.image_url,
+        "category": {"id": row.category_id, "name": row.category_name} if row.category_id is not None else None,
+    }, separators=(",", ":"))
+
+
+def stitch_json_array(fragments):
+    """Join already encoded JSON values into a JSON array without decoding them"""
+    return "[" + ",".join(fragments) + "]"
+
+
+def rendered_products_json(rows):
+    """
+    Encoded JSON array for `rows` of (id, rendered_json) in the given order.
+    Rows that were never rendered (not yet backfilled) are rendered on the fly
+    with one IN query.
+    """
+    missing = [row.id for row in rows if not row.rendered_json]
+    fallback = {}
+    if missing:
+        products = Product.query.options(joinedload(Product.category)).filter(Product.id.in_(missing)).all()
+        fallback = {product.id: render_product(product) for product in products}
+
+    fragments = []
+    for row in rows:
+        fragment = row.rendered_json or fallback.get(row.id)
+        if fragment:
+            fragments.append(fragment)
+    return stitch_json_array(fragments)
+
+
+def _before_flush(session, flush_context, instances):
+    pending = session.info.setdefault(PENDING_KEY, set())
+
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Product):
+            state = inspect(obj)
+            # Only re-render for real changes, not for our own rendered_json write
+            if obj in session.new or any(
+                state.attrs[key].history.has_changes()
+                for key in ("name", "price", "stock", "image_url", "category_id", "category")
+            ):
+                # category_id changed without the relationship: reload it after the flush
+                if (state.persistent
+                        and state.attrs.category_id.history.has_changes()
+                        and not state.attrs.category.history.has_changes()):
+                    session.expire(obj, ["category"])
+                pending.add(obj)
+        elif isinstance(obj, Category) and inspect(obj).attrs.name.history.has_changes():
+            pending.update(obj.products)
+
+    for obj in session.deleted:
+        if isinstance(obj, Category):
+            # Their category_id is nulled by this flush
+            pending.update(obj.products)
+        elif isinstance(obj, Product):
+            pending.discard(obj)
+
+
+def _after_flush_postexec(session, flush_context):
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+
+    for product in pending:
+        if product in session.deleted or inspect(product).was_deleted:
+            continue
+        rendered = render_product(product)
+        if product.rendered_json != rendered:
+            # Picked up by the next flush of the same commit
+            product.rendered_json = rendered
+
+
+def _after_flush(session, flush_context):
+    # Ids are assigned by now, and new/dirty/deleted still describe this flush
+    changed = session.info.setdefault(CHANGED_KEY, set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Product) and obj.id is not None:
+            changed.add(obj.id)
+
+
+def _after_commit(session):
+    notify_products_changed(session.info.pop(CHANGED_KEY, None) or ())
+
+
+def _after_soft_rollback(session, previous_transaction):
+    session.info.pop(PENDING_KEY, None)
+    session.info.pop(CHANGED_KEY, None)
+
+
+def register_product_render_events():
+    """Hook product rendering into every session flush"""
+    if not event.contains(Session, "before_flush", _before_flush):
+        event.listen(Session, "before_flush", _before_flush)
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_flush_postexec", _after_flush_postexec)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_soft_rollback", _after_soft_rollback)
+
+
+def refresh_rendered_products(product_ids=None, batch_size=500):
+    """
+    Re-render stored JSON for the given products (all products when None),
+    committing every `batch_size` rows. Returns the number of rows rewritten.
+    """
+    query = Product.query.options(joinedload(Product.category)).order_by(Product.id)
+    if product_ids is not None:
+        query = query.filter(Product.id.in_(list(product_ids)))
+
+    updated = 0
+    last_id = 0
+    while True:
+        batch = query.filter(Product.id > last_id).limit(batch_size).all()
+        if not batch:
+            break
+        for product in batch:
+            rendered = render_product(product)
+            if product.rendered_json != rendered:
+                product.rendered_json = rendered
+                updated += 1
+        last_id = batch[-1].id
+        db.session.commit()
+
+    logger.info(
+        f"Refreshed rendered JSON for {updated} products",
+        event="product_render_refreshed",
+        updated=updated
+    )
+    return updated
+
+
+def render_products_in_transaction(product_ids, chunk_size=1000):
+    """
+    Re-render stored JSON for rows written by bulk statements, with one
+    SELECT and one executemany UPDATE per chunk and no ORM instances.
+    Runs in the caller's transaction; the caller commits.
+    """
+    product_ids = list(product_ids)
+    for start in range(0, len(product_ids), chunk_size):
+        chunk = product_ids[start:start + chunk_size]
+        rows = (
+            db.session.query(
+                Product.id, Product.name, Product.price, Product.stock, Product.image_url,
+                Product.category_id, Category.name.label("category_name"),
+            )
+            .outerjoin(Category, Category.id == Product.category_id)
+            .filter(Product.id.in_(chunk))
+            .all()
+        )
+        if rows:
+            db.session.execute(
+                update(Product),
+                [{"id": row.id, "rendered_json": render_product_row(row)} for row in rows],
+            )
+
+
+def find_stale_rendered_products(batch_size=500):
+    """
+    Consistency check: ids of products whose stored JSON is missing or no
+    longer matches a fresh render.
+    """
+    stale = []
+    last_id = 0
+    while True:
+        batch = (
+            Product.query.options(joinedload(Product.category))
+            .filter(Product.id > last_id)
+            .order_by(Product.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            break
+        stale.extend(product.id for product in batch if product.rendered_json != render_product(product))
+        last_id = batch[-1].id
+        db.session.expunge_all()
+    return stale
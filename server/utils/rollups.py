@@ -0,0 +1,188 @@
+"""
+Hourly and daily sales rollups for the admin dashboard.
+
+sales_rollups holds paid/failed order counts, paid revenue and units per
+hour and per day; category_sales_rollups splits paid revenue and units by
+product category. Both are maintained incrementally from the order status
+transitions in utils/sales_stats.py, so the time-series endpoint reads a
+few hundred rollup rows instead of scanning orders and order_items.
+
+Paid orders are bucketed by paid_at, failed orders by created_at (orders
+record no failure time). backfill_rollups() recomputes the tables from
+history (`flask backfill-rollups`).
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from extensions import db
+from models import CategorySalesRollup, Order, OrderItem, Product, SalesRollup
+from logging_config import get_logger
+from utils.counters import upsert_increment
+
+logger = get_logger('rollups')
+
+GRANULARITIES = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+UNCATEGORIZED = 0
+
+
+def bucket_start(moment, granularity):
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _order_lines(order_id):
+    return (
+        db.session.query(OrderItem.quantity, OrderItem.price, Product.category_id)
+        .outerjoin(Product, Product.id == OrderItem.product_id)
+        .filter(OrderItem.order_id == order_id)
+        .all()
+    )
+
+
+def record_paid_order(order, paid_at, sign=1):
+    """Add a newly paid order to the rollups, or with sign=-1 take it out (in the caller's transaction)"""
+    units, revenue = 0, 0.0
+    by_category = defaultdict(lambda: [0, 0.0])
+    for quantity, price, category_id in _order_lines(order.id):
+        units += quantity
+        revenue += price * quantity
+        totals = by_category[category_id or UNCATEGORIZED]
+        totals[0] += quantity
+        totals[1] += price * quantity
+
+    for granularity in GRANULARITIES:
+        bucket = bucket_start(paid_at, granularity)
+        upsert_increment(
+            SalesRollup,
+            {"granularity": granularity, "bucket_start": bucket},
+            {"paid_orders": sign, "revenue": sign * revenue, "units": sign * units},
+        )
+        for category_id, (category_units, category_revenue) in sorted(by_category.items()):
+            upsert_increment(
+                CategorySalesRollup,
+                {"granularity": granularity, "bucket_start": bucket, "category_id": category_id},
+                {"paid_orders": sign, "revenue": sign * category_revenue, "units": sign * category_units},
+            )
+
+
+def record_failed_order(order):
+    """Count a newly failed order (in the caller's transaction)"""
+    for granularity in GRANULARITIES:
+        upsert_increment(
+            SalesRollup,
+            {"granularity": granularity, "bucket_start": bucket_start(order.created_at, granularity)},
+            {"failed_orders": 1},
+        )
+
+
+def backfill_rollups(since=None, batch_size=2000):
+    """
+    Recompute rollups from orders, streaming history with yield_per.
+    With `since`, only buckets from that day on are rebuilt.
+    Returns the number of rollup rows written.
+    """
+    rows = (
+        db.session.query(
+            Order.id, Order.status, Order.paid_at, Order.created_at,
+            OrderItem.quantity, OrderItem.price, Product.category_id,
+        )
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+        .outerjoin(Product, Product.id == OrderItem.product_id)
+        .filter(Order.status.in_(("paid", "failed")))
+        .order_by(Order.id)
+    )
+    if since is not None:
+        since = bucket_start(since, "day")
+        rows = rows.filter(
+            ((Order.status == "paid") & (db.func.coalesce(Order.paid_at, Order.created_at) >= since))
+            | ((Order.status == "failed") & (Order.created_at >= since))
+        )
+
+    totals = defaultdict(lambda: [0, 0, 0.0, 0])          # (granularity, bucket) -> paid, failed, revenue, units
+    categories = defaultdict(lambda: [0, 0.0, 0])         # (granularity, bucket, category) -> paid, revenue, units
+    counted = {}                                          # key -> last order id counted for it
+
+    for order_id, status, paid_at, created_at, quantity, price, category_id in rows.yield_per(batch_size):
+        moment = (paid_at or created_at) if status == "paid" else created_at
+        for granularity in GRANULARITIES:
+            key = (granularity, bucket_start(moment, granularity))
+            if counted.get(key) != order_id:
+                counted[key] = order_id
+                totals[key][0 if status == "paid" else 1] += 1
+            if status != "paid" or quantity is None:
+                continue
+            totals[key][2] += price * quantity
+            totals[key][3] += quantity
+
+            category_key = key + (category_id or UNCATEGORIZED,)
+            if counted.get(category_key) != order_id:
+                counted[category_key] = order_id
+                categories[category_key][0] += 1
+            categories[category_key][1] += price * quantity
+            categories[category_key][2] += quantity
+
+    for model in (SalesRollup, CategorySalesRollup):
+        stale = db.session.query(model)
+        if since is not None:
+            stale = stale.filter(model.bucket_start >= since)
+        stale.delete(synchronize_session=False)
+
+    db.session.bulk_insert_mappings(SalesRollup, [
+        {"granularity": granularity, "bucket_start": bucket, "paid_orders": paid,
+         "failed_orders": failed, "revenue": revenue, "units": units}
+        for (granularity, bucket), (paid, failed, revenue, units) in totals.items()
+    ])
+    db.session.bulk_insert_mappings(CategorySalesRollup, [
+        {"granularity": granularity, "bucket_start": bucket, "category_id": category_id,
+         "paid_orders": paid, "revenue": revenue, "units": units}
+        for (granularity, bucket, category_id), (paid, revenue, units) in categories.items()
+    ])
+    db.session.commit()
+
+    written = len(totals) + len(categories)
+    logger.info(
+        f"Backfilled {written} rollup rows",
+        event="rollups_backfilled",
+        rows_written=written,
+        since=since.isoformat() if since else None
+    )
+    return written
+
+
+def get_timeseries(granularity, start, end, category_id=None):
+    """
+    Zero-filled series of rollup points for buckets in [start, end).
+    With `category_id`, reads the per-category rollups (no failed count).
+    """
+    step = GRANULARITIES[granularity]
+    start = bucket_start(start, granularity)
+
+    if category_id is None:
+        model, metrics = SalesRollup, ("paid_orders", "failed_orders", "revenue", "units")
+        query = db.session.query(SalesRollup)
+    else:
+        model, metrics = CategorySalesRollup, ("paid_orders", "revenue", "units")
+        query = db.session.query(CategorySalesRollup).filter(CategorySalesRollup.category_id == category_id)
+
+    stored = {
+        row.bucket_start: row
+        for row in query.filter(
+            model.granularity == granularity,
+            model.bucket_start >= start,
+            model.bucket_start < end,
+        )
+    }
+
+    points = []
+    bucket = start
+    while bucket < end:
+        row = stored.get(bucket)
+        point = {"bucket": bucket.isoformat()}
+        for metric in metrics:
+            value = getattr(row, metric) if row is not None else 0
+            point[metric] = round(value, 2) if metric == "revenue" else value
+        points.append(point)
+        bucket += step
+    return points
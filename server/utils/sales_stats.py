@@ -0,0 +1,161 @@
+"""
+Maintained per-product sales totals (product_sales_stats).
+
+Summing order_items over paid orders for every product on every admin page
+load is 2N+1 queries. Instead, the pending -> paid transition adds the
+order's items to product_sales_stats in the same transaction that marks
+the order paid (and cancelling a paid order takes them back out), and
+readers join against that table. The same transitions feed the time-series
+rollups (utils/rollups.py), the per-customer totals
+(utils/customer_stats.py) and the dashboard counters (orders per status
+and paid revenue, see utils/summary.py).
+
+rebuild_sales_stats() recomputes the table from order_items with one
+grouped query (`flask rebuild-sales-stats`), for the initial backfill or to
+repair drift.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import func
+
+from extensions import db
+from models import Order, OrderItem, ProductSalesStats
+from logging_config import get_logger
+from utils.counters import bump_counters, read_counters, upsert_increment
+from utils.customer_stats import record_customer_payment
+from utils.rollups import record_failed_order, record_paid_order
+from utils.velocity import record_velocity
+
+logger = get_logger('sales_stats')
+
+# Every status an order moves through, in lifecycle order
+ORDER_STATUSES = ("pending", "paid", "failed", "cancelled")
+ORDER_STATUS_COUNTERS = "orders."
+PAID_REVENUE_COUNTER = "revenue.paid"
+
+
+def count_order_status(old_status, new_status):
+    """Move one order between the per-status counters (old_status is None for a new order)"""
+    changes = {ORDER_STATUS_COUNTERS + new_status: 1}
+    if old_status:
+        changes[ORDER_STATUS_COUNTERS + old_status] = -1
+    bump_counters(changes)
+
+
+def order_status_counts():
+    """{status: number of orders}, read from the counters"""
+    return {status: int(count) for status, count in read_counters(ORDER_STATUS_COUNTERS).items()}
+
+
+def record_order_placed(order):
+    """Count a new (flushed) order. The caller commits."""
+    count_order_status(None, order.status)
+
+
+def mark_order_paid(order):
+    """
+    Move `order` to paid and add it to the sales stats, rollups, sales
+    velocity and customer stats.
+    Idempotent: an order that is already paid (a repeated callback) is not
+    counted twice. Returns True when the order transitioned. The caller commits.
+    """
+    if order.status == "paid":
+        return False
+
+    count_order_status(order.status, "paid")
+    bump_counters({PAID_REVENUE_COUNTER: order.total_amount})
+    order.status = "paid"
+    order.paid_at = datetime.now()  # Record payment time (same clock as created_at)
+    order.status_changed_at = order.paid_at
+    record_sales(order.items)
+    record_paid_order(order, order.paid_at)
+    record_velocity(order.items, order.paid_at.date())
+    record_customer_payment(order, order.paid_at)
+    return True
+
+
+def mark_order_failed(order):
+    """
+    Move `order` to failed and count it in the rollups. Returns False (and
+    changes nothing) when the order is already paid or failed, so stock is
+    only restored once. The caller commits.
+    """
+    if order.status in ("paid", "failed"):
+        return False
+
+    count_order_status(order.status, "failed")
+    order.status = "failed"
+    order.status_changed_at = datetime.now()
+    record_failed_order(order)
+    return True
+
+
+def mark_order_cancelled(order):
+    """
+    Move `order` to cancelled. A paid order is taken back out of the paid
+    revenue, sales stats, rollups, sales velocity and customer stats.
+    Returns False (and changes nothing) when the order is already cancelled
+    or failed, whose stock has already been restored. The caller commits.
+    """
+    if order.status in ("cancelled", "failed"):
+        return False
+
+    count_order_status(order.status, "cancelled")
+    if order.status == "paid":
+        bump_counters({PAID_REVENUE_COUNTER: -order.total_amount})
+        record_sales(order.items, sign=-1)
+        record_paid_order(order, order.paid_at, sign=-1)
+        record_velocity(order.items, order.paid_at.date(), sign=-1)
+        record_customer_payment(order, order.paid_at, sign=-1)
+    order.status = "cancelled"
+    order.status_changed_at = datetime.now()
+    return True
+
+
+def record_sales(order_items, sign=1):
+    """Add order items to the per-product totals (sign=-1 removes them) within the current transaction"""
+    totals = defaultdict(lambda: [0, 0.0])
+    for item in order_items:
+        totals[item.product_id][0] += sign * item.quantity
+        totals[item.product_id][1] += sign * item.price * item.quantity
+
+    now = datetime.now()
+    for product_id, (units, revenue) in sorted(totals.items()):
+        upsert_increment(
+            ProductSalesStats,
+            {"product_id": product_id},
+            {"units_sold": units, "revenue": revenue},
+            {"updated_at": now},
+        )
+
+
+def rebuild_sales_stats():
+    """Recompute product_sales_stats from paid orders. Returns the number of rows written."""
+    totals = (
+        db.session.query(
+            OrderItem.product_id,
+            func.sum(OrderItem.quantity),
+            func.sum(OrderItem.price * OrderItem.quantity),
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .filter(Order.status == "paid")
+        .group_by(OrderItem.product_id)
+        .all()
+    )
+
+    now = datetime.now()
+    db.session.query(ProductSalesStats).delete(synchronize_session=False)
+    db.session.bulk_insert_mappings(ProductSalesStats, [
+        {"product_id": product_id, "units_sold": int(units or 0), "revenue": float(revenue or 0), "updated_at": now}
+        for product_id, units, revenue in totals
+    ])
+    db.session.commit()
+
+    logger.info(
+        f"Rebuilt sales stats for {len(totals)} products",
+        event="sales_stats_rebuilt",
+        products=len(totals)
+    )
+    return len(totals)
@@ -0,0 +1,327 @@
+"""
+Full-text product search over Product.name and Product.description.
+
+Three backends, picked on first use from the database in use:
+- SQLite: an FTS5 virtual table (products_fts) keyed by product id
+- PostgreSQL: the products.search_vector tsvector column and its GIN index
+  (added by migration 3f9a2c1d8e47)
+- Anything else, or when the above are unavailable: an in-process inverted
+  index ranked with BM25 (always available; built on the first search)
+
+Every backend ANDs the query tokens and treats the last one as a prefix,
+for search-as-you-type.
+
+Set SEARCH_BACKEND=fts5|postgres|memory to force one. The admin product
+write paths call index_product/remove_product after their commit; the
+PostgreSQL column is generated by the database and needs no sync.
+"""
+
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from extensions import db
+from models import Product
+from logging_config import get_logger, log_exception
+
+logger = get_logger('search')
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Matches in the name count more than matches in the description
+NAME_WEIGHT = 3.0
+DESCRIPTION_WEIGHT = 1.0
+
+
+def tokenize(text_value):
+    return TOKEN_RE.findall((text_value or "").lower())
+
+
+class SQLiteFTSBackend:
+    name = "fts5"
+
+    def ensure(self):
+        exists = db.session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'")
+        ).first()
+        if exists:
+            return
+        # Databases built with db.create_all() instead of migrations
+        db.session.execute(text(
+            "CREATE VIRTUAL TABLE products_fts USING fts5(name, description, tokenize='unicode61')"
+        ))
+        self.rebuild()
+
+    def search(self, query, limit):
+        # Quote every token so user input can never be parsed as FTS5 syntax;
+        # the last token is a prefix match for search-as-you-type
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        match = " ".join(f'"{token}"' for token in tokens) + "*"
+        rows = db.session.execute(
+            text(
+                "SELECT rowid, bm25(products_fts, :name_weight, :description_weight) AS rank "
+                "FROM products_fts WHERE products_fts MATCH :match "
+                "ORDER BY rank LIMIT :limit"
+            ),
+            {"match": match, "limit": limit,
+             "name_weight": NAME_WEIGHT, "description_weight": DESCRIPTION_WEIGHT},
+        ).all()
+        # bm25() is lower-is-better in FTS5
+        return [(row[0], -row[1]) for row in rows]
+
+    def index_product(self, product):
+        db.session.execute(text("DELETE FROM products_fts WHERE rowid = :id"), {"id": product.id})
+        db.session.execute(
+            text("INSERT INTO products_fts (rowid, name, description) VALUES (:id, :name, :description)"),
+            {"id": product.id, "name": product.name, "description": product.description or ""},
+        )
+        db.session.commit()
+
+    def remove_product(self, product_id):
+        db.session.execute(text("DELETE FROM products_fts WHERE rowid = :id"), {"id": product_id})
+        db.session.commit()
+
+    def rebuild(self):
+        db.session.execute(text("DELETE FROM products_fts"))
+        db.session.execute(text(
+            "INSERT INTO products_fts (rowid, name, description) "
+            "SELECT id, name, coalesce(description, '') FROM products"
+        ))
+        db.session.commit()
+
+
+class PostgresFTSBackend:
+    name = "postgres"
+
+    def ensure(self):
+        columns = {column["name"] for column in inspect(db.engine).get_columns("products")}
+        if "search_vector" not in columns:
+            raise RuntimeError("products.search_vector missing; run `flask db upgrade`")
+
+    def search(self, query, limit):
+        # Tokens are \w+ only, so quoting them keeps user input out of the
+        # tsquery syntax; the last token is a prefix match like in FTS5
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        tsquery = " & ".join([f"'{token}'" for token in tokens[:-1]] + [f"'{tokens[-1]}':*"])
+        rows = db.session.execute(
+            text(
+                "SELECT id, ts_rank(search_vector, q) AS rank "
+                "FROM products, to_tsquery('english', :tsquery) AS q "
+                "WHERE search_vector @@ q "
+                "ORDER BY rank DESC, id LIMIT :limit"
+            ),
+            {"tsquery": tsquery, "limit": limit},
+        ).all()
+        return [(row[0], row[1]) for row in rows]
+
+    # search_vector is a generated column, the database keeps it current
+    def index_product(self, product):
+        pass
+
+    def remove_product(self, product_id):
+        pass
+
+    def rebuild(self):
+        pass
+
+
+class InMemoryBM25Backend:
+    """
+    Inverted index of term -> {product_id: weighted term frequency}, scored
+    with Okapi BM25. The index is per worker, so it is also rebuilt from the
+    database once it is older than SEARCH_INDEX_MAX_AGE seconds.
+    """
+    name = "memory"
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._postings = defaultdict(dict)
+        self._doc_terms = {}
+        self._doc_lengths = {}
+        self._total_length = 0.0
+        self._built_at = None
+
+    def ensure(self):
+        self.rebuild()
+
+    def search(self, query, limit):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            if self._built_at is None or time.monotonic() - self._built_at > self.max_age:
+                self.rebuild()
+
+            doc_count = len(self._doc_lengths)
+            if doc_count == 0:
+                return []
+            avg_length = self._total_length / doc_count
+
+            # The last token is a prefix match for search-as-you-type
+            term_sets = [[token] for token in tokens[:-1]]
+            term_sets.append(self._expand_prefix(tokens[-1]))
+
+            scores = None
+            for terms in term_sets:
+                term_scores = defaultdict(float)
+                for term in terms:
+                    postings = self._postings.get(term)
+                    if not postings:
+                        continue
+                    idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for doc_id, tf in postings.items():
+                        norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / avg_length)
+                        term_scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+                # Every query token has to match (AND semantics like FTS5)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {doc_id: score + term_scores[doc_id]
+                              for doc_id, score in scores.items() if doc_id in term_scores}
+                if not scores:
+                    return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def index_product(self, product):
+        with self._lock:
+            if self._built_at is None:
+                return  # Built lazily on the first search
+            self._remove(product.id)
+            self._add(product.id, product.name, product.description)
+
+    def remove_product(self, product_id):
+        with self._lock:
+            self._remove(product_id)
+
+    def rebuild(self):
+        rows = db.session.query(Product.id, Product.name, Product.description).all()
+        with self._lock:
+            self._postings = defaultdict(dict)
+            self._doc_terms = {}
+            self._doc_lengths = {}
+            self._total_length = 0.0
+            for product_id, name, description in rows:
+                self._add(product_id, name, description)
+            self._built_at = time.monotonic()
+
+    def _add(self, product_id, name, description):
+        weights = Counter()
+        for token in tokenize(name):
+            weights[token] += NAME_WEIGHT
+        for token in tokenize(description):
+            weights[token] += DESCRIPTION_WEIGHT
+
+        for term, tf in weights.items():
+            self._postings[term][product_id] = tf
+        self._doc_terms[product_id] = list(weights)
+        self._doc_lengths[product_id] = sum(weights.values())
+        self._total_length += self._doc_lengths[product_id]
+
+    def _remove(self, product_id):
+        for term in self._doc_terms.pop(product_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(product_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(product_id, 0.0)
+
+    def _expand_prefix(self, prefix):
+        return [term for term in self._postings if term.startswith(prefix)]
+
+
+class ProductSearch:
+    """Facade that picks a backend on first use and keeps write paths failure tolerant"""
+
+    def __init__(self):
+        self._backend = None
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = self._select_backend()
+        return self._backend
+
+    def search(self, query, limit=20):
+        return self.backend.search(query, limit)
+
+    def index_product(self, product):
+        self._sync("index", self.backend.index_product, product, product_id=product.id)
+
+    def remove_product(self, product_id):
+        self._sync("remove", self.backend.remove_product, product_id, product_id=product_id)
+
+    def rebuild(self):
+        self.backend.rebuild()
+
+    def _sync(self, operation, func, arg, product_id):
+        # The product write itself already committed; a failed index update
+        # leaves search stale until the next rebuild rather than failing the request
+        try:
+            func(arg)
+        except Exception as e:
+            db.session.rollback()
+            log_exception(
+                "Failed to update search index",
+                error=e,
+                event="search_index_failure",
+                operation=operation,
+                product_id=product_id
+            )
+
+    def _select_backend(self):
+        preferred = os.getenv("SEARCH_BACKEND", "auto")
+        dialect = db.engine.dialect.name
+
+        candidates = []
+        if preferred in ("auto", "fts5") and dialect == "sqlite":
+            candidates.append(SQLiteFTSBackend())
+        if preferred in ("auto", "postgres") and dialect == "postgresql":
+            candidates.append(PostgresFTSBackend())
+
+        for backend in candidates:
+            try:
+                backend.ensure()
+                break
+            except (SQLAlchemyError, RuntimeError) as e:
+                db.session.rollback()
+                logger.warning(
+                    f"Search backend '{backend.name}' unavailable, falling back",
+                    event="search_backend_unavailable",
+                    backend=backend.name,
+                    error=str(e)
+                )
+        else:
+            # Needs nothing from the database up front, so it never fails here
+            backend = InMemoryBM25Backend(max_age=float(os.getenv("SEARCH_INDEX_MAX_AGE", 300)))
+
+        logger.info(
+            f"Using '{backend.name}' search backend",
+            event="search_backend_selected",
+            backend=backend.name
+        )
+        return backend
+
+
+product_search = ProductSearch()
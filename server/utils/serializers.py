@@ -0,0 +1,165 @@
+"""
+Compiled, schema-driven serializers.
+
+SerializerMixin.to_dict() works out what to emit on every call by walking
+the model's relationships through serialize_rules, which lazy loads each
+relationship it reaches (a category's products, then every product's cart
+and order items). A Serializer declares its fields once per model and view.
+They are compiled into a flat list of accessors, so serializing a row only
+reads attributes.
+
+Relationships are read only from already loaded state. A relationship that
+was not eager loaded raises SerializationError instead of querying.
+Serializer.load_options() returns the loader options the query needs.
+"""
+
+import operator
+from datetime import date, datetime
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import selectinload
+
+from models import AuditEvent, CartItem, Category, CustomerStats, Order, OrderItem, Product, User
+
+# Same format SerializerMixin uses, so responses keep their shape
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+DATE_FORMAT = "%Y-%m-%d"
+
+
+class SerializationError(RuntimeError):
+    """Raised when serializing would need a relationship that was not loaded"""
+
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        return value.strftime(DATETIME_FORMAT)
+    if isinstance(value, date):
+        return value.strftime(DATE_FORMAT)
+    return value
+
+
+def _loaded(obj, key):
+    try:
+        return obj.__dict__[key]
+    except KeyError:
+        raise SerializationError(
+            f"{type(obj).__name__}.{key} is not loaded; query with Serializer.load_options()"
+        ) from None
+
+
+class Serializer:
+    """
+    Serializer(Model, fields, **nested)
+
+    `fields` are column or property names, or (output_key, "relationship.attr")
+    pairs for values read through a loaded many-to-one. `nested` maps a
+    relationship name to the Serializer used for it.
+    """
+
+    def __init__(self, model, fields, **nested):
+        self.model = model
+        self.fields = tuple(field if isinstance(field, tuple) else (field, field) for field in fields)
+        self.nested = nested
+        self._subsets = {}
+        self._compile()
+
+    def _compile(self):
+        mapper = inspect(self.model)
+        temporal = {
+            column.key for column in mapper.column_attrs
+            if column.columns[0].type.python_type in (datetime, date)
+        }
+
+        accessors = []
+        for key, source in self.fields:
+            if "." in source:
+                relation, attr = source.split(".", 1)
+                getter = self._through(relation, attr)
+            elif source in temporal:
+                get = operator.attrgetter(source)
+                getter = lambda obj, get=get: _format_value(get(obj))
+            else:
+                getter = operator.attrgetter(source)
+            accessors.append((key, getter))
+
+        for key, serializer in self.nested.items():
+            if mapper.relationships[key].uselist:
+                getter = lambda obj, key=key, dump=serializer.dump: [dump(child) for child in _loaded(obj, key)]
+            else:
+                getter = lambda obj, key=key, dump=serializer.dump: (
+                    None if (child := _loaded(obj, key)) is None else dump(child)
+                )
+            accessors.append((key, getter))
+
+        self._accessors = tuple(accessors)
+
+    @staticmethod
+    def _through(relation, attr):
+        get = operator.attrgetter(attr)
+
+        def getter(obj):
+            related = _loaded(obj, relation)
+            return None if related is None else _format_value(get(related))
+        return getter
+
+    def dump(self, obj):
+        return {key: getter(obj) for key, getter in self._accessors}
+
+    def dump_many(self, objs):
+        dump = self.dump
+        return [dump(obj) for obj in objs]
+
+    def only(self, keys):
+        """Serializer for a subset of the flat fields (sparse fieldsets), compiled once per subset"""
+        keys = tuple(keys)
+        subset = self._subsets.get(keys)
+        if subset is None:
+            subset = Serializer(self.model, [field for field in self.fields if field[0] in keys])
+            self._subsets[keys] = subset
+        return subset
+
+    def relations(self):
+        """Relationships this serializer reads, as (relationship, nested serializer or None)"""
+        through = {source.split(".", 1)[0] for _, source in self.fields if "." in source}
+        return [(name, None) for name in sorted(through)] + list(self.nested.items())
+
+    def load_options(self, loader=selectinload):
+        """Loader options that eager load everything dump() reads"""
+        options = []
+        for name, serializer in self.relations():
+            option = loader(getattr(self.model, name))
+            nested = serializer.load_options(loader) if serializer else []
+            options.append(option.options(*nested) if nested else option)
+        return options
+
+
+CATEGORY_PRODUCT = Serializer(
+    Product, ("id", "name", "description", "price", "stock", "image_url", "category_id", "created_at")
+)
+CATEGORY_SUMMARY = Serializer(Category, ("id", "name", "description", "created_at"))
+CATEGORY_DETAIL = Serializer(
+    Category, ("id", "name", "description", "created_at"), products=CATEGORY_PRODUCT
+)
+
+CART_ITEM = Serializer(CartItem, (
+    "id",
+    "product_id",
+    ("product_name", "product.name"),
+    ("product_price", "product.price"),
+    ("product_image", "product.image_url"),
+    "quantity",
+))
+
+CUSTOMER_STATS = Serializer(CustomerStats, ("order_count", "paid_total", "last_paid_at"))
+USER_ADMIN = Serializer(
+    User, ("id", "first_name", "last_name", "email", "phone_number", "created_at"), stats=CUSTOMER_STATS
+)
+
+ORDER_ITEM = Serializer(OrderItem, ("id", "product_id", "quantity", "price"))
+ORDER_ADMIN = Serializer(
+    Order, ("id", "user_id", "total_amount", "status", "created_at", "paid_at"), items=ORDER_ITEM
+)
+
+AUDIT_EVENT = Serializer(
+    AuditEvent, ("id", "created_at", "user_id", "action", "request_id", "method", "path", "details")
+)
@@ -0,0 +1,232 @@
+"""
+Prefix autocomplete over product and category names.
+
+Every word position of a name is stored as a key in one sorted list, so
+"jack" finds "Retro Leather Jacket". Results are ranked by popularity
+(units sold in paid orders, read from product_sales_stats, for products;
+the summed popularity of their products for categories).
+
+Prefixes of up to TOP_PREFIX_LEN characters, which match the most keys, are
+answered from a precomputed top-TOP_K list per prefix. Longer prefixes
+bisect to the first key >= prefix and rank every key that still starts
+with it.
+
+The index lives in each worker. Lookups never touch the database: a
+background thread builds it when the worker starts serving and again every
+SUGGEST_INDEX_MAX_AGE seconds (so popularity and other workers' writes
+catch up), then swaps the new structures in. Admin product/category writes
+update it incrementally; writes made while a rebuild runs are replayed
+onto the new index. Until the first build finishes, lookups return nothing.
+Under app.testing no thread is started; tests call rebuild().
+"""
+
+import bisect
+import heapq
+import os
+import threading
+import time
+from collections import defaultdict
+
+from extensions import db
+from models import Category, Product, ProductSalesStats
+from logging_config import log_exception, log_metric
+
+# Longest prefix served from the precomputed lists, and their length
+# (the most suggestions one request may ask for)
+TOP_PREFIX_LEN = 3
+TOP_K = 20
+
+
+def normalize(value):
+    return " ".join((value or "").lower().split())
+
+
+def _rank(entry):
+    return (-entry["popularity"], entry["name"].lower())
+
+
+class SuggestIndex:
+    def __init__(self, max_age=600):
+        self.max_age = max_age
+        self._lock = threading.Lock()          # Guards lookups, writes and the swap
+        self._build_lock = threading.Lock()    # One rebuild at a time
+        self._keys = []          # sorted [(key, entry_id)]
+        self._entries = {}       # entry_id -> {"type", "id", "name", "popularity"}
+        self._top = {}           # short prefix -> [entry_id], best first, at most TOP_K
+        self._built_at = None
+        self._replay = None      # writes made during a rebuild, applied after the swap
+        self._app = None
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def init_app(self, app):
+        self._app = app
+        # The first request a worker serves starts its build; none of them waits for it
+        app.before_request(self._ensure_thread)
+
+    def suggest(self, prefix, limit=10):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        with self._lock:
+            if len(prefix) <= TOP_PREFIX_LEN:
+                ranked = [self._entries[entry_id] for entry_id in self._top.get(prefix, ())[:limit]]
+            else:
+                ranked = heapq.nsmallest(
+                    limit, (self._entries[entry_id] for entry_id in self._matching(prefix)), key=_rank
+                )
+            return [dict(entry) for entry in ranked]
+
+    def rebuild(self):
+        """Rebuild from the database and swap it in; lookups keep using the old index meanwhile"""
+        with self._build_lock:
+            with self._lock:
+                self._replay = []
+            try:
+                started = time.perf_counter()
+                keys, entries = self._load()
+                top = self._build_top(keys, entries)
+                with self._lock:
+                    self._keys, self._entries, self._top = keys, entries, top
+                    replay, self._replay = self._replay, None
+                    for write in replay:
+                        write()
+                    self._built_at = time.monotonic()
+            except Exception:
+                with self._lock:
+                    self._replay = None
+                raise
+        log_metric("suggest_index_rebuild_duration", round((time.perf_counter() - started) * 1000, 2),
+                   unit="milliseconds", entries=len(entries))
+
+    def upsert_product(self, product):
+        self._write(self._upsert, ("product", product.id), product.name)
+
+    def remove_product(self, product_id):
+        self._write(self._remove, ("product", product_id))
+
+    def upsert_category(self, category):
+        self._write(self._upsert, ("category", category.id), category.name)
+
+    def remove_category(self, category_id):
+        self._write(self._remove, ("category", category_id))
+
+    def _write(self, method, *args):
+        write = lambda: method(*args)
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append(write)  # The rebuild may have read the row before this change
+            if self._built_at is not None:
+                write()
+
+    def _ensure_thread(self):
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        if self._app is None or self._app.testing:
+            return  # Scripts and tests call rebuild() explicitly
+        with self._start_lock:
+            if self._pid != os.getpid() or self._thread is None or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="suggest-index", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                with self._app.app_context():
+                    self.rebuild()
+            except Exception as e:
+                log_exception("Failed to rebuild suggest index", error=e, event="suggest_index_rebuild_failure")
+            time.sleep(self.max_age)
+
+    def _load(self):
+        sold = dict(db.session.query(ProductSalesStats.product_id, ProductSalesStats.units_sold).all())
+        products = db.session.query(Product.id, Product.name, Product.category_id).all()
+        categories = db.session.query(Category.id, Category.name).all()
+
+        category_popularity = {}
+        for product_id, _, category_id in products:
+            category_popularity[category_id] = category_popularity.get(category_id, 0) + (sold.get(product_id) or 0)
+
+        keys, entries = [], {}
+        for product_id, name, _ in products:
+            self._add_entry(keys, entries, ("product", product_id), name, sold.get(product_id) or 0)
+        for category_id, name in categories:
+            self._add_entry(keys, entries, ("category", category_id), name, category_popularity.get(category_id, 0))
+        keys.sort()
+        return keys, entries
+
+    @classmethod
+    def _add_entry(cls, keys, entries, entry_id, name, popularity):
+        entries[entry_id] = cls._entry(entry_id, name, popularity)
+        keys.extend((key, entry_id) for key in cls._keys_for(name))
+
+    @staticmethod
+    def _entry(entry_id, name, popularity):
+        kind, ref_id = entry_id
+        return {"type": kind, "id": ref_id, "name": name, "popularity": int(popularity)}
+
+    @staticmethod
+    def _build_top(keys, entries):
+        candidates = defaultdict(set)
+        for key, entry_id in keys:
+            for length in range(1, min(TOP_PREFIX_LEN, len(key)) + 1):
+                candidates[key[:length]].add(entry_id)
+        rank = lambda entry_id: _rank(entries[entry_id])
+        return {prefix: heapq.nsmallest(TOP_K, ids, key=rank) for prefix, ids in candidates.items()}
+
+    def _matching(self, prefix):
+        """Entry ids with a key starting with `prefix` (caller holds the lock)"""
+        matches = set()
+        for i in range(bisect.bisect_left(self._keys, (prefix,)), len(self._keys)):
+            key, entry_id = self._keys[i]
+            if not key.startswith(prefix):
+                break
+            matches.add(entry_id)
+        return matches
+
+    def _upsert(self, entry_id, name):
+        popularity = self._entries.get(entry_id, {}).get("popularity", 0)
+        self._remove(entry_id)
+        entry = self._entries[entry_id] = self._entry(entry_id, name, popularity)
+        for key in self._keys_for(name):
+            bisect.insort(self._keys, (key, entry_id))
+        for prefix in self._short_prefixes(name):
+            top = self._top.setdefault(prefix, [])
+            if len(top) < TOP_K or _rank(entry) < _rank(self._entries[top[-1]]):
+                top.append(entry_id)
+                top.sort(key=lambda other: _rank(self._entries[other]))
+                del top[TOP_K:]
+
+    def _remove(self, entry_id):
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        for key in self._keys_for(entry["name"]):
+            i = bisect.bisect_left(self._keys, (key, entry_id))
+            if i < len(self._keys) and self._keys[i] == (key, entry_id):
+                del self._keys[i]
+        for prefix in self._short_prefixes(entry["name"]):
+            top = self._top.get(prefix)
+            if not top or entry_id not in top:
+                continue
+            if len(top) < TOP_K:
+                top.remove(entry_id)  # The list already held every match
+            else:
+                top[:] = heapq.nsmallest(TOP_K, self._matching(prefix), key=lambda other: _rank(self._entries[other]))
+            if not top:
+                del self._top[prefix]
+
+    @classmethod
+    def _short_prefixes(cls, name):
+        return {key[:length] for key in cls._keys_for(name) for length in range(1, min(TOP_PREFIX_LEN, len(key)) + 1)}
+
+    @staticmethod
+    def _keys_for(name):
+        words = normalize(name).split(" ")
+        return {" ".join(words[i:]) for i in range(len(words)) if words[i]}
+
+
+suggest_index = SuggestIndex(max_age=float(os.getenv("SUGGEST_INDEX_MAX_AGE", 600)))
@@ -0,0 +1,158 @@
+"""
+Admin dashboard summary, served from the counters table.
+
+Counters are updated in the same transaction as the change they count:
+
+- orders.<status> and revenue.paid by the order transitions (utils/sales_stats.py);
+- customers and products.stock_at_or_below_threshold by a before_flush
+  hook on every ORM change to User.role or Product.stock (registration,
+  checkout, failed payments, admin edits);
+- products.stock_at_or_below_threshold by the bulk stock paths, which
+  bypass the ORM (adjust_stock counts threshold crossings, the importer
+  recounts).
+
+The stock counter is a plain stock <= SUMMARY_STOCK_THRESHOLD count. It is
+not the velocity-based low_stock_warning of /admin/products
+(utils/velocity.py): days of cover moves with every sale, which a counter
+can't follow.
+
+reconcile_counters() recomputes every counter from the source tables and
+reports the drift. Run it off-peak from cron on one host, e.g.
+
+    30 3 * * * cd /srv/shop/server && flask reconcile-counters
+"""
+
+import os
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session, attributes
+
+from extensions import db
+from models import Order, Product, User
+from logging_config import get_logger
+from utils.counters import bump_counters, read_counters, set_counters
+from utils.sales_stats import ORDER_STATUS_COUNTERS, PAID_REVENUE_COUNTER
+
+logger = get_logger('summary')
+
+CUSTOMERS_COUNTER = "customers"
+STOCK_THRESHOLD_COUNTER = "products.stock_at_or_below_threshold"
+# Products at or below this stock are counted on the dashboard
+STOCK_THRESHOLD = int(os.getenv("SUMMARY_STOCK_THRESHOLD", 5))
+
+
+def _at_or_below_threshold(stock):
+    return (stock or 0) <= STOCK_THRESHOLD
+
+
+def _is_customer(role):
+    return (role or "customer") == "customer"  # Column default
+
+
+def stock_threshold_change(stock_changes):
+    """Net change of the at-or-below-threshold count for (old stock, new stock) pairs"""
+    return sum(_at_or_below_threshold(new) - _at_or_below_threshold(old) for old, new in stock_changes)
+
+
+def _counted(session, obj, key, predicate):
+    """(counted before, counted after) this flush, for `obj` and predicate(obj.<key>)"""
+    if obj in session.new:
+        return False, predicate(getattr(obj, key))
+    history = attributes.get_history(obj, key)
+    before = history.deleted[0] if history.deleted else (history.unchanged or [None])[0]
+    if obj in session.deleted:
+        return predicate(before), False
+    after = history.added[0] if history.added else before
+    return predicate(before), predicate(after)
+
+
+def _before_flush(session, flush_context, instances):
+    customers = stock_threshold = 0
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            before, after = _counted(session, obj, "role", _is_customer)
+            customers += after - before
+        elif isinstance(obj, Product):
+            before, after = _counted(session, obj, "stock", _at_or_below_threshold)
+            stock_threshold += after - before
+    if customers or stock_threshold:
+        bump_counters({CUSTOMERS_COUNTER: customers, STOCK_THRESHOLD_COUNTER: stock_threshold})
+
+
+def register_summary_events():
+    """Keep the customer and stock threshold counters current on every session flush"""
+    if not event.contains(Session, "before_flush", _before_flush):
+        event.listen(Session, "before_flush", _before_flush)
+
+
+def count_stock_at_or_below_threshold():
+    return db.session.query(func.count(Product.id)).filter(
+        func.coalesce(Product.stock, 0) <= STOCK_THRESHOLD
+    ).scalar()
+
+
+def source_counts():
+    """Every counter recomputed from the source tables"""
+    counts = {
+        ORDER_STATUS_COUNTERS + status: count
+        for status, count in db.session.query(Order.status, func.count(Order.id))
+        .filter(Order.status.isnot(None)).group_by(Order.status)
+    }
+    counts[PAID_REVENUE_COUNTER] = (
+        db.session.query(func.coalesce(func.sum(Order.total_amount), 0)).filter(Order.status == "paid").scalar()
+    )
+    counts[CUSTOMERS_COUNTER] = db.session.query(func.count(User.id)).filter(
+        func.coalesce(User.role, "customer") == "customer"
+    ).scalar()
+    counts[STOCK_THRESHOLD_COUNTER] = count_stock_at_or_below_threshold()
+    return counts
+
+
+def reconcile_counters():
+    """
+    Recompute the counters from the source tables, overwrite the ones that
+    drifted and commit. Returns {name: (counted, actual)} for the drifted ones.
+    A bump committed between the recount and the overwrite is lost until
+    the next run, so schedule it off-peak.
+    """
+    actual = source_counts()
+    stored = read_counters("")
+    # Statuses that no longer have orders must go back to zero
+    for name in stored:
+        if name.startswith(ORDER_STATUS_COUNTERS):
+            actual.setdefault(name, 0)
+
+    drift = {
+        name: (stored.get(name), value) for name, value in actual.items()
+        if abs((stored.get(name) or 0) - value) > 1e-6 or name not in stored
+    }
+    set_counters({name: value for name, (_, value) in drift.items()})
+    db.session.commit()
+
+    if drift:
+        logger.warning(
+            f"Corrected {len(drift)} drifted counters",
+            event="counters_reconciled",
+            drifted={name: {"counted": counted, "actual": value} for name, (counted, value) in drift.items()}
+        )
+    return drift
+
+
+def recount_stock_threshold():
+    """Reset the stock threshold counter from the products table (after bulk stock writes)"""
+    set_counters({STOCK_THRESHOLD_COUNTER: count_stock_at_or_below_threshold()})
+
+
+def read_summary():
+    counters = read_counters("")
+    orders = {
+        name[len(ORDER_STATUS_COUNTERS):]: int(value) for name, value in counters.items()
+        if name.startswith(ORDER_STATUS_COUNTERS)
+    }
+    return {
+        "revenue": round(counters.get(PAID_REVENUE_COUNTER, 0), 2),
+        "orders": orders,
+        "customers": int(counters.get(CUSTOMERS_COUNTER, 0)),
+        "stock_at_or_below_threshold": int(counters.get(STOCK_THRESHOLD_COUNTER, 0)),
+        "stock_threshold": STOCK_THRESHOLD,
+    }
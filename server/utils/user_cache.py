@@ -0,0 +1,74 @@
+"""
+Per-worker cache of each user's role, for authorization checks.
+
+Access tokens carry the user's role as a claim (see AuthResource), so a
+token for the wrong role is rejected without any lookup. The role is still
+confirmed against this cache so that demoting or deleting a user takes
+effect before their token expires; a cache hit costs no query.
+
+A committed change to a user (or their deletion) evicts them from this
+worker's cache immediately. Other workers pick it up within USER_CACHE_TTL
+seconds, which bounds how long a revoked admin can keep acting.
+"""
+
+import os
+from collections import namedtuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models import User
+from utils.versioned_lru import MISSING, VersionedLRU
+
+UserInfo = namedtuple("UserInfo", ["id", "role"])
+
+CHANGED_USERS_KEY = "user_cache_changed"
+
+
+class UserCache(VersionedLRU):
+    def get(self, user_id):
+        """UserInfo for `user_id`, or None when the user doesn't exist"""
+        try:
+            user_id = int(user_id)  # Token subjects may be strings
+        except (TypeError, ValueError):
+            return None
+
+        found, to_fetch, generation = self.get_many([user_id])
+        if to_fetch:
+            row = db.session.query(User.id, User.role).filter(User.id == user_id).first()
+            found[user_id] = UserInfo(row.id, row.role or "customer") if row else MISSING
+            self.store(user_id, found[user_id], generation)
+        return None if found[user_id] is MISSING else found[user_id]
+
+
+user_cache = UserCache(
+    max_entries=int(os.getenv("USER_CACHE_MAX_ENTRIES", 10000)),
+    ttl=float(os.getenv("USER_CACHE_TTL", 60)),
+    miss_ttl=float(os.getenv("USER_CACHE_MISS_TTL", 10)),
+)
+
+
+def _after_flush(session, flush_context):
+    changed = session.info.setdefault(CHANGED_USERS_KEY, set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            changed.add(obj.id)
+
+
+def _after_commit(session):
+    changed = session.info.pop(CHANGED_USERS_KEY, None)
+    if changed:
+        user_cache.invalidate(changed)
+
+
+def _after_soft_rollback(session, previous_transaction):
+    session.info.pop(CHANGED_USERS_KEY, None)
+
+
+def register_user_cache_events():
+    """Evict users from the cache when a transaction that changed them commits"""
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_soft_rollback", _after_soft_rollback)
@@ -0,0 +1,134 @@
+"""
+Sales velocity and days of cover.
+
+Product.sales_velocity is units sold per day over the trailing
+SALES_VELOCITY_WINDOW_DAYS, backed by per-day unit counts in
+product_daily_sales. A paid order adds its units to today's counts and
+raises the velocity of its products immediately. Sales that age out of the
+window are only dropped by refresh_sales_velocity(), which is meant to run
+daily (`flask refresh-sales-velocity`).
+
+Days of cover is stock / sales_velocity. It is served by a partial
+expression index (idx_product_days_of_cover), so the database keeps the
+ranking current through every stock change, and the N most at-risk
+products are the first N index entries.
+"""
+
+import os
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, update
+
+from extensions import db
+from models import PRODUCT_DAYS_OF_COVER, Order, OrderItem, Product, ProductDailySales
+from logging_config import get_logger
+from utils.counters import upsert_increment
+
+logger = get_logger('velocity')
+
+WINDOW_DAYS = int(os.getenv("SALES_VELOCITY_WINDOW_DAYS", 28))
+# Selling products with less cover than this are flagged low stock
+LOW_COVER_DAYS = float(os.getenv("LOW_STOCK_COVER_DAYS", 7))
+
+
+def days_of_cover(stock, velocity):
+    """Days until stockout at the current velocity; None for products that aren't selling"""
+    if not velocity:
+        return None
+    return stock / velocity
+
+
+def is_low_stock(stock, velocity):
+    cover = days_of_cover(stock, velocity)
+    return stock <= 0 or (cover is not None and cover < LOW_COVER_DAYS)
+
+
+def record_velocity(order_items, day, sign=1):
+    """
+    Add paid order items to the daily counts and velocities, or with sign=-1
+    take them out (in the caller's transaction). Days outside the window no
+    longer count towards the velocity and are skipped.
+    """
+    if day < date.today() - timedelta(days=WINDOW_DAYS - 1):
+        return
+    units = defaultdict(int)
+    for item in order_items:
+        units[item.product_id] += sign * item.quantity
+
+    for product_id, quantity in sorted(units.items()):
+        upsert_increment(ProductDailySales, {"product_id": product_id, "day": day}, {"units": quantity})
+        db.session.execute(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(sales_velocity=Product.sales_velocity + quantity / WINDOW_DAYS)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def refresh_sales_velocity(today=None, rebuild=False, batch_size=2000):
+    """
+    Drop daily counts that left the window and recompute every velocity.
+    With rebuild=True the daily counts are first recomputed from paid
+    orders. Returns the number of products with a non-zero velocity.
+    """
+    today = today or date.today()
+    window_start = today - timedelta(days=WINDOW_DAYS - 1)
+
+    if rebuild:
+        db.session.query(ProductDailySales).delete(synchronize_session=False)
+        daily = defaultdict(int)
+        sales = (
+            db.session.query(OrderItem.product_id, Order.paid_at, OrderItem.quantity)
+            .join(Order, Order.id == OrderItem.order_id)
+            .filter(Order.status == "paid", Order.paid_at >= datetime.combine(window_start, datetime.min.time()))
+            .yield_per(batch_size)
+        )
+        for product_id, paid_at, quantity in sales:
+            daily[(product_id, paid_at.date())] += quantity
+        db.session.bulk_insert_mappings(ProductDailySales, [
+            {"product_id": product_id, "day": day, "units": units}
+            for (product_id, day), units in daily.items()
+        ])
+    else:
+        db.session.query(ProductDailySales).filter(
+            ProductDailySales.day < window_start
+        ).delete(synchronize_session=False)
+
+    velocities = {
+        product_id: units / WINDOW_DAYS
+        for product_id, units in db.session.query(ProductDailySales.product_id, func.sum(ProductDailySales.units))
+        .filter(ProductDailySales.day >= window_start)
+        .group_by(ProductDailySales.product_id)
+    }
+    previously_selling = {
+        product_id for (product_id,) in db.session.query(Product.id).filter(Product.sales_velocity > 0)
+    }
+    changes = [{"id": product_id, "sales_velocity": velocity} for product_id, velocity in velocities.items()]
+    changes += [{"id": product_id, "sales_velocity": 0} for product_id in previously_selling - set(velocities)]
+    if changes:
+        db.session.execute(update(Product), changes)
+    db.session.commit()
+
+    logger.info(
+        f"Sales velocity refreshed for {len(velocities)} selling products",
+        event="sales_velocity_refreshed",
+        selling_count=len(velocities),
+        window_days=WINDOW_DAYS
+    )
+    return len(velocities)
+
+
+def at_risk_products(limit, max_days=None):
+    """The `limit` selling products with the fewest days of cover, read in index order"""
+    query = (
+        db.session.query(
+            Product.id, Product.name, Product.stock, Product.sales_velocity,
+            PRODUCT_DAYS_OF_COVER.label("days_of_cover"),
+        )
+        .filter(Product.sales_velocity > 0)
+        .order_by(PRODUCT_DAYS_OF_COVER, Product.id)
+    )
+    if max_days is not None:
+        query = query.filter(PRODUCT_DAYS_OF_COVER < max_days)
+    return query.limit(limit).all()
@@ -0,0 +1,93 @@
+"""
+Per-worker LRU cache of database rows, evicted key by key on change.
+
+A committed change to a key evicts it and stamps it with the next value of a
+worker-wide generation counter. A reader notes the generation before it
+queries and only stores what it read if the key hasn't been stamped since,
+so a row read just before a change is never cached after it.
+
+Stamps are kept for at most max_versions keys (oldest dropped first). A
+dropped stamp raises the floor that unstamped keys are compared against, so
+a reader still in flight at that point doesn't store; it only costs that
+reader its cache write.
+
+Unknown keys are cached as MISSING too, so repeated lookups of deleted or
+invalid ids don't hit the database. Entries expire after `ttl` seconds
+(misses after `miss_ttl`) to bound staleness from writes handled by other
+workers.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()
+
+
+class VersionedLRU:
+    def __init__(self, max_entries, ttl, miss_ttl, max_versions=None):
+        self.max_entries = max_entries
+        self.max_versions = max_versions or 4 * max_entries
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (value | MISSING, stored_at)
+        self._stamps = OrderedDict()    # key -> generation of its last change, oldest first
+        self._generation = 0
+        self._floor = 0                 # Highest stamp dropped from _stamps
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys):
+        """
+        Return ({key: value or MISSING}, [keys to fetch], generation) for the
+        given keys; pass the generation to store() with the fetched values.
+        """
+        found, to_fetch = {}, []
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    value, stored_at = entry
+                    if now - stored_at <= (self.miss_ttl if value is MISSING else self.ttl):
+                        self._entries.move_to_end(key)
+                        self.hits += 1
+                        found[key] = value
+                        continue
+                    del self._entries[key]
+                self.misses += 1
+                to_fetch.append(key)
+            return found, to_fetch, self._generation
+
+    def store(self, key, value, generation):
+        """Cache `value` (or MISSING) for `key`, read at `generation`, unless it changed since"""
+        with self._lock:
+            if self._stamps.get(key, self._floor) > generation:
+                return
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, keys):
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+                self._stamps[key] = self._generation
+                self._stamps.move_to_end(key)
+            while len(self._stamps) > self.max_versions:
+                _, stamp = self._stamps.popitem(last=False)
+                self._floor = max(self._floor, stamp)
+
+    def clear(self):
+        """Drop every entry (a reader in flight doesn't store either)"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._stamps.clear()
+            self._floor = self._generation
+
+    def stats(self):
+        return {"entries": len(self._entries), "versions": len(self._stamps), "hits": self.hits, "misses": self.misses}